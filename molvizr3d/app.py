@@ -1,7 +1,5 @@
 # import packages/modules
 import os
-import pubchemquery as pcq
-import pandas as pd
 # internal
 from .config import packageName
 from .config import packageShortName
@@ -64,6 +62,8 @@ def td_by_inchi(inchi, display_legend=True):
     '''
     # check inchi
     if inchi is not None:
+        # pubchem query (imports pandas, loaded only here)
+        import pubchemquery as pcq
         # get cid
         cid = pcq.get_cid_by_inchi(inchi)
         # check
@@ -1,3 +1,5 @@
 from .molparser import MolParser
 from .compound import Compound
+from .conformers import ConformerEnsemble
+from .thumbnails import Thumbnails
 from .netwrok import Network
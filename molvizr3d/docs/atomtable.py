@@ -0,0 +1,145 @@
+# ATOM TABLE
+# ------------
+
+# import libs
+import numpy as np
+# internals
+from .elementstore import ElementStore
+
+
+class AtomTable():
+    '''
+    Columnar atom table (structure of arrays)
+
+    hint:
+        xyz: (N,3) float64 coordinates
+        atomic_number: (N,) uint8 atomic numbers (0: unknown element)
+        ids: (N,) int32 atom ids (starts from 1)
+    '''
+
+    def __init__(self, xyz, atomic_number, ids=None, symbols=None):
+        # coordinates
+        self._xyz = np.ascontiguousarray(
+            np.asarray(xyz, dtype=np.float64).reshape(-1, 3))
+        # atomic numbers
+        self._atomic_number = np.asarray(atomic_number, dtype=np.uint8)
+        # size
+        atomNo = len(self._xyz)
+        # ids
+        if ids is None:
+            self._ids = np.arange(1, atomNo+1, dtype=np.int32)
+        else:
+            self._ids = np.asarray(ids, dtype=np.int32)
+
+        # check
+        if len(self._atomic_number) != atomNo or len(self._ids) != atomNo:
+            raise Exception('atom table columns must have the same size.')
+
+        # symbols (built on first access)
+        self._symbols = list(symbols) if symbols is not None else None
+
+    def __len__(self):
+        return len(self._xyz)
+
+    @property
+    def xyz(self):
+        return self._xyz
+
+    @property
+    def atomic_number(self):
+        return self._atomic_number
+
+    @property
+    def ids(self):
+        return self._ids
+
+    @property
+    def size(self):
+        return len(self._xyz)
+
+    @property
+    def symbols(self):
+        if self._symbols is None:
+            symbolTable = AtomTable.symbol_table()
+            self._symbols = [symbolTable[item]
+                             for item in self._atomic_number.tolist()]
+        return self._symbols
+
+    @staticmethod
+    def symbol_table():
+        '''
+        Return element symbols indexed by atomic number (index 0: unknown)
+        '''
+        return ElementStore.get_instance().symbol_table
+
+    @staticmethod
+    def atomic_number_table():
+        '''
+        Return a dict of element symbol -> atomic number
+        '''
+        return ElementStore.get_instance().atomic_number_table
+
+    @staticmethod
+    def from_symbols(symbols, xyz, ids=None):
+        '''
+        Create an atom table from element symbols
+
+        Parameters
+        ----------
+        symbols : list
+            element symbols such as ['C','H','H','H','H']
+        xyz : list | np.array
+            atom coordinates
+        ids : list
+            atom ids (default: 1 to N)
+
+        Returns
+        -------
+        atomTable : AtomTable
+            atom table
+        '''
+        # symbols
+        symbols = [str(item).strip() for item in symbols]
+        # atomic number (0: unknown element)
+        atomicNumberTable = AtomTable.atomic_number_table()
+        atomicNumber = [atomicNumberTable.get(item, 0) for item in symbols]
+        # res
+        return AtomTable(xyz, atomicNumber, ids=ids, symbols=symbols)
+
+    def atom_block(self, start=1):
+        '''
+        Build atom block, a list of atom dicts (compatibility view)
+
+        Parameters
+        ----------
+        start : int
+            first atom id/index (sdf: 1, json: 0)
+
+        Returns
+        -------
+        atoms : list
+            atom info
+        '''
+        atoms = []
+        symbols = self.symbols
+
+        for i, (_x, _y, _z) in enumerate(self._xyz.tolist()):
+            # atom info
+            atom = {
+                'id': i+start,
+                'symbol': symbols[i],
+                'index': i+start,
+                'x': _x,
+                'y': _y,
+                'z': _z,
+                'position': {
+                    'x': _x,
+                    'y': _y,
+                    'z': _z
+                },
+                'xyz': [_x, _y, _z]
+            }
+            # save atom info
+            atoms.append(atom)
+
+        return atoms
@@ -0,0 +1,104 @@
+# BOND PERCEPTION
+# -----------------
+
+# import libs
+import numpy as np
+# internals
+from .elementstore import ElementStore
+from .atomtable import AtomTable
+from .spatialindex import SpatialIndex
+
+
+class BondPerception():
+    '''
+    Find bonds from atom coordinates (inputs without a bond table)
+
+    hint:
+        two atoms are bonded if: distance <= factor * (radius1 + radius2)
+        radius: AtomicRadius column of PubChemElements_all.csv [pm]
+            (van der Waals radius, hence factor ~0.6)
+        bond type is not perceived (single bond: 1)
+    '''
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def atom_radii(atomicNumbers, default_radius=200.0):
+        '''
+        Atom radii [angstrom]
+
+        Parameters
+        ----------
+        atomicNumbers : np.array
+            atomic numbers
+        default_radius : float
+            radius of elements without AtomicRadius [pm]
+
+        Returns
+        -------
+        radii : np.array
+            atom radii
+        '''
+        store = ElementStore.get_instance()
+        atomicNumbers = np.asarray(atomicNumbers, dtype=np.int64)
+        # rows
+        rows = store.rows(atomicNumbers)
+        # radius [pm]
+        radii = np.full(len(atomicNumbers), float(default_radius))
+        _valid = rows != -1
+        radii[_valid] = store.column('AtomicRadius').astype(np.float64)[
+            rows[_valid]]
+        radii[np.isnan(radii)] = float(default_radius)
+        # pm -> angstrom
+        return radii/100
+
+    @staticmethod
+    def perceive(xyzList, atoms, factor=0.6, default_radius=200.0):
+        '''
+        Perceive bonds (cell list search, linear in atoms)
+
+        Parameters
+        ----------
+        xyzList : list | np.array
+            (N,3) atom coordinates [angstrom]
+        atoms : list | AtomTable
+            atom symbols or an atom table
+        factor : float
+            bond tolerance (distance <= factor * (radius1 + radius2))
+        default_radius : float
+            radius of elements without AtomicRadius [pm]
+
+        Returns
+        -------
+        bondMatrix : np.array
+            (B,3) bond rows [atom1 id, atom2 id, bond type], ids start
+            from 1, atom1 id < atom2 id, sorted
+        '''
+        try:
+            # atom table
+            atomTable = atoms if isinstance(atoms, AtomTable) \
+                else AtomTable.from_symbols(atoms, xyzList)
+            xyz = np.asarray(xyzList, dtype=np.float64).reshape(-1, 3)
+
+            # radii
+            radii = BondPerception.atom_radii(
+                atomTable.atomic_number, default_radius)
+            # check
+            if len(xyz) < 2:
+                return np.zeros((0, 3), dtype=np.int64)
+
+            # cutoff (largest possible bond)
+            cutoff = factor*2*float(radii.max())
+            # candidate pairs
+            pairs, distances = SpatialIndex(
+                xyz, cell_size=cutoff).pairs_within(cutoff)
+            # bond check
+            _bonded = distances <= factor * \
+                (radii[pairs[:, 0]] + radii[pairs[:, 1]])
+            pairs = pairs[_bonded]
+
+            # bond matrix
+            return np.column_stack((pairs + 1, np.ones(len(pairs), dtype=np.int64))).astype(np.int64)
+        except Exception as e:
+            raise Exception(e)
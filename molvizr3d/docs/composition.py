@@ -0,0 +1,252 @@
+# ELEMENTAL COMPOSITION
+# -----------------------
+
+# import libs
+import numpy as np
+# internals
+from .elementstore import ElementStore
+from .atomtable import AtomTable
+
+
+class Composition():
+    '''
+    Elemental composition of a molecule (element counts, formula, mass)
+
+    hint:
+        atoms: atom symbols such as ['C','H','H','H','H'], atomic numbers
+            such as [6,1,1,1,1] or an AtomTable
+        counts and percentages are in Hill order (C, H, then alphabetical;
+            alphabetical if there is no carbon)
+    '''
+
+    # lookup tables indexed by atomic number (built once)
+    _tables = None
+
+    def __init__(self, atoms):
+        # element counts (1,Z)
+        self._counts = Composition.count_matrix([atoms])
+        # res
+        self._res = None
+
+    def __str__(self):
+        return self.formula
+
+    def __build(self):
+        '''
+        Build formula, mass and percentages
+        '''
+        if self._res is None:
+            self._res = Composition.__analyze(self._counts)
+        return self._res
+
+    @property
+    def counts(self):
+        '''
+        element counts {symbol: count}
+        '''
+        symbolTable = Composition.__load_tables()['symbol']
+        return {symbolTable[item]: int(self._counts[0, item])
+                for item in Composition.__hill_order(self._counts[0])}
+
+    @property
+    def formula(self):
+        return self.__build()['formula'][0]
+
+    @property
+    def average_mass(self):
+        return float(self.__build()['average_mass'][0])
+
+    @property
+    def monoisotopic_mass(self):
+        return float(self.__build()['monoisotopic_mass'][0])
+
+    @property
+    def percentages(self):
+        '''
+        element mass percentages {symbol: %}
+        '''
+        symbolTable = Composition.__load_tables()['symbol']
+        percentages = self.__build()['percentages'][0]
+        return {symbolTable[item]: float(percentages[item])
+                for item in Composition.__hill_order(self._counts[0])}
+
+    @staticmethod
+    def __load_tables():
+        '''
+        Load symbol/mass tables indexed by atomic number
+        '''
+        if Composition._tables is None:
+            store = ElementStore.get_instance()
+            # atomic number -> row
+            rowIndex = store.atomic_number_index
+            valid = rowIndex != -1
+            # mass (nan: not defined)
+            averageMass = np.full(len(rowIndex), np.nan)
+            averageMass[valid] = store.column('AtomicMass').astype(
+                np.float64)[rowIndex[valid]]
+            monoisotopicMass = np.full(len(rowIndex), np.nan)
+            monoisotopicMass[valid] = store.monoisotopic_mass[rowIndex[valid]]
+            # symbols
+            symbolTable = store.symbol_table
+            # hill order (without carbon: alphabetical)
+            alphaOrder = np.array(sorted(np.flatnonzero(valid).tolist(),
+                                         key=lambda item: symbolTable[item]), dtype=np.int64)
+            carbonOrder = np.concatenate(
+                ([6, 1], alphaOrder[(alphaOrder != 6) & (alphaOrder != 1)]))
+            # set
+            Composition._tables = {
+                'symbol': symbolTable,
+                'average_mass': averageMass,
+                'monoisotopic_mass': monoisotopicMass,
+                'alpha_order': alphaOrder,
+                'carbon_order': carbonOrder
+            }
+        return Composition._tables
+
+    @staticmethod
+    def atomic_numbers(atoms):
+        '''
+        Convert atoms to atomic numbers
+
+        Parameters
+        ----------
+        atoms : list | np.array | AtomTable
+            atom symbols, atomic numbers or an atom table
+
+        Returns
+        -------
+        res : np.array
+            atomic numbers
+        '''
+        # atom table
+        if isinstance(atoms, AtomTable):
+            res = atoms.atomic_number.astype(np.int64)
+            # check
+            if np.any(res == 0):
+                notFound = [atoms.symbols[i] for i in np.flatnonzero(res == 0)]
+                raise Exception(f'element not found: {sorted(set(notFound))}')
+            return res
+
+        store = ElementStore.get_instance()
+        # rows
+        rows = store.rows(atoms)
+        # check
+        if np.any(rows == -1):
+            notFound = np.asarray(atoms)[rows == -1]
+            raise Exception(
+                f'element not found: {sorted(set(notFound.tolist()))}')
+        return np.take(store.column('AtomicNumber'), rows).astype(np.int64).ravel()
+
+    @staticmethod
+    def count_matrix(molecules):
+        '''
+        Count elements of a batch of molecules
+
+        Parameters
+        ----------
+        molecules : list
+            a list of atoms (symbols, atomic numbers or atom tables)
+
+        Returns
+        -------
+        counts : np.array
+            (M,Z) element counts, column: atomic number
+        '''
+        # table size
+        elementNo = len(Composition.__load_tables()['symbol'])
+        # atomic numbers
+        atomicNumbers = [Composition.atomic_numbers(item) for item in molecules]
+        moleculeNo = len(atomicNumbers)
+        # molecule index of each atom
+        moleculeIndex = np.repeat(np.arange(moleculeNo, dtype=np.int64),
+                                  [len(item) for item in atomicNumbers])
+        atomicNumbers = np.concatenate(atomicNumbers) if moleculeNo > 0 \
+            else np.zeros(0, dtype=np.int64)
+        # bincount over (molecule, atomic number)
+        counts = np.bincount(moleculeIndex*elementNo + atomicNumbers,
+                             minlength=moleculeNo*elementNo)
+        return counts.reshape(moleculeNo, elementNo)
+
+    @staticmethod
+    def __hill_order(countsRow):
+        '''
+        Return atomic numbers in the formula (Hill order)
+        '''
+        tables = Composition.__load_tables()
+        order = tables['carbon_order'] if countsRow[6] > 0 \
+            else tables['alpha_order']
+        return order[countsRow[order] > 0].tolist()
+
+    @staticmethod
+    def __weighted_mass(counts, mass):
+        '''
+        Molecule mass (counts @ mass), nan if an element mass is not defined
+        '''
+        valid = ~np.isnan(mass)
+        res = counts[:, valid] @ mass[valid]
+        # undefined elements
+        res = res.astype(np.float64)
+        res[np.any(counts[:, ~valid] > 0, axis=1)] = np.nan
+        return res
+
+    @staticmethod
+    def __analyze(counts):
+        '''
+        Build formula, mass and percentages of a count matrix
+        '''
+        tables = Composition.__load_tables()
+        symbolTable = tables['symbol']
+        # mass
+        averageMass = Composition.__weighted_mass(
+            counts, tables['average_mass'])
+        monoisotopicMass = Composition.__weighted_mass(
+            counts, tables['monoisotopic_mass'])
+        # percentages
+        massFraction = counts * np.nan_to_num(tables['average_mass'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentages = np.where(
+                averageMass[:, None] > 0, 100*massFraction/averageMass[:, None], 0.0)
+        # formula
+        formula = []
+        for countsRow in counts:
+            _formula = ''
+            for item in Composition.__hill_order(countsRow):
+                _count = int(countsRow[item])
+                _formula += symbolTable[item] + \
+                    (str(_count) if _count > 1 else '')
+            formula.append(_formula)
+
+        return {
+            'counts': counts,
+            'formula': formula,
+            'average_mass': averageMass,
+            'monoisotopic_mass': monoisotopicMass,
+            'percentages': percentages
+        }
+
+    @staticmethod
+    def batch(molecules):
+        '''
+        Composition of a batch of molecules (one pass over all atoms)
+
+        Parameters
+        ----------
+        molecules : list
+            a list of atoms (symbols, atomic numbers or atom tables)
+
+        Returns
+        -------
+        res : dict
+            counts: (M,Z) element counts, column: atomic number
+            formula: list of Hill formulas
+            average_mass: (M,) average molecular mass [g/mol]
+            monoisotopic_mass: (M,) monoisotopic mass [g/mol]
+            percentages: (M,Z) element mass percentages
+        '''
+        try:
+            # counts
+            counts = Composition.count_matrix(molecules)
+            # res
+            return Composition.__analyze(counts)
+        except Exception as e:
+            raise Exception(e)
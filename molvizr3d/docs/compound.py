@@ -2,6 +2,7 @@
 # ----------
 
 # import libs
+import copy
 import numpy as np
 from matplotlib.pyplot import xlabel
 from ..config import OBSERVER_PROPERTY
@@ -9,6 +10,11 @@ from .utility import Utility
 from .vizr3d import Vizr3D
 from .netwrok import Network
 from .compute import Compute, CalculateMolecularMass
+from .atomtable import AtomTable
+from .composition import Composition
+from .spatialindex import SpatialIndex
+from .structure import Structure
+from .lazydict import LazyDict
 
 
 class Compound(Vizr3D, Network):
@@ -24,6 +30,7 @@ class Compound(Vizr3D, Network):
     _atom_xyz_center = []
     _atom_bond_block = []
     _atom_bond_numbers = 0
+    _atom_bonds_1d = None
 
     # *** obs fixed ***
     _limits = {
@@ -41,23 +48,34 @@ class Compound(Vizr3D, Network):
         self.parse_prop = parse_prop
         # super class
         __atom_elements = parse_prop['atom_elements']
-        __atom_bonds = parse_prop['bond_block']
+        # bond rows (bond_block is built on first access)
+        __bond_matrix = parse_prop.get('bond_matrix')
+        if __bond_matrix is None:
+            __bond_matrix = Compound.bond_matrix(parse_prop['bond_block'])
         __atom_xyz = parse_prop['xyz_list']
         __atom_xyz_center = parse_prop['xyz_center_list']
+        # atom table (columnar)
+        __atom_table = parse_prop.get('atom_table')
+        if __atom_table is None:
+            __atom_table = AtomTable.from_symbols(__atom_elements, __atom_xyz)
+        self._atom_table = __atom_table
+        # composition (built on first access)
+        self._composition = None
+        # spatial index (built on first access)
+        self._spatial_index = None
         # limit
         __limits = self._limits
 
-        # TODO: convert atom_bonds to 1d vector
-        __atom_bonds_1d = self.convert_atom_bonds(__atom_bonds)
-
         # ! init parent classes
+        # bond block/1d bonds: None, built on first access (atomBonds, atomBonds1d)
         # *** raw info (just for visualizing a structure)
-        Vizr3D.__init__(self, __atom_elements, __atom_bonds,
-                        __atom_xyz, __atom_xyz_center, self.robs, self.tetaNo, self.phiNo, __limits)
+        Vizr3D.__init__(self, __atom_elements, None,
+                        __atom_xyz, __atom_xyz_center, self.robs, self.tetaNo, self.phiNo, __limits,
+                        atomTable=__atom_table, bondMatrix=__bond_matrix)
 
         # *** network
-        Network.__init__(self, __atom_elements, __atom_bonds,
-                         __atom_xyz, __atom_xyz_center, __atom_bonds_1d)
+        Network.__init__(self, __atom_elements, None,
+                         __atom_xyz, __atom_xyz_center, None, atomTable=__atom_table)
 
         # update mat prop
         self.__update_atom_prop('mat_cid')
@@ -136,6 +154,52 @@ class Compound(Vizr3D, Network):
     def atom_xyz_center(self, value):
         self._atom_xyz_center = value
 
+    @property
+    def atom_table(self):
+        return self._atom_table
+
+    @property
+    def atom_block(self):
+        # dict view (compatibility)
+        if 'atom_block' in self.parse_prop:
+            return self.parse_prop['atom_block']
+        return self._atom_table.atom_block()
+
+    @property
+    def composition(self):
+        # element counts, hill formula, mass (built on first access)
+        if self._composition is None:
+            self._composition = Composition(self._atom_table)
+        return self._composition
+
+    @property
+    def spatial_index(self):
+        # cell list of atom coordinates (built on first access)
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self._atom_table.xyz)
+        return self._spatial_index
+
+    @property
+    def atomBonds(self):
+        # bond block (built on first access)
+        return self.parse_prop['bond_block']
+
+    @atomBonds.setter
+    def atomBonds(self, value):
+        if value is not None:
+            self.parse_prop['bond_block'] = value
+
+    @property
+    def atomBonds1d(self):
+        # 1d bond list (built on first access)
+        if self._atom_bonds_1d is None:
+            self._atom_bonds_1d = self.convert_atom_bonds(self.atomBonds)
+        return self._atom_bonds_1d
+
+    @atomBonds1d.setter
+    def atomBonds1d(self, value):
+        self._atom_bonds_1d = value
+
     @property
     def atom_bond_block(self):
         return self.parse_prop['bond_block']
@@ -226,6 +290,9 @@ class Compound(Vizr3D, Network):
             'xyz_list': self.__update_atom_xyz,
             'xyz_center_list': self.__update_atom_xyz_center
         }
+        # pending (lazy) values are read from parse_prop on access
+        if isinstance(self.parse_prop, LazyDict) and prop_name in self.parse_prop.pending():
+            return
         # select prop
         propSelection = switchProp.get(prop_name)
         propSelection(self.parse_prop[prop_name])
@@ -257,6 +324,57 @@ class Compound(Vizr3D, Network):
     def __update_atom_bond_numbers(self, prop_val):
         self.atom_bond_numbers = prop_val
 
+    def with_coordinates(self, xyzList, xyzCenterList=None):
+        '''
+        Copy of the compound with other atom coordinates (same topology),
+        used for conformers
+
+        Parameters
+        ----------
+        xyzList: list | np.array
+            (N,3) atom coordinates (atom order of the compound)
+        xyzCenterList: np.array
+            (N,3) centered coordinates (default: centered from xyzList)
+
+        Returns
+        -------
+        compound: Compound
+            shallow copy sharing elements, bonds and networks
+        '''
+        xyzList = np.asarray(xyzList, dtype=np.float64).reshape(-1, 3)
+        # check
+        if len(xyzList) != len(self._atom_table):
+            raise Exception('atom number of coordinates does not match the compound.')
+        # centered
+        if xyzCenterList is None:
+            xyzCenterList, _ = Structure.CenterObject(
+                xyzList, Structure.CenterPoints(xyzList))
+
+        res = copy.copy(self)
+        # atom table (shared atomic numbers, ids and symbols)
+        res._atom_table = AtomTable(xyzList, self._atom_table.atomic_number,
+                                    ids=self._atom_table.ids, symbols=self._atom_table.symbols)
+        res.atomTable = res._atom_table
+        res.xyzList = res._atom_table.xyz
+        res.xyzCenterList = xyzCenterList
+        # properties (atom_block holds coordinates, rebuilt from the table)
+        if isinstance(self.parse_prop, LazyDict):
+            res.parse_prop = self.parse_prop.shallow_copy(
+                exclude=['atom_block'])
+        else:
+            res.parse_prop = {key: value for key, value in self.parse_prop.items()
+                              if key != 'atom_block'}
+        res.parse_prop['xyz_list'] = res.xyzList
+        res.parse_prop['xyz_center_list'] = xyzCenterList
+        res.parse_prop['atom_table'] = res._atom_table
+        # caches
+        res._spatial_index = None
+        res.plotScale = []
+        res.reset_render_plan()
+        res.structure_type = res.StructureAnalyzer()[0]
+
+        return res
+
     def convert_atom_bonds(self, atom_bonds):
         '''
         Convert atom bonds to 1d list
@@ -274,11 +392,93 @@ class Compound(Vizr3D, Network):
                 })
         return atom_bonds_1d
 
-    def distance_matrix(self):
+    @staticmethod
+    def bond_matrix(atom_bonds):
+        '''
+        Bond rows [atom1 id, atom2 id, bond type] of a bond block (same order)
+        '''
+        _rows = [(int(atom['id']), int(bond[0]), int(bond[3]))
+                 for atom in atom_bonds for bond in atom['bonds']]
+        return np.array(_rows, dtype=np.int64).reshape(-1, 3)
+
+    @property
+    def bond_index(self):
+        '''
+        bonded atom indices (B,2), start from 0
+        '''
+        return np.asarray(self.bondMatrix, dtype=np.int64).reshape(-1, 3)[:, 0:2] - 1
+
+    def bond_lengths(self):
+        '''
+        Calculate all bond lengths
+
+        Returns
+        -------
+        lengths: np.array
+            (B,) bond lengths (bond_index order)
+        '''
+        return Compute.bond_lengths(self.xyzList, self.bond_index)
+
+    def bond_angles(self, degrees=True):
+        '''
+        Calculate all bond angles
+
+        Parameters
+        ----------
+        degrees: bool
+            if True, degrees, otherwise radians
+
+        Returns
+        -------
+        angle_index: np.array
+            (A,3) atom indices i-j-k (j: center)
+        angles: np.array
+            (A,) bond angles
+        '''
+        angle_index = Compute.angle_index(self.bond_index)
+        return angle_index, Compute.bond_angles(self.xyzList, angle_index, degrees=degrees)
+
+    def dihedral_angles(self, degrees=True):
+        '''
+        Calculate all dihedral (torsion) angles
+
+        Parameters
+        ----------
+        degrees: bool
+            if True, degrees, otherwise radians
+
+        Returns
+        -------
+        dihedral_index: np.array
+            (D,4) atom indices i-j-k-l
+        angles: np.array
+            (D,) dihedral angles (-180, 180]
+        '''
+        dihedral_index = Compute.dihedral_index(self.bond_index)
+        return dihedral_index, Compute.dihedral_angles(self.xyzList, dihedral_index, degrees=degrees)
+
+    def distance_matrix(self, condensed=False, dtype=np.float64, method='auto', block_size=None):
         '''
         Build a matrix of atom-atom distance
+
+        Parameters
+        ----------
+        condensed: bool
+            if True, return the upper triangle (i<j) as a 1d array
+        dtype: np.dtype
+            np.float64 (default) or np.float32
+        method: str
+            'direct', 'gemm' or 'auto'
+        block_size: int
+            rows computed at once (caps memory)
+
+        Returns
+        -------
+        distance: np.array
+            (N,N) matrix or condensed (N(N-1)/2,) array
         '''
-        return Compute.atoms_distance_matrix(self.xyzList, self.atom_elements)
+        return Compute.atoms_distance_matrix(self.xyzList, self.atom_elements, condensed=condensed,
+                                             dtype=dtype, method=method, block_size=block_size)
 
     def distance_atoms(self, atom_symbols, atom_index=[]):
         '''
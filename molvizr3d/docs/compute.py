@@ -4,6 +4,8 @@
 
 # import libs
 import numpy as np
+# internals
+from .composition import Composition
 
 
 class Compute():
@@ -22,32 +24,282 @@ class Compute():
         return np.linalg.norm(xyzAtom1-xyzAtom2)
 
     @staticmethod
-    def atoms_distance_matrix(xyzList, atomName):
+    def atoms_distance_matrix(xyzList, atomName=None, condensed=False, dtype=np.float64,
+                              method='auto', block_size=None):
         '''
         build a matrix containing a matrix of distance between two different atoms
 
         args:
             xyzList: xyz list of atoms
-            atomName: atom name list such as ['C','H','H','H','H']
+            atomName: atom name list such as ['C','H','H','H','H'] (default: all atoms)
+            condensed: if True, return the upper triangle (i<j, row by row) as a 1d array
+            dtype: np.float64 or np.float32
+            method: 'direct' (broadcasting), 'gemm' (|a|^2+|b|^2-2ab) or 'auto'
+            block_size: rows computed at once (default: ~4M pairs per block)
+
+        hints:
+            memory of each block is block_size x atomNo, blocks only cover the
+            upper triangle and the full matrix is filled by symmetry
+            auto: direct for up to 1000 atoms, gemm for larger structures
+            xyzList can be a (K,N,3) conformer stack, res: (K,N,N) or (K,P),
+            all conformers are computed in each block operation
         '''
-        # atom no
-        atomNo = len(atomName)
-        atomLength = np.zeros((atomNo, atomNo))
-        for i in range(atomNo):
-            # atom1
-            atom1XYZ = xyzList[i]
-            for j in range(atomNo):
-                # atom2
-                atom2XYZ = xyzList[j]
-                if j != i:
-                    _length = Compute.cal_atoms_distance(atom1XYZ, atom2XYZ)
-                else:
-                    _length = 0
+        try:
+            # xyz (conformer stack: (K,N,3), one structure: (1,N,3))
+            xyz = np.asarray(xyzList, dtype=np.float64)
+            stack = xyz.ndim == 3
+            xyz = xyz.reshape(len(xyz) if stack else 1, -1, 3)
+            conformerNo = len(xyz)
+            # atom no
+            atomNo = len(atomName) if atomName is not None else xyz.shape[1]
+            xyz = xyz[:, 0:atomNo]
+
+            # method
+            if method == 'auto':
+                method = 'direct' if atomNo <= 1000 else 'gemm'
+            if method not in ('direct', 'gemm'):
+                raise Exception('method must be direct, gemm or auto.')
+            if method == 'gemm' and atomNo > 0:
+                # center (less cancellation in |a|^2+|b|^2-2ab)
+                xyz = xyz - xyz.mean(axis=1, keepdims=True)
+            xyz = xyz.astype(dtype)
+
+            # block size (all conformers at once)
+            if block_size is None:
+                block_size = (2**22) // max(atomNo*conformerNo, 1)
+            block_size = int(max(1, min(block_size, max(atomNo, 1))))
+
+            # res
+            if condensed:
+                atomLength = np.zeros(
+                    (conformerNo, atomNo*(atomNo-1)//2), dtype=dtype)
+            else:
+                atomLength = np.zeros(
+                    (conformerNo, atomNo, atomNo), dtype=dtype)
+
+            # squared norms
+            xyzSquare = np.einsum('kij,kij->ki', xyz, xyz) if method == 'gemm' else None
+
+            for i0 in range(0, atomNo, block_size):
+                i1 = min(i0+block_size, atomNo)
+                # block (rows i0:i1, columns i0:) of all conformers
+                _block = Compute.__distance_block(
+                    xyz, i0, i1, method, xyzSquare)
                 # save
-                atomLength[i, j] = _length
+                if condensed:
+                    for k in range(i1-i0):
+                        i = i0 + k
+                        _offset = i*atomNo - (i*(i+1))//2
+                        atomLength[:, _offset:_offset +
+                                   atomNo-i-1] = _block[:, k, k+1:]
+                else:
+                    atomLength[:, i0:i1, i0:] = _block
+                    atomLength[:, i1:, i0:i1] = np.swapaxes(
+                        _block[:, :, i1-i0:], 1, 2)
+                    # diagonal block (lower triangle from upper triangle)
+                    _square = atomLength[:, i0:i1, i0:i1]
+                    _lower = np.tril_indices(i1-i0, -1)
+                    _square[:, _lower[0], _lower[1]] = \
+                        _square[:, _lower[1], _lower[0]]
+
+            # diagonal
+            if not condensed:
+                _diagonal = np.arange(atomNo)
+                atomLength[:, _diagonal, _diagonal] = 0
+
+            # res
+            return atomLength if stack else atomLength[0]
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def __distance_block(xyz, i0, i1, method, xyzSquare=None):
+        '''
+        distance between atoms i0:i1 and atoms i0: (upper triangle block)
+        of all conformers (K,N,3)
+        '''
+        if method == 'gemm':
+            _block = np.matmul(xyz[:, i0:i1], np.swapaxes(xyz[:, i0:], 1, 2))
+            _block *= -2
+            _block += xyzSquare[:, i0:i1, None]
+            _block += xyzSquare[:, None, i0:]
+            # rounding
+            np.maximum(_block, 0, out=_block)
+        else:
+            _diff = xyz[:, i0:i1, None, :] - xyz[:, None, i0:, :]
+            _block = np.einsum('kijl,kijl->kij', _diff, _diff)
+        return np.sqrt(_block, out=_block)
+
+    @staticmethod
+    def __geometry_points(xyzList, index, size):
+        '''
+        Gather atom positions of index tuples
+
+        Parameters
+        ----------
+        xyzList : np.array
+            (N,3) coordinates or (K,N,3) conformer stack
+        index : np.array
+            (M,size) atom indices (start from 0)
+        size : int
+            atoms per tuple (2: bond, 3: angle, 4: dihedral)
+
+        Returns
+        -------
+        points : list
+            size arrays of (...,M,3) positions
+        '''
+        xyz = np.asarray(xyzList)
+        if not np.issubdtype(xyz.dtype, np.floating):
+            xyz = xyz.astype(np.float64)
+        index = np.asarray(index, dtype=np.int64).reshape(-1, size)
+        return [xyz[..., index[:, i], :] for i in range(size)]
+
+    @staticmethod
+    def bond_lengths(xyzList, pairs):
+        '''
+        calculate bond lengths (batch)
+
+        args:
+            xyzList: (N,3) xyz of atoms or (K,N,3) conformer stack
+            pairs: (B,2) atom indices (start from 0)
+
+        return:
+            (B,) lengths or (K,B) for a conformer stack
+        '''
+        xyz1, xyz2 = Compute.__geometry_points(xyzList, pairs, 2)
+        _diff = xyz2 - xyz1
+        return np.sqrt(np.einsum('...i,...i->...', _diff, _diff))
+
+    @staticmethod
+    def bond_angles(xyzList, triples, degrees=True):
+        '''
+        calculate bond angles at the middle atom (batch)
+
+        args:
+            xyzList: (N,3) xyz of atoms or (K,N,3) conformer stack
+            triples: (A,3) atom indices (start from 0), angle 1-2-3 at atom 2
+            degrees: if True, return degrees, otherwise radians
+
+        return:
+            (A,) angles [0, 180] or (K,A) for a conformer stack
+        '''
+        xyz1, xyz2, xyz3 = Compute.__geometry_points(xyzList, triples, 3)
+        u = xyz1 - xyz2
+        v = xyz3 - xyz2
+        # atan2(|u x v|, u.v) (accurate near 0 and 180)
+        _cross = np.cross(u, v)
+        angles = np.arctan2(np.sqrt(np.einsum('...i,...i->...', _cross, _cross)),
+                            np.einsum('...i,...i->...', u, v))
+        return np.degrees(angles) if degrees else angles
+
+    @staticmethod
+    def dihedral_angles(xyzList, quads, degrees=True):
+        '''
+        calculate dihedral (torsion) angles (batch)
+
+        args:
+            xyzList: (N,3) xyz of atoms or (K,N,3) conformer stack
+            quads: (D,4) atom indices (start from 0), torsion 1-2-3-4
+            degrees: if True, return degrees, otherwise radians
+
+        return:
+            (D,) signed angles (-180, 180] or (K,D) for a conformer stack
+        '''
+        xyz1, xyz2, xyz3, xyz4 = Compute.__geometry_points(xyzList, quads, 4)
+        b1 = xyz2 - xyz1
+        b2 = xyz3 - xyz2
+        b3 = xyz4 - xyz3
+        # normals
+        n1 = np.cross(b1, b2)
+        n2 = np.cross(b2, b3)
+        # atan2(|b2| b1.(b2 x b3), (b1 x b2).(b2 x b3))
+        _b2Length = np.sqrt(np.einsum('...i,...i->...', b2, b2))
+        angles = np.arctan2(_b2Length*np.einsum('...i,...i->...', b1, n2),
+                            np.einsum('...i,...i->...', n1, n2))
+        # (-pi, pi]
+        angles = np.where(angles <= -np.pi, angles + 2*np.pi, angles)
+        return np.degrees(angles) if degrees else angles
+
+    @staticmethod
+    def __neighbor_table(pairs, atomNo=None):
+        '''
+        Directed bond table sorted by the first atom (CSR)
+
+        Returns
+        -------
+        neighbors : np.array
+            neighbor atom of each directed bond (sorted by first atom)
+        start : np.array
+            (atomNo+1,) first directed bond of each atom
+        '''
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        if atomNo is None:
+            atomNo = int(pairs.max()) + 1 if len(pairs) > 0 else 0
+        # directed bonds
+        directed = np.concatenate((pairs, pairs[:, ::-1]))
+        directed = directed[np.lexsort((directed[:, 1], directed[:, 0]))]
+        start = np.searchsorted(directed[:, 0], np.arange(atomNo+1))
+        return directed[:, 1], start
 
-        # res
-        return atomLength
+    @staticmethod
+    def __expand(first, counts):
+        '''
+        Repeat rows by counts and number the copies (0, 1, ...)
+        '''
+        total = int(counts.sum())
+        groupStart = np.cumsum(counts) - counts
+        rows = np.repeat(np.arange(len(first)), counts)
+        return rows, np.arange(total, dtype=np.int64) - np.repeat(groupStart, counts)
+
+    @staticmethod
+    def angle_index(pairs):
+        '''
+        find all bond angles of a bond list
+
+        args:
+            pairs: (B,2) bonded atom indices (start from 0)
+
+        return:
+            (A,3) atom indices i-j-k (j: center, i < k)
+        '''
+        neighbors, start = Compute.__neighbor_table(pairs)
+        # directed bond j->i, partner bonds j->k after it (same j)
+        _center = np.repeat(np.arange(len(start)-1), np.diff(start))
+        _position = np.arange(len(neighbors))
+        counts = start[_center+1] - _position - 1
+        rows, copies = Compute.__expand(_position, counts)
+        i = neighbors[rows]
+        k = neighbors[rows + 1 + copies]
+        return np.column_stack((i, _center[rows], k)).astype(np.int64).reshape(-1, 3)
+
+    @staticmethod
+    def dihedral_index(pairs):
+        '''
+        find all dihedral angles of a bond list
+
+        args:
+            pairs: (B,2) bonded atom indices (start from 0)
+
+        return:
+            (D,4) atom indices i-j-k-l (j < k)
+        '''
+        neighbors, start = Compute.__neighbor_table(pairs)
+        angles = Compute.angle_index(pairs)
+        # both directions of each angle (i,j,k) and (k,j,i)
+        angles = np.concatenate((angles, angles[:, ::-1])).reshape(-1, 3)
+        # neighbors l of the last atom
+        counts = np.diff(start)[angles[:, 2]] if len(angles) > 0 \
+            else np.zeros(0, dtype=np.int64)
+        rows, copies = Compute.__expand(angles, counts)
+        l = neighbors[start[angles[rows, 2]] + copies]
+        quads = np.column_stack((angles[rows], l)).astype(
+            np.int64).reshape(-1, 4)
+        # l is not j or i (3-membered ring), each torsion once (j < k)
+        _keep = (quads[:, 3] != quads[:, 1]) & (quads[:, 3] != quads[:, 0]) & (
+            quads[:, 1] < quads[:, 2])
+        quads = quads[_keep]
+        return quads[np.lexsort((quads[:, 3], quads[:, 0], quads[:, 2], quads[:, 1]))]
 
     @staticmethod
     def atoms_distance(xyzList, atomName, atom_symbols, atom_index):
@@ -95,32 +347,17 @@ class Compute():
 # ------------------
 
 
-def CalculateMolecularMass(atom_elements, element_source):
+def CalculateMolecularMass(atom_elements):
     '''
     calculate molecular mass [g/mol]
 
     args:
-        atom_elements: such as C, H
-        element_source: periodic element table
+        atom_elements: such as C, H (element masses are read from the
+            shared element store)
     '''
     try:
-        # # check
-        # if element_source is None:
-        #     # load periodic table of elements
-        #     element_source = elements()
-        # res
-        res = 0
-        # atom element size
-        atomElementsSize = len(atom_elements)
-        # atom property
-        _atom_property = ['AtomicMass']
-        # loop
-        for i in range(atomElementsSize):
-            _atom_symbol = atom_elements[i]
-            _atom_prop_res = element_source.atom_properties(
-                _atom_symbol, _atom_property)
-            _atom_prop_val = _atom_prop_res.get(_atom_property[0])
-            res += float(_atom_prop_val)
+        # composition (element counts @ atomic mass)
+        res = Composition(atom_elements).average_mass
 
         return res
     except Exception as e:
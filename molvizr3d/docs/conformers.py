@@ -0,0 +1,341 @@
+# CONFORMER ENSEMBLE
+# --------------------
+
+# import libs
+import numpy as np
+# internals
+from .utility import Utility
+from .molparser import MolParser
+from .compound import Compound
+from .compute import Compute
+from .structure import Structure
+
+
+class ConformerEnsemble():
+    '''
+    Conformers of a compound (topology shared once, coordinates as a stack)
+
+    hint:
+        xyz: (K,N,3) contiguous coordinates, conformer k: xyz[k]
+        atom order, elements and bonds are taken from the first conformer,
+            all conformers must have the same topology
+        compound: topology compound (first conformer), conformer(k) returns
+            a compound with the coordinates of conformer k (nothing re-parsed)
+        bond lengths/angles/dihedrals are computed for all conformers at once
+        xyz can be a memory-mapped .npy file (from_npy), conformer(k) then
+            reads only frame k from disk
+    '''
+
+    def __init__(self, parse_prop, xyzStack, conformer_properties=None):
+        # topology (parse result of the first conformer or a compound)
+        if isinstance(parse_prop, Compound):
+            self._compound = parse_prop
+            parse_prop = parse_prop.parse_prop
+        else:
+            self._compound = None
+        self.parse_prop = parse_prop
+        # coordinates (K,N,3), a float (float32/float64) memmap is used
+        # without copy, other dtypes are converted to float64
+        self._xyz = np.asarray(xyzStack)
+        if not np.issubdtype(self._xyz.dtype, np.floating):
+            self._xyz = self._xyz.astype(np.float64)
+        self._xyz = np.ascontiguousarray(self._xyz)
+        if self._xyz.ndim == 2:
+            self._xyz = self._xyz[None, :, :]
+        # check
+        if self._xyz.ndim != 3 or self._xyz.shape[2] != 3:
+            raise Exception('xyzStack must be a (K,N,3) array.')
+        if self._xyz.shape[1] != int(parse_prop['atom_numbers']):
+            raise Exception(
+                'atom number of conformers does not match the compound.')
+        # properties of each conformer (sdf data items)
+        self.conformer_properties = conformer_properties if conformer_properties is not None \
+            else [{} for _ in range(len(self._xyz))]
+        # built on first access
+        self._xyz_center = None
+
+    def __len__(self):
+        return len(self._xyz)
+
+    def __iter__(self):
+        for k in range(len(self._xyz)):
+            yield self.conformer(k)
+
+    @property
+    def xyz(self):
+        return self._xyz
+
+    @property
+    def atom_numbers(self):
+        return self._xyz.shape[1]
+
+    @property
+    def xyz_center(self):
+        # centered coordinates of each conformer (K,N,3), reads all frames
+        if self._xyz_center is None:
+            self._xyz_center, _ = Structure.CenterObject(
+                self._xyz, Structure.CenterPoints(self._xyz))
+        return self._xyz_center
+
+    @property
+    def compound(self):
+        # topology compound (first conformer)
+        if self._compound is None:
+            self._compound = Compound(self.parse_prop)
+        return self._compound
+
+    @property
+    def bond_index(self):
+        return self.compound.bond_index
+
+    def conformer(self, k):
+        '''
+        Return a conformer as a compound
+
+        Parameters
+        ----------
+        k : int
+            conformer index
+
+        Returns
+        -------
+        compound : Compound
+            compound with the coordinates of conformer k
+        '''
+        try:
+            # frame k (copied to memory, other frames are not read)
+            xyzList = np.array(self._xyz[k])
+            xyzCenterList = self._xyz_center[k] if self._xyz_center is not None \
+                else None
+            return self.compound.with_coordinates(xyzList, xyzCenterList)
+        except Exception as e:
+            raise Exception(e)
+
+    def bond_lengths(self):
+        '''
+        Calculate bond lengths of all conformers
+
+        Returns
+        -------
+        lengths : np.array
+            (K,B) bond lengths (bond_index order)
+        '''
+        return Compute.bond_lengths(self._xyz, self.bond_index)
+
+    def bond_angles(self, degrees=True):
+        '''
+        Calculate bond angles of all conformers
+
+        Parameters
+        ----------
+        degrees : bool
+            if True, degrees, otherwise radians
+
+        Returns
+        -------
+        angle_index : np.array
+            (A,3) atom indices i-j-k (j: center)
+        angles : np.array
+            (K,A) bond angles
+        '''
+        angle_index = Compute.angle_index(self.bond_index)
+        return angle_index, Compute.bond_angles(self._xyz, angle_index, degrees=degrees)
+
+    def dihedral_angles(self, degrees=True):
+        '''
+        Calculate dihedral angles of all conformers
+
+        Parameters
+        ----------
+        degrees : bool
+            if True, degrees, otherwise radians
+
+        Returns
+        -------
+        dihedral_index : np.array
+            (D,4) atom indices i-j-k-l
+        angles : np.array
+            (K,D) dihedral angles (-180, 180]
+        '''
+        dihedral_index = Compute.dihedral_index(self.bond_index)
+        return dihedral_index, Compute.dihedral_angles(self._xyz, dihedral_index, degrees=degrees)
+
+    def distance_matrix(self, condensed=False, dtype=np.float64):
+        '''
+        Build atom-atom distance matrices of all conformers
+
+        Returns
+        -------
+        distance : np.array
+            (K,N,N) matrices or condensed (K,N(N-1)/2) arrays
+        '''
+        return Compute.atoms_distance_matrix(self._xyz, condensed=condensed, dtype=dtype)
+
+    def rmsd(self, reference=0):
+        '''
+        Root mean square deviation of conformers from a reference conformer
+        (centered coordinates, no rotation fitting)
+
+        Parameters
+        ----------
+        reference : int
+            reference conformer index
+
+        Returns
+        -------
+        res : np.array
+            (K,) rmsd
+        '''
+        _diff = self.xyz_center - self.xyz_center[reference]
+        return np.sqrt(np.einsum('kij,kij->k', _diff, _diff) / max(self.atom_numbers, 1))
+
+    def view3d(self, conformer=0, **kwargs):
+        '''
+        Draw a conformer (same arguments as Compound.view3d)
+
+        Parameters
+        ----------
+        conformer : int
+            conformer index
+        '''
+        return self.conformer(conformer).view3d(**kwargs)
+
+    def save(self, file_name='', location=''):
+        '''
+        Save coordinates as a .npy file (load with from_npy), frames are
+        written one by one in the dtype of the stack
+
+        Parameters
+        ----------
+        file_name : str
+            file name
+        location : str
+            location
+
+        Returns
+        -------
+        fileLoc : str
+            file path
+        '''
+        return Utility.SaveCoordinateStack(self._xyz, file_name=file_name, location=location)
+
+    @staticmethod
+    def from_npy(topology, filePath, mmap=True):
+        '''
+        Build an ensemble from a .npy coordinate stack
+
+        Parameters
+        ----------
+        topology : Compound | dict
+            compound or parse result with the atom order of the stack
+        filePath : str
+            .npy file path (Utility.SaveCoordinateStack)
+        mmap : bool
+            if True, coordinates stay on disk (memory-mapped), memory use is
+            the topology plus the frames in use
+
+        Returns
+        -------
+        ensemble : ConformerEnsemble
+            conformer ensemble
+        '''
+        try:
+            xyzStack = Utility.LoadCoordinateStack(filePath, mmap=mmap)
+            return ConformerEnsemble(topology, xyzStack)
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def from_sdf(filePath, skip=0, limit=None):
+        '''
+        Build an ensemble from a multi-record sdf file (one conformer per record)
+
+        Parameters
+        ----------
+        filePath : str
+            sdf file path
+        skip : int
+            number of records to skip
+        limit : int
+            maximum number of conformers (default None: all)
+
+        Returns
+        -------
+        ensemble : ConformerEnsemble
+            conformer ensemble
+
+        hints:
+            the first record is parsed completely, the other records only
+            through their connection table (coordinates and topology check)
+        '''
+        try:
+            MolParserC = MolParser(filePath)
+            # res
+            parse_prop = None
+            xyzStack = []
+            conformerProperties = []
+
+            for _, _, recordContent in Utility.IterSdfRecords(
+                    filePath, skip=skip, limit=limit):
+                if parse_prop is None:
+                    # topology (first record, parsed once)
+                    parse_prop = MolParserC.sdf_parser(recordContent)
+                    atomList = list(parse_prop['atom_elements'])
+                    bondMatrix = ConformerEnsemble.__sorted_bonds(
+                        parse_prop['bond_matrix'])
+                    compoundProperties = parse_prop['compound_properties']
+                    xyzList = parse_prop['xyz_list']
+                else:
+                    _atomList, xyzList, _bondMatrix, compoundProperties = \
+                        MolParser.sdf_coordinates(recordContent, properties=True)
+                    if list(_atomList) != atomList or \
+                            not np.array_equal(ConformerEnsemble.__sorted_bonds(_bondMatrix), bondMatrix):
+                        raise Exception(
+                            'conformers do not share the same topology.')
+                conformerProperties.append(compoundProperties)
+                xyzStack.append(xyzList)
+
+            # check
+            if parse_prop is None:
+                raise Exception('no sdf record found.')
+
+            return ConformerEnsemble(parse_prop, np.array(xyzStack), conformerProperties)
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def __sorted_bonds(bondMatrix):
+        '''
+        Bond rows sorted by atom ids (topology check)
+        '''
+        bondMatrix = np.asarray(bondMatrix, dtype=np.int64).reshape(-1, 3)
+        return bondMatrix[np.lexsort((bondMatrix[:, 1], bondMatrix[:, 0]))]
+
+    @staticmethod
+    def from_json(jsonSource):
+        '''
+        Build an ensemble from a PubChem json file (all conformers)
+
+        Parameters
+        ----------
+        jsonSource : dict
+            json file content
+
+        Returns
+        -------
+        ensemble : ConformerEnsemble
+            conformer ensemble (atom order of json_parser)
+        '''
+        try:
+            MolParserC = MolParser(None)
+            # topology (first conformer)
+            parse_prop = MolParserC.json_parser(jsonSource)
+            # coordinates (json atom order)
+            xyzStack = MolParser.json_conformers(jsonSource)
+            # atom order of json_parser (set by the first conformer)
+            atomIdConversion = parse_prop['atom_id_conversion']
+            xyzStack = xyzStack[:, atomIdConversion[:, 0] - 1]
+
+            return ConformerEnsemble(parse_prop, xyzStack)
+        except Exception as e:
+            raise Exception(e)
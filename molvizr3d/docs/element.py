@@ -2,9 +2,10 @@
 # -----------------
 
 # import libs
-import pandas as pd
 import os
 import numpy as np
+# internals
+from .elementstore import ElementStore
 
 
 class Element():
@@ -16,7 +17,10 @@ class Element():
     _ele = ''
 
     def __init__(self, atom_symbol=''):
-        self.elementsource = self.__load_elements()
+        # shared store (element table is loaded once per process)
+        self._store = ElementStore.get_instance()
+        # data frame (built on first access)
+        self._elementsource = None
         self._ele = atom_symbol
 
     def __call__(self, ):
@@ -25,6 +29,8 @@ class Element():
 
     @property
     def elementsource(self):
+        if self._elementsource is None:
+            self._elementsource = self._store.frame
         return self._elementsource
 
     @elementsource.setter
@@ -39,43 +45,48 @@ class Element():
     def ele(self, value):
         pass
 
-    def __load_elements(self):
-        '''
-        load elements from a csv file
-        '''
-        try:
-            # data file
-            dataFile = 'PubChemElements_all.csv'
-            # abs path
-            pathAbs = os.path.abspath(os.path.dirname(__file__))
-            # relative path to database file
-            dataPathDirRel = '../data'
-            # database file
-            dataPath = os.path.join(pathAbs, dataPathDirRel, dataFile)
-
-            with open(dataPath, 'rb') as f:
-                df = pd.read_csv(f)
-
-            return df
-
-        except Exception as e:
-            raise Exception(e)
-
     def properties(self):
         '''
         return all atom properties
         '''
-        df = self.elementsource
-        filt = df['Symbol'] == str(self._ele).strip()
-        return df.loc[filt]
+        return self.find_atom(self._ele)
 
     def find_atom(self, atom_symbol):
         '''
         return the selected atom properties
         '''
         df = self.elementsource
-        filt = df['Symbol'] == str(atom_symbol).strip()
-        return df.loc[filt]
+        # row
+        row = self._store.symbol_row(atom_symbol)
+        return df.iloc[[row]] if row != -1 else df.iloc[[]]
+
+    def find_atoms(self, atoms, atom_properties=['Symbol', 'AtomicMass', 'AtomicRadius', 'CPKHexColor']):
+        '''
+        find properties of a batch of atoms
+
+        args:
+            atoms: a list/array of atomic numbers (such as [6,1,1]) or symbols (such as ['C','H','H'])
+            atom_properties: a list of desired properties
+
+        return:
+            a dict of property -> np.array (same order as atoms)
+        '''
+        try:
+            # rows
+            rows = self._store.rows(atoms)
+
+            # check
+            if np.any(rows == -1):
+                notFound = np.asarray(atoms)[rows == -1]
+                raise Exception(
+                    f'element not found: {sorted(set(notFound.tolist()))}')
+
+            # gather
+            return {str(item): np.take(self._store.column(item), rows)
+                    for item in atom_properties}
+
+        except Exception as e:
+            raise Exception(e)
 
     def atom_properties(self, atom_symbol, atom_properties=[]):
         '''
@@ -98,18 +109,18 @@ class Element():
             if atomPropertySize == 0:
                 raise Exception('property list is empty.')
 
-            df = self.elementsource
-            filt = df['Symbol'] == str(atom_symbol).strip()
+            # row
+            row = self._store.symbol_row(atom_symbol)
+            if row == -1:
+                raise Exception('element not found.')
 
             # check
             if atomPropertySize == 1:
-                rowRes = df.loc[filt][atom_properties[0]]
-                rowRes = rowRes.to_numpy()[0]
+                rowRes = self._store.column(atom_properties[0])[row]
                 # add prop
                 resDict[str(atom_properties[0])] = rowRes
             elif atomPropertySize > 1:
-                rowRes = df.loc[filt][atom_properties]
-                rowRes = rowRes.to_numpy()[0]
+                rowRes = self._store.row_values(row, atom_properties)
                 # add prop
                 for i in range(atomPropertySize):
                     resDict[str(atom_properties[i])] = rowRes[i]
@@ -142,31 +153,21 @@ class Element():
             if atom_property_name_size == 0 or atom_property_value_size == 0:
                 raise Exception('args error.')
 
-            df = self.elementsource
+            # symbols
+            symbols = self._store.column('Symbol')
 
-            if atom_property_value_size == 1:
-                filt = df[str(atom_property_name)] == atom_property_value[0]
-                _rowRes = df.loc[filt][['Symbol']]
-                _rowRes = _rowRes.to_numpy()[0]
+            for i in range(atom_property_value_size):
+                # row
+                row = self._store.property_row(
+                    str(atom_property_name), atom_property_value[i])
                 # check
-                if len(_rowRes) > 0:
-                    # add prop
-                    _val = {'symbol': _rowRes[0], str(
-                        atom_property_name): atom_property_value[0]}
-                    res.append(_val)
-                else:
+                if row == -1:
                     raise Exception('element not found.')
-            elif atom_property_value_size > 1:
-                for i in range(atom_property_value_size):
-                    filt = df[str(atom_property_name)
-                              ] == atom_property_value[i]
-                    _rowRes = df.loc[filt][['Symbol']]
-                    _rowRes = _rowRes.to_numpy()[0]
-                    # add
-                    _val = {'symbol': _rowRes[0], str(
-                        atom_property_name): atom_property_value[i]}
-                    # save
-                    res.append(_val)
+                # add
+                _val = {'symbol': symbols[row], str(
+                    atom_property_name): atom_property_value[i]}
+                # save
+                res.append(_val)
 
             # res
             return res
@@ -0,0 +1,395 @@
+# ELEMENT STORE
+# --------------
+
+# import libs
+import os
+import hashlib
+import threading
+import numpy as np
+
+
+class ElementStore():
+    '''
+    Periodic table store (loaded once per process, shared by all threads)
+
+    hint:
+        frame: element DataFrame (PubChemElements_all.csv, built on first access)
+        symbol_index: dict of symbol -> row
+        atomic_number_index: np.array of atomic number -> row (-1: not found)
+        symbol_table: list of symbols indexed by atomic number (index 0: unknown)
+        atomic_number_table: dict of symbol -> atomic number
+        monoisotopic_mass: most abundant isotope mass of each row
+            (MonoisotopicMass.csv, nan: no stable isotope)
+
+        columns are loaded read-only from the precompiled table
+        (PubChemElements_all.npz) without pandas, the csv files stay the
+        source of truth: the table is rebuilt at build time
+        (scripts/build_element_table.py, build_table), nothing is written
+        at runtime. if the table is missing, it is built in memory from
+        the csv files (pandas)
+    '''
+
+    # instance
+    _instance = None
+    _lock = threading.Lock()
+
+    # data files
+    _element_file = 'PubChemElements_all.csv'
+    _isotope_file = 'MonoisotopicMass.csv'
+    _table_file = 'PubChemElements_all.npz'
+
+    def __init__(self):
+        # load columns (np.array)
+        self._columns, self._monoisotopic_mass = ElementStore.__load_table()
+        # data frame (built on first access)
+        self._frame = None
+        # property indexes (value -> row)
+        self._property_index = {}
+        # lock for indexes built on demand
+        self._index_lock = threading.Lock()
+
+        # symbol -> row
+        symbols = [str(item).strip() for item in self.column('Symbol').tolist()]
+        self.symbol_index = {}
+        for i, item in enumerate(symbols):
+            self.symbol_index.setdefault(item, i)
+
+        # atomic number -> row
+        atomicNumbers = self.column('AtomicNumber').astype(np.int64)
+        self.atomic_number_index = np.full(
+            int(atomicNumbers.max()) + 1, -1, dtype=np.int64)
+        self.atomic_number_index[atomicNumbers[::-1]] = np.arange(
+            len(atomicNumbers))[::-1]
+
+        # symbol table
+        self.symbol_table = [''] * len(self.atomic_number_index)
+        for i in range(len(symbols)):
+            self.symbol_table[atomicNumbers[i]] = symbols[i]
+        # atomic number table
+        self.atomic_number_table = dict(
+            zip(symbols, atomicNumbers.tolist()))
+
+    @staticmethod
+    def get_instance():
+        '''
+        Return the element store (created on first call)
+        '''
+        if ElementStore._instance is None:
+            with ElementStore._lock:
+                if ElementStore._instance is None:
+                    ElementStore._instance = ElementStore()
+        return ElementStore._instance
+
+    @staticmethod
+    def __data_path(dataFile):
+        '''
+        Return the path of a data file
+        '''
+        # abs path
+        pathAbs = os.path.abspath(os.path.dirname(__file__))
+        # relative path to database file
+        dataPathDirRel = '../data'
+        # database file
+        return os.path.normpath(os.path.join(pathAbs, dataPathDirRel, dataFile))
+
+    @staticmethod
+    def __load_elements(dataFile='PubChemElements_all.csv'):
+        '''
+        load elements from a csv file
+        '''
+        try:
+            import pandas as pd
+            # database file
+            dataPath = ElementStore.__data_path(dataFile)
+
+            with open(dataPath, 'rb') as f:
+                df = pd.read_csv(f)
+
+            return df
+
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def __source_hash():
+        '''
+        Return the sha1 of the csv files (source of truth)
+        '''
+        sourceHash = hashlib.sha1()
+        for dataFile in [ElementStore._element_file, ElementStore._isotope_file]:
+            with open(ElementStore.__data_path(dataFile), 'rb') as f:
+                sourceHash.update(f.read())
+        return sourceHash.hexdigest()
+
+    @staticmethod
+    def __load_table():
+        '''
+        Load columns from the precompiled table (read-only), the table is
+        built in memory if the file is missing
+
+        Returns
+        -------
+        columns : dict
+            column name -> np.array (string columns: object arrays, nan
+            for missing values as in pandas)
+        monoisotopicMass : np.array
+            isotope mass of each row
+        '''
+        tablePath = ElementStore.__data_path(ElementStore._table_file)
+
+        # check
+        if not os.path.isfile(tablePath):
+            # build from csv (not saved)
+            return ElementStore.__read_table(
+                ElementStore.__compile_table(ElementStore.__source_hash()))
+
+        try:
+            with np.load(tablePath, allow_pickle=False) as table:
+                return ElementStore.__read_table(table)
+        except Exception as e:
+            raise Exception(f'element table {tablePath} cannot be read: {e}')
+
+    @staticmethod
+    def __read_table(table):
+        '''
+        Convert table arrays to columns
+        '''
+        columns = {}
+        for name in table['columns'].tolist():
+            values = table['col_' + name]
+            # string column
+            if values.dtype.kind == 'U':
+                values = values.astype(object)
+                values[table['na_' + name]] = np.nan
+            columns[name] = values
+        return columns, table['monoisotopic_mass']
+
+    @staticmethod
+    def __compile_table(sourceHash):
+        '''
+        Compile csv files into table arrays (np.savez format)
+        '''
+        df = ElementStore.__load_elements(ElementStore._element_file)
+        table = {
+            'source_hash': np.array(sourceHash),
+            'columns': np.array([str(item) for item in df.columns])
+        }
+        # columns
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if values.dtype == object:
+                # string column (missing values as mask)
+                missing = df[name].isna().to_numpy()
+                table['col_' + name] = np.array(
+                    ['' if missing[i] else str(item) for i, item in enumerate(values)])
+                table['na_' + name] = missing
+            else:
+                table['col_' + name] = values
+
+        # isotope masses (aligned with element rows)
+        dfIsotope = ElementStore.__load_elements(ElementStore._isotope_file)
+        atomicNumbers = df['AtomicNumber'].to_numpy(dtype=np.int64)
+        isotopeMass = dict(zip(dfIsotope['AtomicNumber'].to_numpy(dtype=np.int64).tolist(),
+                               dfIsotope['MonoisotopicMass'].to_numpy(dtype=np.float64).tolist()))
+        table['monoisotopic_mass'] = np.array(
+            [isotopeMass.get(item, np.nan) for item in atomicNumbers.tolist()], dtype=np.float64)
+
+        return table
+
+    @staticmethod
+    def table_is_stale():
+        '''
+        Check the precompiled table against the csv files (build time)
+
+        Returns
+        -------
+        res : bool
+            True if the table is missing or built from other csv files
+        '''
+        tablePath = ElementStore.__data_path(ElementStore._table_file)
+        # check
+        if not os.path.isfile(tablePath):
+            return True
+        with np.load(tablePath, allow_pickle=False) as table:
+            return str(table['source_hash']) != ElementStore.__source_hash()
+
+    @staticmethod
+    def build_table(force=False):
+        '''
+        Build the precompiled element table from the csv files (build time,
+        writes into the package data directory)
+
+        Parameters
+        ----------
+        force : bool
+            if False, the table is only rebuilt if it is stale
+
+        Returns
+        -------
+        tablePath : str
+            table file path
+        '''
+        try:
+            tablePath = ElementStore.__data_path(ElementStore._table_file)
+            # check
+            if not force and not ElementStore.table_is_stale():
+                return tablePath
+            table = ElementStore.__compile_table(ElementStore.__source_hash())
+            np.savez_compressed(tablePath, **table)
+            return tablePath
+        except Exception as e:
+            raise Exception(e)
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            with self._index_lock:
+                if self._frame is None:
+                    self._frame = ElementStore.__load_elements(
+                        ElementStore._element_file)
+        return self._frame
+
+    @property
+    def monoisotopic_mass(self):
+        return self._monoisotopic_mass
+
+    def column(self, name):
+        '''
+        Return a property column as np.array
+
+        Parameters
+        ----------
+        name : str
+            property name such as AtomicMass
+
+        Returns
+        -------
+        res : np.array
+            property values (row order)
+        '''
+        return self._columns[str(name)]
+
+    def symbol_row(self, symbol):
+        '''
+        Return the row of an element symbol (-1: not found)
+        '''
+        return self.symbol_index.get(str(symbol).strip(), -1)
+
+    def atomic_number_row(self, atomic_number):
+        '''
+        Return the row of an atomic number (-1: not found)
+        '''
+        try:
+            _atomicNumber = int(atomic_number)
+            # check (6.5, '6' are not atomic numbers)
+            if _atomicNumber != atomic_number:
+                return -1
+        except (TypeError, ValueError):
+            return -1
+        if 0 <= _atomicNumber < len(self.atomic_number_index):
+            return int(self.atomic_number_index[_atomicNumber])
+        return -1
+
+    def rows(self, atoms):
+        '''
+        Return rows of atomic numbers or element symbols (batch)
+
+        Parameters
+        ----------
+        atoms : list | np.array
+            atomic numbers such as [6,1,1] or symbols such as ['C','H','H']
+
+        Returns
+        -------
+        rows : np.array
+            row numbers (-1: not found), same shape as atoms
+        '''
+        atoms = np.asarray(atoms)
+
+        # atomic numbers
+        if atoms.dtype.kind in 'iuf' or atoms.size == 0:
+            atomicNumbers = np.zeros(atoms.shape, dtype=np.int64)
+            # check (integer values in the table range)
+            valid = np.isfinite(atoms) if atoms.dtype.kind == 'f' \
+                else np.ones(atoms.shape, dtype=bool)
+            atomicNumbers[valid] = atoms[valid].astype(np.int64)
+            valid &= (atomicNumbers == atoms) & (atomicNumbers >= 0) & \
+                (atomicNumbers < len(self.atomic_number_index))
+            # gather
+            rows = np.full(atoms.shape, -1, dtype=np.int64)
+            rows[valid] = np.take(self.atomic_number_index,
+                                  atomicNumbers[valid])
+            return rows
+
+        # symbols (one dict lookup per distinct symbol)
+        symbols, symbolInverse = np.unique(
+            atoms.astype(str), return_inverse=True)
+        symbolRows = np.array([self.symbol_row(item) for item in symbols.tolist()],
+                              dtype=np.int64)
+        return np.take(symbolRows, symbolInverse).reshape(atoms.shape)
+
+    def property_row(self, name, value):
+        '''
+        Return the first row whose property equals value (-1: not found)
+
+        Parameters
+        ----------
+        name : str
+            property name such as AtomicNumber
+        value : any
+            property value
+
+        Returns
+        -------
+        row : int
+            row number
+        '''
+        # indexed columns
+        if name == 'AtomicNumber':
+            return self.atomic_number_row(value)
+        if name == 'Symbol':
+            return self.symbol_index.get(value, -1)
+
+        # other columns (index built on first query)
+        propertyIndex = self._property_index.get(name)
+        if propertyIndex is None:
+            with self._index_lock:
+                propertyIndex = self._property_index.get(name)
+                if propertyIndex is None:
+                    propertyIndex = {}
+                    for i, item in enumerate(self.column(name).tolist()):
+                        # skip nan
+                        if item != item:
+                            continue
+                        propertyIndex.setdefault(item, i)
+                    self._property_index[name] = propertyIndex
+
+        try:
+            return propertyIndex.get(value, -1)
+        except TypeError:
+            return -1
+
+    def row_values(self, row, names):
+        '''
+        Return property values of a row
+
+        Parameters
+        ----------
+        row : int
+            row number
+        names : list
+            property names
+
+        Returns
+        -------
+        res : list
+            property values (same types as a DataFrame row)
+        '''
+        columns = [self.column(item) for item in names]
+        # numeric columns share a common dtype
+        if all(item.dtype != object for item in columns):
+            commonType = np.result_type(*[item.dtype for item in columns]).type
+            return [commonType(item[row]) for item in columns]
+        # mixed columns (python values)
+        return [item[row].item() if isinstance(item[row], np.generic) else item[row]
+                for item in columns]
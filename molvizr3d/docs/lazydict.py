@@ -0,0 +1,129 @@
+# LAZY DICTIONARY
+# -----------------
+
+
+class LazyDict(dict):
+    '''
+    dict whose values are built on first access
+
+    hint:
+        loaders are functions without arguments, the result is saved
+        in the dict and the loader is removed. pickle/copy return a plain
+        dict with all values built.
+    '''
+
+    def __init__(self, values={}, loaders={}):
+        dict.__init__(self, values)
+        # pending values
+        self._loaders = dict(loaders)
+
+    def __load(self, key):
+        '''
+        Build a pending value
+        '''
+        loader = self._loaders.pop(key)
+        value = loader()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        if key in self._loaders:
+            return self.__load(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self._loaders.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if self._loaders.pop(key, None) is None:
+            dict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._loaders or dict.__contains__(self, key)
+
+    def __iter__(self):
+        yield from list(dict.keys(self)) + list(self._loaders)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._loaders)
+
+    def __eq__(self, other):
+        return self.materialize() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return repr(self.materialize())
+
+    def __reduce__(self):
+        return (dict, (self.materialize(),))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        # through __setitem__ (a pending loader must not overwrite the value)
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *args):
+        if key in self._loaders:
+            self.__load(key)
+        return dict.pop(self, key, *args)
+
+    def keys(self):
+        return self.materialize().keys()
+
+    def values(self):
+        return self.materialize().values()
+
+    def items(self):
+        return self.materialize().items()
+
+    def copy(self):
+        return self.materialize()
+
+    def shallow_copy(self, exclude=()):
+        '''
+        Return a LazyDict with the same values and pending loaders
+        (nothing is built)
+
+        Parameters
+        ----------
+        exclude : list
+            keys left out of the copy
+        '''
+        values = {key: value for key, value in dict.items(self)
+                  if key not in exclude}
+        loaders = {key: value for key, value in self._loaders.items()
+                   if key not in exclude}
+        return LazyDict(values, loaders)
+
+    def pending(self):
+        '''
+        Return keys which are not built yet
+        '''
+        return list(self._loaders)
+
+    def materialize(self):
+        '''
+        Build all pending values
+
+        Returns
+        -------
+        res : dict
+            plain dict
+        '''
+        for key in list(self._loaders):
+            self.__load(key)
+        return dict(dict.items(self))
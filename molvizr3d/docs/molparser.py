@@ -2,14 +2,22 @@
 # ----------------
 
 # import libs
+import os
 import re
 import numpy as np
 import copy
+from concurrent.futures import ProcessPoolExecutor, as_completed
 # internals
 from ..config import OBS_POSITIONS
 from .structure import Structure
 from .element import Element
 from .utility import Utility
+from .lazydict import LazyDict
+from .atomtable import AtomTable
+from .bondperception import BondPerception
+
+# sdf data header such as `> <PUBCHEM_COMPOUND_CID>`
+SDF_DATA_HEADER = re.compile(r'>\s*<(.*)>')
 
 
 class MolParser():
@@ -20,6 +28,8 @@ class MolParser():
 
     def __init__(self, filepath):
         self.filepath = filepath
+        # loaded sdf indices (file path -> index)
+        self._sdf_index = {}
 
     @property
     def mat(self):
@@ -83,7 +93,8 @@ class MolParser():
             # method selection
             parserFun = {
                 'sdf': self.sdf_parser,
-                'json': self.json_parser
+                'json': self.json_parser,
+                'xyz': self.xyz_parser
             }
 
             # parse file
@@ -94,7 +105,211 @@ class MolParser():
         except Exception as e:
             raise Exception(e)
 
-    def sdf_parser(self, sdfSource, sdfVersion='V2000'):
+    def iter_sdf(self, filePath=None, skip=0, limit=None, lazy=False):
+        '''
+        Read a multi-record sdf file record by record (streaming)
+
+        Parameters
+        ----------
+        filePath : str
+            full file name with directory (default: parser file path)
+        skip : int
+            number of records to skip from the beginning (default 0)
+        limit : int
+            maximum number of records to parse (default None: all)
+        lazy : bool
+            build atom/bond blocks and properties on first access (default False)
+
+        Returns
+        -------
+        generator
+            sdf_parser result of each record
+
+        hints:
+            record_index: record number in the file (starts from 0)
+            record_offset: byte offset of the record in the file
+        '''
+        # file path
+        filePath = filePath if filePath else self.filepath
+
+        for recordIndex, recordOffset, recordContent in Utility.IterSdfRecords(
+                filePath, skip=skip, limit=limit):
+            # parse record
+            res = self.sdf_parser(recordContent, lazy=lazy)
+            # record position
+            res['record_index'] = recordIndex
+            res['record_offset'] = recordOffset
+            yield res
+
+    def sdf_index(self, filePath=None, indexPath=None, rebuild=False):
+        '''
+        Load the byte-offset index of a multi-record sdf file, the index
+        file is built (one scan) if it does not exist or is older than
+        the sdf file
+
+        Parameters
+        ----------
+        filePath : str
+            full file name with directory (default: parser file path)
+        indexPath : str
+            index file path (default: sdf file path + .idx)
+        rebuild : bool
+            force to rebuild the index file (default False)
+
+        Returns
+        -------
+        sdfIndex : dict
+            offset: record byte offsets
+            size: record sizes in bytes
+            cid: record cids
+            name: record names
+            cid_map: cid -> record index
+        '''
+        try:
+            # file path
+            filePath = filePath if filePath else self.filepath
+            # index path
+            indexPath = indexPath if indexPath else filePath + '.idx'
+
+            # check index file
+            if rebuild or not os.path.isfile(indexPath) or \
+                    os.path.getmtime(indexPath) < os.path.getmtime(filePath):
+                sdfIndex = Utility.BuildSdfIndex(filePath, indexPath)
+            else:
+                sdfIndex = Utility.LoadSdfIndex(indexPath)
+
+            # keep for the next lookups
+            self._sdf_index[filePath] = sdfIndex
+
+            # res
+            return sdfIndex
+        except Exception as e:
+            raise Exception(e)
+
+    def read_sdf_record(self, recordIndex=None, cid=None, filePath=None, sdfIndex=None, lazy=False):
+        '''
+        Parse a single record of a multi-record sdf file using its
+        record number or cid (random access)
+
+        Parameters
+        ----------
+        recordIndex : int
+            record number in the file (starts from 0)
+        cid : str | int
+            compound cid (PUBCHEM_COMPOUND_CID)
+        filePath : str
+            full file name with directory (default: parser file path)
+        sdfIndex : dict
+            loaded index (default: sdf_index() of the file, loaded once)
+        lazy : bool
+            build atom/bond blocks and properties on first access (default False)
+
+        Returns
+        -------
+        res : dict
+            sdf_parser result along with record_index and record_offset
+        '''
+        try:
+            # file path
+            filePath = filePath if filePath else self.filepath
+            # index (loaded once per file)
+            if sdfIndex is None:
+                sdfIndex = self._sdf_index.get(filePath)
+            if sdfIndex is None:
+                sdfIndex = self.sdf_index(filePath)
+
+            # find record
+            if recordIndex is None:
+                if cid is None:
+                    raise Exception('record index or cid is required.')
+                recordIndex = sdfIndex['cid_map'].get(str(cid).strip())
+                if recordIndex is None:
+                    raise Exception(f'cid {cid} is not found!')
+
+            # check
+            if recordIndex < 0 or recordIndex >= len(sdfIndex['offset']):
+                raise Exception('record index is out of range.')
+
+            # record
+            recordOffset = int(sdfIndex['offset'][recordIndex])
+            recordContent = Utility.ReadSdfRecord(
+                filePath, recordOffset, sdfIndex['size'][recordIndex])
+
+            # parse record
+            res = self.sdf_parser(recordContent, lazy=lazy)
+            # record position
+            res['record_index'] = int(recordIndex)
+            res['record_offset'] = recordOffset
+            return res
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def parse_many(filePaths, workers=None, chunk_size=None, ordered=True):
+        '''
+        Parse many files (sdf, json, xyz) over a process pool
+
+        Parameters
+        ----------
+        filePaths : list | str
+            list of file paths or a directory (sdf/json/xyz files)
+        workers : int
+            number of worker processes (default: cpu count), 1 parses
+            in the current process
+        chunk_size : int
+            number of files sent to a worker at once (default: about 4
+            chunks per worker)
+        ordered : bool
+            if True, return results in the order of filePaths, otherwise as
+            completed (default True)
+
+        Returns
+        -------
+        generator
+            file_path: file path
+            res: read_file result (None if failed)
+            error: error message (None if parsed)
+        '''
+        # directory
+        if isinstance(filePaths, str):
+            if not os.path.isdir(filePaths):
+                raise Exception("target path is not valid.")
+            filePaths = [os.path.join(filePaths, item)
+                         for item in sorted(os.listdir(filePaths))
+                         if os.path.splitext(item)[1].lower() in ('.sdf', '.json', '.xyz')]
+        else:
+            filePaths = list(filePaths)
+
+        # size
+        filePathsSize = len(filePaths)
+        if filePathsSize == 0:
+            return
+
+        # workers
+        workers = workers if workers else (os.cpu_count() or 1)
+        workers = max(1, min(int(workers), filePathsSize))
+        # chunks
+        if not chunk_size:
+            chunk_size = max(1, -(-filePathsSize // (workers*4)))
+        fileChunks = [filePaths[i:i+chunk_size]
+                      for i in range(0, filePathsSize, chunk_size)]
+
+        # serial
+        if workers == 1:
+            for fileChunk in fileChunks:
+                yield from ParseFiles(fileChunk)
+            return
+
+        # process pool
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(ParseFiles, fileChunk)
+                       for fileChunk in fileChunks]
+            # check
+            futuresIter = futures if ordered else as_completed(futures)
+            for future in futuresIter:
+                yield from future.result()
+
+    def sdf_parser(self, sdfSource, sdfVersion='V2000', lazy=False, perceive_bonds=False):
         '''
         Parse sdf file
 
@@ -104,7 +319,15 @@ class MolParser():
             sdf file content
 
         sdfVersion : str
-            sdf file version (default V2000)
+            sdf file version (default V2000), V2000/V3000 is detected from
+            the counts line
+        lazy : bool
+            if True, atom_block, bond_block, compound_properties and mat_*
+            are built on first access (default False)
+        perceive_bonds : bool
+            if True, bonds of a structure without a bond table are found
+            from atom coordinates (default False, a sdf record without
+            bonds such as a salt or an ion pair is kept as is)
 
         Returns
         -------
@@ -125,6 +348,7 @@ class MolParser():
                 xyz_list: xyz list
                 xyz_center_list: xyz center list
                 compound_properties: compound properties
+                bond_matrix: (B,3) bond rows in bond block order
 
         '''
         # decode binary
@@ -140,18 +364,343 @@ class MolParser():
 
         # counts line
         countsLine = sdfSourceList[3]
-        if countsLine.find('V2000') == -1:
-            raise Exception(
-                'SDF file version is not compatible with this method, import 2000 version.')
-        # check
-        countsLineList = countsLine.split()
+
+        # connection table
+        MENDi, atomNo, bondNo, atomList, xyzList, bondMatrix = \
+            MolParser.__sdf_ctab(sdfSourceList)
+
+        # res
+        return MolParser.__structure_res(headerBlock, countsLine, atomNo, bondNo, atomList,
+                                         xyzList, bondMatrix, sdfSourceList[MENDi+1:],
+                                         lazy, perceive_bonds)
+
+    @staticmethod
+    def __sdf_ctab(sdfSourceList):
+        '''
+        Parse the connection table of a sdf record (V2000/V3000)
+
+        Returns
+        -------
+        MENDi : int
+            line index of 'M  END'
+        atomNo, bondNo, atomList, xyzList, bondMatrix
+            connection table
+        '''
+        # counts line
+        countsLine = sdfSourceList[3]
 
         # find 'M END'
-        MENDi = -1
         MENDi = sdfSourceList.index('M  END')
         # connection table
-        if MENDi != -1:
-            connectionTable = sdfSourceList[4:MENDi]
+        connectionTable = sdfSourceList[4:MENDi]
+
+        # check version
+        if countsLine.find('V3000') != -1:
+            atomNo, bondNo, atomList, xyzList, bondMatrix = \
+                MolParser.__sdf_v3000_ctab(connectionTable)
+        elif countsLine.find('V2000') != -1:
+            atomNo, bondNo, atomList, xyzList, bondMatrix = \
+                MolParser.__sdf_v2000_ctab(countsLine, connectionTable)
+        else:
+            raise Exception(
+                'SDF file version is not compatible with this method, import 2000/3000 version.')
+
+        return MENDi, atomNo, bondNo, atomList, xyzList, bondMatrix
+
+    @staticmethod
+    def sdf_coordinates(sdfSource, properties=False):
+        '''
+        Parse only the connection table of a sdf record (no atom/bond
+        blocks or centering), used to read conformers
+
+        Parameters
+        ----------
+        sdfSource : str
+            sdf record content
+        properties : bool
+            if True, data items of the record are returned too
+
+        Returns
+        -------
+        atomList : list
+            atom symbols
+        xyzList : np.array
+            (N,3) atom coordinates
+        bondMatrix : np.array
+            (B,3) bond rows [atom1 id, atom2 id, bond type]
+        compoundProperties : dict
+            data items (only if properties is True)
+        '''
+        try:
+            sdfSourceList = sdfSource.splitlines()
+            MENDi, _, _, atomList, xyzList, bondMatrix = MolParser.__sdf_ctab(
+                sdfSourceList)
+            if properties:
+                compoundProperties = MolParser.__var_analyzer(
+                    MolParser.__var_finder(sdfSourceList[MENDi+1:]))
+                return atomList, xyzList, bondMatrix, compoundProperties
+            return atomList, xyzList, bondMatrix
+        except Exception as e:
+            raise Exception(e)
+
+    def xyz_parser(self, xyzSource, lazy=False, perceive_bonds=True):
+        '''
+        Parse xyz file (first frame)
+
+        Parameters
+        ----------
+        xyzSource : str
+            xyz file content
+        lazy : bool
+            if True, atom_block, bond_block, compound_properties and mat_*
+            are built on first access (default False)
+        perceive_bonds : bool
+            if True, bonds are found from atom coordinates (default True)
+
+        Returns
+        -------
+        res : dict
+            same keys as sdf_parser
+
+        hints:
+            line 1: atom number
+            line 2: comment (header_block)
+            atom lines: symbol x y z
+        '''
+        # create list
+        xyzSourceList = xyzSource.splitlines()
+
+        # counts line
+        countsLine = xyzSourceList[0]
+        atomNo = int(countsLine.split()[0])
+        # header block
+        headerBlock = xyzSourceList[1:2]
+
+        # atom rows
+        elementRows = [item.split() for item in xyzSourceList[2:2+atomNo]]
+        # check
+        if len(elementRows) != atomNo:
+            raise Exception('xyz file is shorter than its atom number.')
+
+        # name
+        atomList = [item[0] for item in elementRows]
+        # atoms position
+        xyzList = np.array([item[1:4] for item in elementRows],
+                           dtype=np.float64).reshape(-1, 3)
+
+        # res
+        return MolParser.__structure_res(headerBlock, countsLine, atomNo, 0, atomList,
+                                         xyzList, np.zeros((0, 3), dtype=np.int64), [],
+                                         lazy, perceive_bonds)
+
+    @staticmethod
+    def __structure_res(headerBlock, countsLine, atomNo, bondNo, atomList, xyzList,
+                        bondMatrix, propertyLines, lazy=False, perceive_bonds=True):
+        '''
+        Build the parser result (sdf/xyz)
+
+        Parameters
+        ----------
+        headerBlock : list
+            header block
+        countsLine : str
+            counts line
+        atomNo : int
+            atom number
+        bondNo : int
+            bond number
+        atomList : list
+            element list
+        xyzList : np.array
+            (N,3) atom coordinates
+        bondMatrix : np.array
+            (B,3) bond rows [atom1 id, atom2 id, bond type]
+        propertyLines : list
+            lines after 'M  END' (data items)
+        lazy : bool
+            if True, return a LazyDict
+        perceive_bonds : bool
+            if True and there is no bond, bonds are found from coordinates
+
+        Returns
+        -------
+        res : dict
+            parser result
+        '''
+        # atom table
+        atomTable = AtomTable.from_symbols(atomList, xyzList)
+        # set
+        xyzList = atomTable.xyz
+
+        # bond perception (no bond table)
+        if perceive_bonds and bondNo == 0 and atomNo > 1:
+            bondMatrix = BondPerception.perceive(xyzList, atomTable)
+            bondNo = len(bondMatrix)
+
+        # object base
+        objectBaseCoordinate = Structure.CenterPoints(xyzList)
+        # print(f"objectBaseCoordinate: {objectBaseCoordinate}")
+
+        # move to the center [0,0,0]
+        xyzCenterList, movingCoordinate = Structure.CenterObject(
+            xyzList, objectBaseCoordinate)
+        # print(f"xyzCenterList: {xyzCenterList} \n movingCoordinate: \n {movingCoordinate}")
+
+        # res
+        res = {
+            'header_block': headerBlock,
+            'counts_line': countsLine,
+            'atom_numbers': atomNo,
+            'atom_names': atomList,
+            'atom_elements': atomList,
+            'bond_numbers': bondNo,
+            'xyz_list': xyzList,
+            'xyz_center_list': xyzCenterList,
+            'atom_table': atomTable,
+            # bond rows in bond block order (Compound/view3d)
+            'bond_matrix': MolParser.__block_bond_matrix(bondMatrix, atomNo)
+        }
+
+        # *** built on first access (lazy) or now
+        def compound_properties():
+            # other vars
+            compoundPropertiesList = MolParser.__var_finder(propertyLines)
+            # dict vars
+            return MolParser.__var_analyzer(compoundPropertiesList)
+
+        def mat_cid():
+            return res['compound_properties'].get('PUBCHEM_COMPOUND_CID')
+
+        def mat_name():
+            PUBCHEM_IUPAC_NAME = res['compound_properties'].get(
+                'PUBCHEM_IUPAC_NAME')
+            return PUBCHEM_IUPAC_NAME if PUBCHEM_IUPAC_NAME is not None else ''
+
+        def mat_formula():
+            PUBCHEM_MOLECULAR_FORMULA = res['compound_properties'].get(
+                'PUBCHEM_MOLECULAR_FORMULA')
+            # create mat formula
+            return PUBCHEM_MOLECULAR_FORMULA if PUBCHEM_MOLECULAR_FORMULA is not None \
+                else Structure.create_formula(atomList)
+
+        def mat_mass():
+            PUBCHEM_EXACT_MASS = res['compound_properties'].get(
+                'PUBCHEM_EXACT_MASS')
+            PUBCHEM_MOLECULAR_WEIGHT = res['compound_properties'].get(
+                'PUBCHEM_MOLECULAR_WEIGHT')
+            return PUBCHEM_EXACT_MASS if PUBCHEM_EXACT_MASS is not None else PUBCHEM_MOLECULAR_WEIGHT
+
+        def atom_block():
+            return atomTable.atom_block(start=1)
+
+        def bond_block():
+            return MolParser.__sdf_bond_block(atomNo, atomList, bondMatrix)
+
+        resLoaders = {
+            'compound_properties': compound_properties,
+            'mat_cid': mat_cid,
+            'mat_name': mat_name,
+            'mat_formula': mat_formula,
+            'mat_mass': mat_mass,
+            'atom_block': atom_block,
+            'bond_block': bond_block
+        }
+
+        # check
+        if lazy:
+            res = LazyDict(res, resLoaders)
+        else:
+            for key, loader in resLoaders.items():
+                res[key] = loader()
+            # key order
+            res = {key: res[key] for key in ['header_block', 'counts_line', 'atom_numbers',
+                                             'mat_cid', 'mat_name', 'mat_formula', 'mat_mass',
+                                             'atom_names', 'atom_elements', 'bond_numbers',
+                                             'atom_block', 'bond_block', 'xyz_list',
+                                             'xyz_center_list', 'compound_properties',
+                                             'atom_table', 'bond_matrix']}
+
+        # return
+        return res
+
+    @staticmethod
+    def __sdf_v2000_ctab(countsLine, connectionTable):
+        '''
+        Parse V2000 connection table (fixed-width columns)
+
+        Parameters
+        ----------
+        countsLine : str
+            counts line
+        connectionTable : list
+            lines between the counts line and 'M  END'
+
+        Returns
+        -------
+        atomNo : int
+            atom number
+        bondNo : int
+            bond number
+        atomList : list
+            element list
+        xyzList : np.array
+            (N,3) atom coordinates
+        bondMatrix : np.array
+            (B,3) bond rows [atom1 id, atom2 id, bond type]
+
+        hints:
+            atom line: x [0:10], y [10:20], z [20:30], symbol [31:34]
+            bond line: atom1 [0:3], atom2 [3:6], type [6:9]
+            lines not following the column layout are parsed by split()
+        '''
+        try:
+            # counts line (aaabbb...)
+            atomNo = int(countsLine[0:3])
+            bondNo = int(countsLine[3:6])
+            # rows
+            elementRows = connectionTable[0:atomNo]
+            bondRows = connectionTable[atomNo:atomNo+bondNo]
+            # check
+            if len(elementRows) != atomNo or len(bondRows) != bondNo:
+                raise ValueError('connection table is shorter than counts line.')
+
+            # atoms position
+            xyzList = np.array([(item[0:10], item[10:20], item[20:30])
+                                for item in elementRows]).astype(np.float64).reshape(-1, 3)
+            # name
+            atomList = [item[31:34].strip() for item in elementRows]
+            for item in atomList:
+                if not item or not item.isalpha():
+                    raise ValueError('atom symbol column is not valid.')
+
+            # bond matrix [atom1 id, atom2 id, bond type]
+            bondMatrix = np.array([(item[0:3], item[3:6], item[6:9])
+                                   for item in bondRows]).astype(np.int64).reshape(-1, 3)
+
+            return atomNo, bondNo, atomList, xyzList, bondMatrix
+        except ValueError:
+            # free format
+            return MolParser.__sdf_v2000_ctab_split(countsLine, connectionTable)
+
+    @staticmethod
+    def __sdf_v2000_ctab_split(countsLine, connectionTable):
+        '''
+        Parse V2000 connection table (whitespace separated)
+
+        Parameters
+        ----------
+        countsLine : str
+            counts line
+        connectionTable : list
+            lines between the counts line and 'M  END'
+
+        Returns
+        -------
+        res : tuple
+            atomNo, bondNo, atomList, xyzList, bondMatrix
+        '''
+        # check
+        countsLineList = countsLine.split()
 
         # *** check
         _countsLineListSize = len(countsLineList)
@@ -186,22 +735,8 @@ class MolParser():
         # element rows
         elementRows = connectionTable[0:atomNo]
         # bond rows
-        bondRows = connectionTable[atomNo:]
-
-        # other vars
-        compoundPropertiesList = MolParser.__var_finder(sdfSource)
-        # dict vars
-        compoundProperties = MolParser.__var_analyzer(compoundPropertiesList)
-        # extract:
-        PUBCHEM_COMPOUND_CID = compoundProperties.get('PUBCHEM_COMPOUND_CID')
-        PUBCHEM_IUPAC_NAME = compoundProperties.get('PUBCHEM_IUPAC_NAME')
-        PUBCHEM_EXACT_MASS = compoundProperties.get('PUBCHEM_EXACT_MASS')
-        PUBCHEM_MOLECULAR_FORMULA = compoundProperties.get(
-            'PUBCHEM_MOLECULAR_FORMULA')
-        PUBCHEM_MOLECULAR_WEIGHT = compoundProperties.get(
-            'PUBCHEM_MOLECULAR_WEIGHT')
-
-        atoms = []
+        bondRows = connectionTable[atomNo:atomNo+bondNo]
+
         atomList = []
         xyzList = []
 
@@ -209,116 +744,160 @@ class MolParser():
         for i in range(atomNo):
             _atomRow = elementRows[i].split()
             # position
-            _x = float(_atomRow[0])
-            _y = float(_atomRow[1])
-            _z = float(_atomRow[2])
+            xyzList.append(
+                [float(_atomRow[0]), float(_atomRow[1]), float(_atomRow[2])])
             # name
-            _name = _atomRow[3]
-
-            # atom list
-            atomList.append(_name)
-
-            # atom info
-            atom = {
-                'id': i+1,
-                'symbol': _name,
-                'index': i+1,
-                'x': _x,
-                'y': _y,
-                'z': _z,
-                'position': {
-                    'x': _x,
-                    'y': _y,
-                    'z': _z
-                },
-                'xyz': [_x, _y, _z]
-            }
-            # save atom info
-            atoms.append(atom)
-            # xyz
-            xyzList.append([_x, _y, _z])
+            atomList.append(_atomRow[3])
 
-        # set
-        xyzList = np.array(xyzList)
+        # bond matrix [atom1 id, atom2 id, bond type]
+        bondMatrix = np.array([item.split()[0:3] for item in bondRows],
+                              dtype=np.int64).reshape(-1, 3)
 
-        # object base
-        objectBaseCoordinate = Structure.CenterPoints(xyzList)
-        # print(f"objectBaseCoordinate: {objectBaseCoordinate}")
+        return atomNo, bondNo, atomList, np.array(xyzList, dtype=np.float64).reshape(-1, 3), bondMatrix
 
-        # move to the center [0,0,0]
-        xyzCenterList, movingCoordinate = Structure.CenterObject(
-            xyzList, objectBaseCoordinate)
-        # print(f"xyzCenterList: {xyzCenterList} \n movingCoordinate: \n {movingCoordinate}")
+    @staticmethod
+    def __sdf_v3000_ctab(connectionTable):
+        '''
+        Parse V3000 connection table (one pass over 'M  V30' lines)
+
+        Parameters
+        ----------
+        connectionTable : list
+            lines between the counts line and 'M  END'
+
+        Returns
+        -------
+        atomNo : int
+            atom number
+        bondNo : int
+            bond number
+        atomList : list
+            element list
+        xyzList : np.array
+            (N,3) atom coordinates
+        bondMatrix : np.array
+            (B,3) bond rows [atom1 id, atom2 id, bond type], atom ids are
+            positions in the atom block (start from 1)
+
+        hints:
+            atom line: M  V30 index type x y z aamap [props]
+            bond line: M  V30 index type atom1 atom2 [props]
+            a line ending with '-' continues on the next line
+        '''
+        atomRows = []
+        bondRows = []
+        atomNo = None
+        bondNo = None
+        # block state: None, 'ATOM', 'BOND'
+        block = None
+        _line = ''
+
+        for item in connectionTable:
+            # only V30 lines
+            if not item.startswith('M  V30 '):
+                continue
+            # continuation
+            _line += item[7:]
+            if _line.endswith('-'):
+                _line = _line[:-1]
+                continue
+            _tokens = _line.split()
+            _line = ''
+            # check
+            if len(_tokens) == 0:
+                continue
+
+            if _tokens[0] == 'BEGIN':
+                block = _tokens[1] if len(_tokens) > 1 else None
+            elif _tokens[0] == 'END':
+                block = None
+            elif _tokens[0] == 'COUNTS':
+                atomNo = int(_tokens[1])
+                bondNo = int(_tokens[2])
+            elif block == 'ATOM':
+                atomRows.append(_tokens[0:5])
+            elif block == 'BOND':
+                bondRows.append(_tokens[0:4])
 
-        # create mat formula
-        matFormula = Structure.create_formula(atomList)
-        # calculate molecular mass
-        # matMass = 1
+        # check
+        if atomNo is None:
+            raise Exception('V3000 counts line is not found.')
+        if len(atomRows) != atomNo or len(bondRows) != bondNo:
+            raise Exception('V3000 connection table does not match counts line.')
+
+        # atom columns
+        atomRows = np.array(atomRows, dtype=object).reshape(-1, 5)
+        atomIndex = atomRows[:, 0].astype(np.int64)
+        atomList = [str(item).strip('"') for item in atomRows[:, 1]]
+        xyzList = atomRows[:, 2:5].astype(np.float64).reshape(-1, 3)
+
+        # bond columns [index, type, atom1, atom2]
+        bondRows = np.array(bondRows, dtype=object).reshape(-1, 4)
+        bondRows = bondRows[:, 1:4].astype(np.int64)
+
+        # atom index -> position (start from 1)
+        atomPosition = np.zeros(
+            (int(atomIndex.max()) + 1) if atomNo > 0 else 1, dtype=np.int64)
+        atomPosition[atomIndex] = np.arange(1, atomNo+1)
+        # check (index out of range)
+        if np.any(bondRows[:, 1:3] < 1) or np.any(bondRows[:, 1:3] >= len(atomPosition)):
+            raise Exception('V3000 bond refers to an unknown atom.')
+
+        # bond matrix [atom1 id, atom2 id, bond type]
+        bondMatrix = np.column_stack(
+            (atomPosition[bondRows[:, 1]], atomPosition[bondRows[:, 2]], bondRows[:, 0]))
+        # check (index not in the atom block, position 0)
+        if np.any(bondMatrix[:, 0:2] == 0):
+            raise Exception('V3000 bond refers to an unknown atom.')
+
+        return atomNo, bondNo, atomList, xyzList, bondMatrix
+
+    @staticmethod
+    def __sdf_bond_block(atomNo, atomList, bondMatrix):
+        '''
+        Build bond block (sdf)
+
+        Parameters
+        ----------
+        atomNo : int
+            atom number
+        atomList : list
+            element list
+        bondMatrix : np.array
+            bond rows [atom1 id, atom2 id, bond type]
 
+        Returns
+        -------
+        bondList : list
+            bond block
+        '''
         # bond analysis
         bondList = []
-        atomBonds = []
 
         # atomNo: *** atom id in the structure ***
-        for i in range(atomNo):
+        for _nameAtom1Index, _bondRows in MolParser.__group_bond_rows(
+                bondMatrix, atomNo):
             # name
-            _nameAtom1 = str(atomList[i])
-            # index [not duplicated element]
-            # _nameAtom1Index = atomList.index(_nameAtom1)
-            _nameAtom1Index = i+1
-            # check bond type
-            for j in range(bondNo):
-                _bondRow = bondRows[j].split()
-                # starts from 1 to ... (not 0)
-                _nameAtomBondRow = int(_bondRow[0])
-                # check bond exist
-                if _nameAtom1Index == _nameAtomBondRow:
-                    # atom 2 index
-                    _indexAtom = int(_bondRow[1])
-                    # atom 2 name
-                    _nameAtom2 = str(atomList[_indexAtom-1])
-                    # bound type
-                    _bondType = int(_bondRow[2])
-                    # str bond
-                    _bondName = _nameAtom1 + _nameAtom2
-                    # atom bond
-                    atomBonds.append(
-                        (_indexAtom, _nameAtom2, _bondName, _bondType))
-
-            if len(atomBonds) > 0:
-                # save
-                _bondList = {
-                    'id': _nameAtom1Index,
-                    'symbol': _nameAtom1,
-                    'bonds': atomBonds
-                }
-                bondList.append(_bondList)
-
-            # reset
+            _nameAtom1 = str(atomList[_nameAtom1Index-1])
             atomBonds = []
-            _bondList = {}
-
-        # res
-        res = {
-            'header_block': headerBlock,
-            'counts_line': countsLine,
-            'atom_numbers': atomNo,
-            'mat_cid': PUBCHEM_COMPOUND_CID,
-            'mat_name': PUBCHEM_IUPAC_NAME if PUBCHEM_IUPAC_NAME is not None else '',
-            'mat_formula': PUBCHEM_MOLECULAR_FORMULA if PUBCHEM_MOLECULAR_FORMULA is not None else matFormula,
-            'mat_mass': PUBCHEM_EXACT_MASS if PUBCHEM_EXACT_MASS is not None else PUBCHEM_MOLECULAR_WEIGHT,
-            'atom_names': atomList,
-            'atom_elements': atomList,
-            'bond_numbers': bondNo,
-            'atom_block': atoms,
-            'bond_block': bondList,
-            'xyz_list': xyzList,
-            'xyz_center_list': xyzCenterList,
-            'compound_properties': compoundProperties
-        }
+            for _indexAtom, _bondType in _bondRows[:, 1:3].tolist():
+                # atom 2 name
+                _nameAtom2 = str(atomList[_indexAtom-1])
+                # str bond
+                _bondName = _nameAtom1 + _nameAtom2
+                # atom bond
+                atomBonds.append(
+                    (_indexAtom, _nameAtom2, _bondName, _bondType))
+
+            # save
+            _bondList = {
+                'id': _nameAtom1Index,
+                'symbol': _nameAtom1,
+                'bonds': atomBonds
+            }
+            bondList.append(_bondList)
 
-        # return
-        return res
+        return bondList
 
     def json_parser(self, jsonSource, id_sort=True):
         '''
@@ -392,7 +971,7 @@ class MolParser():
 
             # interpret
             __json_atom_position_res = self.__json_atom_position(
-                atomNo, elementList, xyzList)
+                atomNo, elementList, xyzList, _elementAtomicNumber)
 
             # bond block
             __json_atom_bondblock_res = self.__json_atom_bondblock(
@@ -422,10 +1001,15 @@ class MolParser():
                 element_list_sorted, bond_list_sorted = self.SetAtomId(
                     xyzList, elementList, bondMatrix)
 
+            # atomic number sorted
+            element_atomic_number = self.arrange_prop(
+                _elementAtomicNumber, atom_id_conversion[:, 0])
+
             # interpret
             __json_atom_position_res2 = self.__json_atom_position(
-                atomNo, element_list_sorted, xyz_list_sorted)
+                atomNo, element_list_sorted, xyz_list_sorted, element_atomic_number)
             # set
+            atom_table_sorted = __json_atom_position_res2.get('atomTable')
             atom_block_sorted = __json_atom_position_res2.get('atomDetails')
             xyz_list_sorted = __json_atom_position_res2.get('xyzList')
             xyz_center_list_sorted = __json_atom_position_res2.get(
@@ -437,10 +1021,6 @@ class MolParser():
             # set
             bond_block_sorted = __json_atom_bondblock_res2.get('bondBlock')
 
-            # atomic number sorted
-            element_atomic_number = self.arrange_prop(
-                _elementAtomicNumber, atom_id_conversion[:, 0])
-
             # update properties
             # name
             mat_name = propDict.get('IUPAC Name')
@@ -480,7 +1060,10 @@ class MolParser():
                 'xyz_list': xyz_list_sorted,
                 'xyz_center_list': xyz_center_list_sorted,
                 'compound_properties': propDict,
-                'mat_info_origin': origin_info
+                'mat_info_origin': origin_info,
+                'atom_table': atom_table_sorted,
+                'bond_matrix': MolParser.__block_bond_matrix(bond_list_sorted, atomNo),
+                'atom_id_conversion': atom_id_conversion
             }
 
             return res
@@ -582,22 +1165,58 @@ class MolParser():
         data = data[0]
         _coords_type = data['type']  # list
         _coords_aid = data['aid']  # list
-        _coords_conformers = data['conformers'][0]
-        _x = _coords_conformers.get('x')
+        # first conformer
+        xyzList = MolParser.__json_conformer_xyz(data['conformers'][0])
+
+        # 2d/3d structure
+        structureType = "2d" if np.count_nonzero(xyzList[:, 2]) == 0 else '3d'
+
+        return _coords_type, _coords_aid, xyzList, structureType
+
+    @staticmethod
+    def __json_conformer_xyz(conformer):
+        '''
+        Return xyzList of a json conformer (z = 0 for 2d coordinates)
+        '''
+        _x = conformer.get('x')
         # atomNo
         atomNo = len(_x)
-        _y = _coords_conformers.get('y')
+        _y = conformer.get('y')
 
-        _z = _coords_conformers.get('z') if _coords_conformers.get(
+        _z = conformer.get('z') if conformer.get(
             'z') is not None else np.zeros(atomNo)
         # transform
         xyzList = np.array([_x, _y, _z])
         xyzList = np.transpose(xyzList)
 
-        # 2d/3d structure
-        structureType = "2d" if np.count_nonzero(_z) == 0 else '3d'
+        return xyzList
 
-        return _coords_type, _coords_aid, xyzList, structureType
+    @staticmethod
+    def json_conformers(jsonSource):
+        '''
+        Return coordinates of all conformers of a json file
+
+        Parameters
+        ----------
+        jsonSource: dict file
+            json file content
+
+        Returns
+        -------
+        xyzStack : np.array
+            (K,N,3) conformer coordinates (atom order of the json file)
+        '''
+        try:
+            _coords = jsonSource['PC_Compounds'][0]['coords'][0]
+            # conformers
+            xyzStack = [MolParser.__json_conformer_xyz(item)
+                        for item in _coords['conformers']]
+            # check
+            if len(set(len(item) for item in xyzStack)) > 1:
+                raise Exception('conformers do not have the same atom number.')
+            return np.ascontiguousarray(np.array(xyzStack, dtype=np.float64))
+        except Exception as e:
+            raise Exception(e)
 
     def __json_parser_charge(self, data):
         '''
@@ -684,40 +1303,12 @@ class MolParser():
         bondDetails : list
             bond details
         '''
-        # vars
-        # *** detail about atoms
-        atomDetails = []
-
         # element symbols
         atomList = elementList
 
-        # atoms position
-        for i in range(atomNo):
-            _atomRow = xyzList[i, :]
-            # position
-            _x = float(_atomRow[0])
-            _y = float(_atomRow[1])
-            _z = float(_atomRow[2])
-            # name
-            _name = atomList[i]
-
-            # atom info
-            atom = {
-                'id': i,
-                'symbol': _name,
-                'index': i,
-                'x': _x,
-                'y': _y,
-                'z': _z,
-                'position': {
-                    'x': _x,
-                    'y': _y,
-                    'z': _z
-                },
-                'xyz': [_x, _y, _z]
-            }
-            # save atom info
-            atomDetails.append(atom)
+        # *** detail about atoms
+        atomDetails = AtomTable.from_symbols(
+            atomList[0:atomNo], xyzList[0:atomNo]).atom_block(start=0)
 
         # object base
         objectBaseCoordinate = Structure.CenterPoints(xyzList)
@@ -729,53 +1320,12 @@ class MolParser():
         # print(f"xyzCenterList: {xyzCenterList} \n movingCoordinate: \n {movingCoordinate}")
 
         # bond analysis
-        bondBlock = []
-        atomBonds = []
-
-        # atomNo: *** atom id in the structure ***
-        for i in range(atomNo):
-            # name
-            _nameAtom1 = str(atomList[i])
-            # index [not duplicated element]
-            # _nameAtom1Index = atomList.index(_nameAtom1)
-            _nameAtom1Index = i+1
-            # check bond type
-            for j in range(bondNo):
-                _bondRow = bondMatrix[j, :]
-                _nameAtomBondRow = int(_bondRow[0])
-                # check bond exist
-                if _nameAtom1Index == _nameAtomBondRow:
-                    # atom 2 index
-                    _indexAtom2 = int(_bondRow[1])
-                    # atom 2 name
-                    _nameAtom2 = str(atomList[_indexAtom2-1])
-                    # bound type
-                    _bondType = int(_bondRow[2])
-                    # str bond
-                    _bondName = _nameAtom1 + '-' + _nameAtom2
-                    # str id bond
-                    _bondId = str(_nameAtom1Index) + '-' + str(_indexAtom2)
-                    # atom bond
-                    atomBonds.append(
-                        (_indexAtom2, _nameAtom2, _bondName, _bondType, _bondId))
-
-            if len(atomBonds) > 0:
-                # save
-                _bondList = {
-                    'id': _nameAtom1Index,
-                    'symbol': _nameAtom1,
-                    'bonds': atomBonds
-                }
-                bondBlock.append(_bondList)
-
-            # reset
-            atomBonds = []
-            _bondList = {}
+        bondBlock = self.__build_bond_block(atomNo, atomList, bondMatrix)
 
         # result
         return atomDetails, bondBlock, xyzCenterList
 
-    def __json_atom_position(self, atomNo, elementList, xyzList):
+    def __json_atom_position(self, atomNo, elementList, xyzList, atomicNumbers=None):
         '''
         Set mat position into the center of cartesian coordination
 
@@ -787,6 +1337,8 @@ class MolParser():
             element list
         xyzList : np.array
             xyz list
+        atomicNumbers : list
+            atomic number list (default: found by element symbols)
 
         Returns
         -------
@@ -794,40 +1346,16 @@ class MolParser():
             a list of all count
         '''
         try:
-            # vars
-            # *** detail about atoms
-            atomDetails = []
-
-            # element symbols
-            atomList = elementList
+            # atom table
+            if atomicNumbers is None:
+                atomTable = AtomTable.from_symbols(
+                    elementList[0:atomNo], xyzList[0:atomNo])
+            else:
+                atomTable = AtomTable(
+                    xyzList[0:atomNo], atomicNumbers[0:atomNo], symbols=elementList[0:atomNo])
 
-            # atoms position
-            for i in range(atomNo):
-                _atomRow = xyzList[i, :]
-                # position
-                _x = float(_atomRow[0])
-                _y = float(_atomRow[1])
-                _z = float(_atomRow[2])
-                # name
-                _name = atomList[i]
-
-                # atom info
-                atom = {
-                    'id': i,
-                    'symbol': _name,
-                    'index': i,
-                    'x': _x,
-                    'y': _y,
-                    'z': _z,
-                    'position': {
-                        'x': _x,
-                        'y': _y,
-                        'z': _z
-                    },
-                    'xyz': [_x, _y, _z]
-                }
-                # save atom info
-                atomDetails.append(atom)
+            # *** detail about atoms
+            atomDetails = atomTable.atom_block(start=0)
 
             # object base
             objectBaseCoordinate = Structure.CenterPoints(xyzList)
@@ -838,6 +1366,7 @@ class MolParser():
 
             # res
             res = {
+                'atomTable': atomTable,
                 'atomDetails': atomDetails,
                 'elementList': elementList,
                 'xyzList': xyzList,
@@ -875,49 +1404,8 @@ class MolParser():
             atomList = elementList
 
             # bond analysis
-            bondBlock = []
-            atomBonds = []
-
-            # atomNo: *** atom id in the structure ***
-            for i in range(atomNo):
-                # name
-                _nameAtom1 = str(atomList[i])
-                # index [not duplicated element]
-                _nameAtom1Index = int(i+1)
-                # check bond type
-                for j in range(bondNo):
-                    # name
-                    _bondRow = bondMatrix[j, :]
-                    # atom id
-                    _nameAtomBondRow = int(_bondRow[0])
-                    # check bond exist
-                    if _nameAtom1Index == _nameAtomBondRow:
-                        # atom 2 index
-                        _indexAtom2 = int(_bondRow[1])
-                        # atom 2 name
-                        _nameAtom2 = str(atomList[_indexAtom2-1])
-                        # bound type
-                        _bondType = int(_bondRow[2])
-                        # str bond
-                        _bondName = _nameAtom1 + '-' + _nameAtom2
-                        # str id bond
-                        _bondId = str(_nameAtom1Index) + '-' + str(_indexAtom2)
-                        # atom bond
-                        atomBonds.append(
-                            (_indexAtom2, _nameAtom2, _bondName, _bondType, _bondId))
-
-                if len(atomBonds) > 0:
-                    # save
-                    _bondList = {
-                        'id': _nameAtom1Index,
-                        'symbol': _nameAtom1,
-                        'bonds': atomBonds
-                    }
-                    bondBlock.append(_bondList)
-
-                # reset
-                atomBonds = []
-                _bondList = {}
+            bondBlock = self.__build_bond_block(
+                atomNo, atomList, bondMatrix)
 
             # res
             res = {
@@ -948,31 +1436,156 @@ class MolParser():
             atom list
         '''
         el = Element()
-        # loop
-        res = el.find_atom_by_property('AtomicNumber', atomic_numbers)
+        # batch lookup
+        atomList = el.find_atoms(atomic_numbers, ['Symbol'])[
+            'Symbol'].tolist()
 
         # interpret
-        atomList = [item['symbol'] for item in res]
+        res = [{'symbol': atomList[i], 'AtomicNumber': atomic_numbers[i]}
+               for i in range(len(atomList))]
 
         # res
         return res, atomList
 
+    @staticmethod
+    def __group_bond_rows(bondMatrix, atomNo):
+        '''
+        Group bond rows by the first atom id (linear in atoms + bonds)
+
+        Parameters
+        ----------
+        bondMatrix : list | np.array
+            bond rows [atom1 id, atom2 id, bond type], ids start from 1
+        atomNo : int
+            atom number
+
+        Returns
+        -------
+        res : list
+            (atom1 id, bond rows) sorted by atom1 id, bond rows keep
+            their original order
+        '''
+        # int matrix
+        bondMatrix = np.array(bondMatrix, dtype=np.int64).reshape(-1, 3)
+
+        # stable sort by atom1 id
+        bondOrder = np.argsort(bondMatrix[:, 0], kind='stable')
+        bondMatrixSorted = bondMatrix[bondOrder]
+
+        # group boundaries
+        atomIds, groupStart = np.unique(
+            bondMatrixSorted[:, 0], return_index=True)
+        bondGroups = np.split(bondMatrixSorted, groupStart[1:])
+
+        # res (only atom ids in the structure)
+        res = [(int(atomIds[i]), bondGroups[i]) for i in range(len(atomIds))
+               if 1 <= atomIds[i] <= atomNo]
+        return res
+
+    @staticmethod
+    def __block_bond_matrix(bondMatrix, atomNo):
+        '''
+        Bond rows in bond block order (grouped by atom1 id)
+
+        Parameters
+        ----------
+        bondMatrix : list | np.array
+            bond rows [atom1 id, atom2 id, bond type], ids start from 1
+        atomNo : int
+            atom number
+
+        Returns
+        -------
+        res : np.array
+            (B,3) bond rows, same order as the bonds of the bond block
+        '''
+        bondGroups = MolParser.__group_bond_rows(bondMatrix, atomNo)
+        # check
+        if len(bondGroups) == 0:
+            return np.zeros((0, 3), dtype=np.int64)
+        return np.concatenate([item[1] for item in bondGroups])
+
+    def __build_bond_block(self, atomNo, elementList, bondMatrix):
+        '''
+        Build bond block (json format) from a bond matrix
+
+        Parameters
+        ----------
+        atomNo : int
+            atom number
+        elementList : list
+            element list
+        bondMatrix : np.array
+            bond matrix [atom1 id, atom2 id, bond type]
+
+        Returns
+        -------
+        bondBlock : list
+            bond block used by mat view
+        '''
+        # element symbols
+        atomList = elementList
+
+        # bond analysis
+        bondBlock = []
+
+        # atomNo: *** atom id in the structure ***
+        for _nameAtom1Index, _bondRows in MolParser.__group_bond_rows(
+                bondMatrix, atomNo):
+            # name
+            _nameAtom1 = str(atomList[_nameAtom1Index-1])
+            atomBonds = []
+            for _indexAtom2, _bondType in _bondRows[:, 1:3].tolist():
+                # atom 2 name
+                _nameAtom2 = str(atomList[_indexAtom2-1])
+                # str bond
+                _bondName = _nameAtom1 + '-' + _nameAtom2
+                # str id bond
+                _bondId = str(_nameAtom1Index) + '-' + str(_indexAtom2)
+                # atom bond
+                atomBonds.append(
+                    (_indexAtom2, _nameAtom2, _bondName, _bondType, _bondId))
+
+            # save
+            bondBlock.append({
+                'id': _nameAtom1Index,
+                'symbol': _nameAtom1,
+                'bonds': atomBonds
+            })
+
+        # res
+        return bondBlock
+
     def __var_finder(data):
         '''
-        Find variables in a sdf file (single)
+        Find variables (data items) in a sdf file (single), one pass over
+        the lines after `M  END`
 
         Parameters
         ----------
-        data : str
-            sdf data
+        data : list
+            sdf lines after `M  END`
 
         Returns
         -------
-        res : dict
-            a list of all count
+        res : list
+            (variable name, variable value lines)
         '''
-        res = re.findall(
-            r"(\>\s*\<(.*)\s*\>\s*((.*\n)([^\<\>\$\$\$\$])*))", data, re.M)
+        res = []
+        # current data item value
+        varVal = None
+        for line in data:
+            # data header
+            varHeader = SDF_DATA_HEADER.match(line)
+            if varHeader:
+                varVal = []
+                res.append((varHeader.group(1), varVal))
+            elif line.strip() == '$$$$':
+                # end of record
+                break
+            elif varVal is not None:
+                varVal.append(line)
+
         return res
 
     def __var_analyzer(data):
@@ -981,8 +1594,8 @@ class MolParser():
 
         Parameters
         ----------
-        data : str
-            sdf data
+        data : list
+            (variable name, variable value lines)
 
         Returns
         -------
@@ -993,10 +1606,9 @@ class MolParser():
         dataSize = len(data)
         for i in range(dataSize):
             # name
-            varName = data[i][1]
+            varName = data[i][0]
             # val
-            varVal = (data[i][2]).split('\n')
-            varVal = [item.strip() for item in varVal]
+            varVal = [item.strip() for item in data[i][1]]
             varVal = list(filter(None, varVal))
 
             # check
@@ -1040,84 +1652,49 @@ class MolParser():
         try:
             # robs position
             robs = OBS_POSITIONS
-            # res
-            disRes = []
-            # calculate distance
-            for i in range(len(xyzList)):
-                _dis = np.linalg.norm(
-                    np.array(robs) - np.array(xyzList[i]))
-                _idOld = int(i+1)
-                _symbol = elementList[i]
-                disRes.append([_idOld, _dis, _symbol])
-
-            # sort
-            sortRes = sorted(disRes, key=lambda l: l[1], reverse=True)
-
-            # reverse [old id, distance, symbol]
-            sortRes.reverse()
-
-            # save new id [old id, new id, distance, symbol]
-            for j in range(len(sortRes)):
-                _idNew = int(j+1)
-                sortRes[j].insert(1, _idNew)
+            # xyz
+            xyzList = np.array(xyzList)
+            # atom no
+            atomNo = len(xyzList)
+
+            # calculate distance (all atoms)
+            # row-wise dot keeps the rounding of np.linalg.norm per atom
+            disVector = np.array(robs) - xyzList.reshape(atomNo, -1)
+            disList = np.sqrt(np.matmul(
+                disVector[:, None, :], disVector[:, :, None]).reshape(atomNo))
+
+            # sort by distance (ascending), equal distances in reversed
+            # order of old ids
+            sortIndex = np.argsort(-disList, kind='stable')[::-1]
 
             # sorted id (old id, new id)
-            idConversion = []
-            for j in range(len(sortRes)):
-                idConversion.append([sortRes[j][0], sortRes[j][1]])
+            idOld = sortIndex + 1
+            idNew = np.arange(1, atomNo+1)
+            idConversion = np.column_stack((idOld, idNew))
 
             # build xyzList and elementlist with respect to the new ids
-            xyzListSorted = []
-            elementListSorted = []
+            xyzListSorted = xyzList[sortIndex]
+            elementListSorted = [elementList[j] for j in sortIndex]
             matPosition = {}
-            for j in range(len(sortRes)):
-                _idOld = sortRes[j][0]
-                _idNew = sortRes[j][1]
-                _dis = sortRes[j][2]
-                _val1 = xyzList[_idOld-1]
-                _val2 = elementList[_idOld-1]
-                # set
-                xyzListSorted.append(_val1)
-                elementListSorted.append(_val2)
+            for j in range(atomNo):
+                _idOld = int(idOld[j])
+                _idNew = int(idNew[j])
                 # all
-                matPosition[str(_idNew)] = [_idOld, _idNew, _dis, _val1, _val2]
-
-            # set
-            xyzListSorted = np.array(xyzListSorted)
+                matPosition[str(_idNew)] = [
+                    _idOld, _idNew, disList[sortIndex[j]], xyzListSorted[j],
+                    elementListSorted[j]]
 
             # bond id conversion
             bondList = np.array(bondList, dtype='i')
-            # size
-            bondRow = bondList.shape[0]
-            # column 0
-            bondColumn0 = np.array(bondList[:, 0])
-            # column 1
-            bondColumn1 = np.array(bondList[:, 1])
-            # column 2
-            bondColumn2 = np.array(bondList[:, 2])
-
-            # replace
-            for i in range(bondRow):
-                # column 0
-                _v0 = bondColumn0[i]
-                # find new value
-                _v1 = [item[1] for item in idConversion if item[0] == _v0][0]
-                bondColumn0[i] = _v1
-
-                # column 1
-                _v2 = bondColumn1[i]
-                # find new value
-                _v3 = [item[1] for item in idConversion if item[0] == _v2][0]
-                bondColumn1[i] = _v3
+
+            # new id lookup (index: old id)
+            idLookup = np.zeros(atomNo+1, dtype='i')
+            idLookup[idOld] = idNew
 
             # build bond list with new ids
             bondListSorted = np.zeros_like(bondList)
-            bondListSorted[:, 0] = bondColumn0
-            bondListSorted[:, 1] = bondColumn1
-            bondListSorted[:, 2] = bondColumn2
-
-            # set
-            idConversion = np.array(idConversion)
+            bondListSorted[:, 0:2] = idLookup[bondList[:, 0:2]]
+            bondListSorted[:, 2] = bondList[:, 2]
 
             return matPosition, idConversion, xyzListSorted, elementListSorted, bondListSorted
 
@@ -1149,3 +1726,36 @@ class MolParser():
             return property_value_list_sorted
         except Exception as e:
             Exception(e)
+
+
+# UTILITY FUNCTION
+# ------------------
+
+
+def ParseFiles(filePaths):
+    '''
+    Parse a list of files (process pool worker), errors are returned
+    per file
+
+    Parameters
+    ----------
+    filePaths : list
+        list of file paths
+
+    Returns
+    -------
+    res : list
+        file_path: file path
+        res: read_file result (None if failed)
+        error: error message (None if parsed)
+    '''
+    res = []
+    for filePath in filePaths:
+        try:
+            # parse
+            _res = MolParser(filePath).read_file()
+            res.append({'file_path': filePath, 'res': _res, 'error': None})
+        except Exception as e:
+            res.append({'file_path': filePath, 'res': None, 'error': str(e)})
+
+    return res
@@ -2,20 +2,24 @@
 # -------
 
 # import packages/modules
-import pandas as pd
 import networkx as nx
 from networkx.algorithms import isomorphism
 # local
 from .chemgraphs import ChemGraphs
+from .atomtable import AtomTable
 
 
 class Network(ChemGraphs):
 
-    def __init__(self, atomElements, atomBonds, xyzList, xyzCenterList, atomBonds1d):
-        self.atomElements = atomElements
+    def __init__(self, atomElements, atomBonds, xyzList, xyzCenterList, atomBonds1d, atomTable=None):
+        # atom table (columnar)
+        if atomTable is None:
+            atomTable = AtomTable.from_symbols(atomElements, xyzList)
+        self.atomTable = atomTable
+        self.atomElements = atomTable.symbols
         # bond block (info)
         self.atomBonds = atomBonds
-        self.xyzList = xyzList
+        self.xyzList = atomTable.xyz
         self.xyzCenterList = xyzCenterList
 
         # 1d vector of atom bonds
@@ -166,30 +170,14 @@ class Network(ChemGraphs):
         res : dict
             a list of all count
         '''
-        # atom no
-        atomNo = len(self.xyzList)
         # bond no
         bondNo = len(self.atomBonds1d)
 
         # Create a graph from atoms and bonds
         G = nx.Graph()
 
-        # *** atom visualization
-        for i in range(atomNo):
-            # xyz
-            _atom1X = self.xyzList[i, 0]
-            _atom1Y = self.xyzList[i, 1]
-            _atom1Z = self.xyzList[i, 2]
-            _atom1XYZ = [_atom1X, _atom1Y, _atom1Z]
-
-            # color
-            # atom id
-            _atomId = int(i+1)
-            # symbol
-            _atomSymbol = str(self.atomElements[i]).strip()
-            # atom mark
-            atomMark = str(_atomSymbol) + str(_atomId)
-
+        # *** atoms (atom table columns)
+        for _atomId, _atomSymbol in zip(self.atomTable.ids.tolist(), self.atomTable.symbols):
             # add node with cooridination
             # G.add_node(_atomId, symbol=_atomSymbol,
             #            x=_atom1X, y=_atom1Y, z=_atom1Z, xyz=_atom1XYZ)
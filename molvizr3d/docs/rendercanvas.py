@@ -0,0 +1,111 @@
+# RENDER CANVAS
+# ---------------
+
+# import libs
+import io
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+class RenderCanvas():
+    '''
+    Offscreen figure/axes (Agg) reused across compounds
+
+    hint:
+        the figure is not registered in pyplot, no display is needed and
+        nothing is kept after close()
+        clear() removes the previous compound and keeps the axes, the
+        figure, canvas and axes are created once, so a canvas can render
+        many compounds
+        use as a context manager to close it deterministically
+    '''
+
+    def __init__(self, pixel_width=800, pixel_height=600, dpi=100, bg_color='#090A0B'):
+        # background
+        self.bg_color = f'{bg_color}'
+        # figure size
+        fig_size_inches = (pixel_width / dpi, pixel_height / dpi)
+        self.figure = Figure(figsize=fig_size_inches, dpi=dpi,
+                             facecolor=f'{bg_color}')
+        # agg canvas
+        FigureCanvasAgg(self.figure)
+
+        # Adjust the layout to fill the entire figure
+        self.figure.subplots_adjust(left=0, right=1, top=1, bottom=0)
+
+        # projection
+        self.ax = self.figure.add_subplot(projection='3d')
+        self.__setup_axes()
+
+    def __setup_axes(self):
+        '''
+        Axes setup (same as view3d)
+        '''
+        # axis display
+        self.ax.set_axis_off()
+        # color
+        self.ax.set_facecolor(self.bg_color)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def clear(self):
+        '''
+        Remove the drawn compound
+        '''
+        # check
+        if self.figure is None:
+            raise Exception('canvas is closed.')
+
+        for item in list(self.ax.collections):
+            item.remove()
+        for item in list(self.ax.lines):
+            item.remove()
+        # legend
+        _legend = self.ax.get_legend()
+        if _legend is not None:
+            _legend.remove()
+        # limits from the next compound (set_xlim turns autoscale off),
+        # a reused canvas draws the same image as a new one
+        self.ax.set_autoscale_on(True)
+
+    def save(self, file=None, format=None):
+        '''
+        Save the figure
+
+        Parameters
+        ----------
+        file : str | file-like
+            image path or buffer (default None: return bytes)
+        format : str
+            png, svg, ... (default: file extension, png for bytes)
+
+        Returns
+        -------
+        res : bytes | None
+            image content if file is None
+        '''
+        # check
+        if self.figure is None:
+            raise Exception('canvas is closed.')
+
+        if file is None:
+            buffer = io.BytesIO()
+            self.figure.savefig(buffer, format=format if format else 'png',
+                                facecolor=self.figure.get_facecolor())
+            return buffer.getvalue()
+
+        self.figure.savefig(file, format=format,
+                            facecolor=self.figure.get_facecolor())
+
+    def close(self):
+        '''
+        Release the figure
+        '''
+        if self.figure is not None:
+            self.figure.clear()
+            self.figure = None
+            self.ax = None
@@ -0,0 +1,311 @@
+# SPATIAL INDEX
+# ---------------
+
+# import libs
+import numpy as np
+
+
+class SpatialIndex():
+    '''
+    Spatial index of atom coordinates (neighbor queries)
+
+    hint:
+        method: 'cell' uniform grid (cell list), 'kdtree' scipy cKDTree
+            (scipy is optional, only required for this method)
+        cell_size: grid spacing [same unit as xyz], default 2.0 (bond scale)
+        queries only visit cells around each point, so the cost is ~O(N)
+        for molecules with bounded atom density
+    '''
+
+    def __init__(self, xyzList, cell_size=2.0, method='cell'):
+        # xyz
+        self._xyz = np.ascontiguousarray(
+            np.asarray(xyzList, dtype=np.float64).reshape(-1, 3))
+        self._method = method
+        self._cell_size = float(cell_size)
+
+        # check
+        if self._cell_size <= 0:
+            raise Exception('cell size must be positive.')
+
+        if method == 'cell':
+            self.__build_cells()
+        elif method == 'kdtree':
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                raise Exception(
+                    'kdtree method requires scipy, use method="cell" or install scipy.')
+            self._tree = cKDTree(self._xyz)
+        else:
+            raise Exception('method must be cell or kdtree.')
+
+    def __len__(self):
+        return len(self._xyz)
+
+    @property
+    def xyz(self):
+        return self._xyz
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def __build_cells(self):
+        '''
+        Build the cell list (atoms sorted by cell key)
+        '''
+        atomNo = len(self._xyz)
+        # grid origin
+        self._origin = self._xyz.min(axis=0) if atomNo > 0 else np.zeros(3)
+        # cell of each atom
+        self._cells = self.__cell_coords(self._xyz)
+        # grid size
+        self._dims = (self._cells.max(axis=0) + 1) if atomNo > 0 \
+            else np.ones(3, dtype=np.int64)
+        # sort atoms by cell key
+        keys = self.__cell_keys(self._cells)
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+
+    def __cell_coords(self, points):
+        '''
+        Grid coordinates of points
+        '''
+        return np.floor((points - self._origin) / self._cell_size).astype(np.int64)
+
+    def __cell_keys(self, cells):
+        '''
+        Linear cell keys (cells inside the grid)
+        '''
+        return (cells[..., 0]*self._dims[1] + cells[..., 1])*self._dims[2] + cells[..., 2]
+
+    @staticmethod
+    def __offsets(reach, half=False):
+        '''
+        Cell offsets of a (2*reach+1)^3 cube
+
+        Parameters
+        ----------
+        reach : int
+            cells on each side
+        half : bool
+            if True, only offsets after (0,0,0) in lexicographic order
+            (each pair of cells is visited once)
+        '''
+        _range = np.arange(-reach, reach+1)
+        offsets = np.stack(np.meshgrid(
+            _range, _range, _range, indexing='ij'), axis=-1).reshape(-1, 3)
+        if half:
+            # lexicographic order > (0,0,0)
+            _key = (offsets[:, 0]*(2*reach+1) + offsets[:, 1]) * \
+                (2*reach+1) + offsets[:, 2]
+            offsets = offsets[_key > 0]
+        return offsets
+
+    def __gather(self, cells, offsets):
+        '''
+        Candidate atoms in the neighbor cells of each query cell
+
+        Parameters
+        ----------
+        cells : np.array
+            (Q,3) query cells
+        offsets : np.array
+            (O,3) cell offsets
+
+        Returns
+        -------
+        queryIndex : np.array
+            query index of each candidate
+        atomIndex : np.array
+            atom index of each candidate
+        '''
+        # neighbor cells (Q,O,3)
+        neighborCells = cells[:, None, :] + offsets[None, :, :]
+        # cells inside the grid
+        valid = np.all((neighborCells >= 0) & (
+            neighborCells < self._dims), axis=2)
+        queryIndex, offsetIndex = np.nonzero(valid)
+        keys = self.__cell_keys(neighborCells[queryIndex, offsetIndex])
+        # atoms of each cell [start, end)
+        start = np.searchsorted(self._sorted_keys, keys, side='left')
+        end = np.searchsorted(self._sorted_keys, keys, side='right')
+        counts = end - start
+        # expand (one row per candidate)
+        total = int(counts.sum())
+        groupStart = np.cumsum(counts) - counts
+        position = np.repeat(start - groupStart, counts) + \
+            np.arange(total, dtype=np.int64)
+        return np.repeat(queryIndex, counts), self._order[position]
+
+    def __reach(self, radius):
+        '''
+        Cells on each side to cover a radius
+        '''
+        return max(1, int(np.ceil(radius / self._cell_size)))
+
+    def __candidates(self, points, radius):
+        '''
+        Candidate (query, atom) pairs within the cube around each point
+        '''
+        reach = self.__reach(radius)
+        # large radius (more cells than atoms): all atoms
+        if (2*reach+1)**3 > max(len(self._xyz), 1):
+            queryIndex = np.repeat(np.arange(len(points)), len(self._xyz))
+            atomIndex = np.tile(np.arange(len(self._xyz)), len(points))
+            return queryIndex, atomIndex
+        return self.__gather(self.__cell_coords(points), SpatialIndex.__offsets(reach))
+
+    def query_radius(self, points, radius):
+        '''
+        Find atoms within a radius of points
+
+        Parameters
+        ----------
+        points : list | np.array
+            a point [x,y,z] or (Q,3) points
+        radius : float
+            search radius
+
+        Returns
+        -------
+        res : np.array | list
+            atom indices (sorted) for a point, a list of arrays for points
+        '''
+        points = np.asarray(points, dtype=np.float64)
+        single = points.ndim == 1
+        points = points.reshape(-1, 3)
+
+        if self._method == 'kdtree':
+            res = [np.array(sorted(item), dtype=np.int64)
+                   for item in self._tree.query_ball_point(points, radius)]
+        else:
+            # candidates
+            queryIndex, atomIndex = self.__candidates(points, radius)
+            # distance
+            _diff = points[queryIndex] - self._xyz[atomIndex]
+            inside = np.einsum('ij,ij->i', _diff, _diff) <= radius*radius
+            queryIndex = queryIndex[inside]
+            atomIndex = atomIndex[inside]
+            # group by query (atom indices sorted)
+            order = np.lexsort((atomIndex, queryIndex))
+            queryIndex = queryIndex[order]
+            atomIndex = atomIndex[order]
+            bounds = np.searchsorted(queryIndex, np.arange(len(points)+1))
+            res = [atomIndex[bounds[i]:bounds[i+1]]
+                   for i in range(len(points))]
+
+        return res[0] if single else res
+
+    def query_knn(self, points, k=1):
+        '''
+        Find the k nearest atoms of points
+
+        Parameters
+        ----------
+        points : list | np.array
+            a point [x,y,z] or (Q,3) points
+        k : int
+            number of neighbors (at most the atom number)
+
+        Returns
+        -------
+        distances : np.array
+            (Q,k) distances, (k,) for a point
+        indices : np.array
+            (Q,k) atom indices sorted by distance, (k,) for a point
+        '''
+        points = np.asarray(points, dtype=np.float64)
+        single = points.ndim == 1
+        points = points.reshape(-1, 3)
+        atomNo = len(self._xyz)
+        # check
+        k = int(min(k, atomNo))
+        if k <= 0:
+            raise Exception('k must be positive and the index not empty.')
+
+        distances = np.zeros((len(points), k))
+        indices = np.zeros((len(points), k), dtype=np.int64)
+
+        if self._method == 'kdtree':
+            _distances, _indices = self._tree.query(points, k=k)
+            distances[:] = np.asarray(_distances).reshape(len(points), k)
+            indices[:] = np.asarray(_indices).reshape(len(points), k)
+        else:
+            for i, point in enumerate(points):
+                # grow the searched cube until k atoms are inside the covered sphere
+                reach = 1
+                while True:
+                    queryIndex, atomIndex = self.__candidates(
+                        point[None, :], reach*self._cell_size)
+                    _diff = self._xyz[atomIndex] - point
+                    _distance = np.sqrt(np.einsum('ij,ij->i', _diff, _diff))
+                    # covered radius (all atoms closer than this are candidates)
+                    _covered = reach*self._cell_size
+                    if len(atomIndex) == atomNo or np.count_nonzero(_distance <= _covered) >= k:
+                        break
+                    reach += 1
+                # nearest (ties by atom index)
+                order = np.lexsort((atomIndex, _distance))[0:k]
+                distances[i] = _distance[order]
+                indices[i] = atomIndex[order]
+
+        if single:
+            return distances[0], indices[0]
+        return distances, indices
+
+    def pairs_within(self, cutoff):
+        '''
+        Find all atom pairs closer than a cutoff
+
+        Parameters
+        ----------
+        cutoff : float
+            distance cutoff
+
+        Returns
+        -------
+        pairs : np.array
+            (P,2) atom indices, i < j, sorted
+        distances : np.array
+            (P,) pair distances
+        '''
+        atomNo = len(self._xyz)
+
+        if self._method == 'kdtree':
+            pairs = self._tree.query_pairs(
+                cutoff, output_type='ndarray').astype(np.int64).reshape(-1, 2)
+        else:
+            reach = self.__reach(cutoff)
+            if (2*reach+1)**3 > max(atomNo, 1):
+                # large cutoff (more cells than atoms): all pairs
+                pairs = np.column_stack(np.triu_indices(atomNo, 1))
+            else:
+                # same cell (i < j)
+                queryIndex, atomIndex = self.__gather(
+                    self._cells, np.zeros((1, 3), dtype=np.int64))
+                _keep = queryIndex < atomIndex
+                pairs1 = np.column_stack((queryIndex[_keep], atomIndex[_keep]))
+                # neighbor cells (each pair of cells once)
+                queryIndex, atomIndex = self.__gather(
+                    self._cells, SpatialIndex.__offsets(reach, half=True))
+                pairs2 = np.column_stack((queryIndex, atomIndex))
+                pairs = np.concatenate((pairs1, pairs2)).reshape(-1, 2)
+            # distance
+            _diff = self._xyz[pairs[:, 0]] - self._xyz[pairs[:, 1]]
+            pairs = pairs[np.einsum('ij,ij->i', _diff, _diff)
+                          <= cutoff*cutoff]
+            # i < j
+            pairs = np.sort(pairs, axis=1)
+
+        # sort
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))] if atomNo > 0 else pairs
+        _diff = self._xyz[pairs[:, 0]] - self._xyz[pairs[:, 1]]
+        distances = np.sqrt(np.einsum('ij,ij->i', _diff, _diff))
+
+        return pairs, distances
@@ -18,45 +18,22 @@ class Structure():
     def CenterPoints(xyzList):
         '''
         find the center coordination of an object
+
+        hints:
+            xyzList: (N,3) atom coordinates or a (K,N,3) conformer stack,
+                returns [x,y,z] or (K,3) centers
+            an axis with |max| == |min| is already centered (0)
         '''
         # set
         xyzList = np.array(xyzList)
-        # find the highest xyz
-        # x
-        xMax = np.max(xyzList[:, 0])
-        xMin = np.min(xyzList[:, 0])
-        if np.abs(xMax) != np.abs(xMin):
-            xLen = np.abs(xMax - xMin)
-            xCenter = xMin + (xLen/2)
-        else:
-            xLen = 0
-            xCenter = 0 + (xLen/2)
-        # print(f"X value: {xMin}, {xMax}")
-
-        # y
-        yMax = np.max(xyzList[:, 1])
-        yMin = np.min(xyzList[:, 1])
-        if np.abs(yMax) != np.abs(yMin):
-            yLen = np.abs(yMax - yMin)
-            yCenter = yMin + (yLen/2)
-        else:
-            yLen = 0
-            yCenter = 0 + (yLen/2)
-        # print(f"Y value: {yMin}, {yMax}")
-
-        # z
-        zMax = np.max(xyzList[:, 2])
-        zMin = np.min(xyzList[:, 2])
-        if np.abs(zMax) != np.abs(zMin):
-            zLen = np.abs(zMax - zMin)
-            zCenter = zMin + (zLen/2)
-        else:
-            zLen = 0
-            zCenter = 0 + (zLen/2)
-        # print(f"Z value: {zMin}, {zMax}")
+        # find the highest/lowest xyz (each axis)
+        xyzMax = np.max(xyzList, axis=-2)
+        xyzMin = np.min(xyzList, axis=-2)
+        xyzLen = np.abs(xyzMax - xyzMin)
 
         # object base
-        objectBaseCoordinate = np.array([xCenter, yCenter, zCenter])
+        objectBaseCoordinate = np.where(
+            np.abs(xyzMax) != np.abs(xyzMin), xyzMin + (xyzLen/2), 0.0)
 
         return objectBaseCoordinate
 
@@ -64,10 +41,17 @@ class Structure():
     def CenterObject(xyzList, centerPoint):
         '''
         move an object to the center of the origin [0,0,0]
+
+        hints:
+            xyzList: (N,3) or (K,N,3), centerPoint: [x,y,z] or (K,3)
         '''
         originPoint = np.array([0, 0, 0])
-        movingCoordinate = originPoint - centerPoint
-        newCenterPoints = np.array(xyzList) + movingCoordinate
+        movingCoordinate = originPoint - np.array(centerPoint)
+        xyzList = np.array(xyzList)
+        # conformer stack (one center per conformer)
+        _moving = movingCoordinate[..., None, :] if xyzList.ndim == 3 and \
+            movingCoordinate.ndim == 2 else movingCoordinate
+        newCenterPoints = xyzList + _moving
 
         return newCenterPoints, movingCoordinate
 
@@ -195,10 +179,13 @@ class Structure():
             if len(atom_elements) == 0:
                 raise Exception('atom elements list is empty')
 
-            my_dict = {i: atom_elements.count(i) for i in atom_elements}
+            # element counts (order of first appearance)
+            elements, firstIndex, elementCounts = np.unique(
+                np.asarray(atom_elements), return_index=True, return_counts=True)
+            elementOrder = np.argsort(firstIndex)
             # mat name
             elList = ''
-            for key, value in my_dict.items():
+            for key, value in zip(elements[elementOrder].tolist(), elementCounts[elementOrder].tolist()):
                 if value == 1:
                     _el = str(key)
                 else:
@@ -0,0 +1,524 @@
+# THUMBNAILS
+# ------------
+
+# import libs
+import os
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+# internals
+from .utility import Utility
+from .molparser import MolParser
+from .compound import Compound
+from .rendercanvas import RenderCanvas
+
+# warm canvas of a worker process (RenderJobs)
+_worker_canvas = None
+_worker_canvas_settings = None
+
+
+class Thumbnails():
+    '''
+    Render images of a molecule library (directory or multi-record sdf)
+    over a process pool
+
+    hint:
+        each worker keeps one offscreen canvas (RenderCanvas) for all of its
+        molecules
+        json files of a directory are queued only if they are PubChem
+            records (PC_Compounds)
+        images: {name}_{view}.{format}, name: file name without extension
+            ({file}_{extension} if two files share a name),
+            {file}_{record index} for records of a multi-record sdf
+        molecules whose images exist are skipped (restart), they are only
+            parsed if the previous manifest has no row of them, images are
+            written to a temporary file and renamed when complete
+        render settings of a run are saved in {manifest}_settings.json, if
+            they changed, existing images are rendered again
+        manifest: Utility.CreateCVS (json_csv_columns, image_name_1..3)
+        timing: {manifest}_timing.csv (parse/render time of each molecule)
+    '''
+
+    # views of image_name_1..3
+    _max_views = 3
+    # timing report columns
+    timing_columns = ['file_name', 'status',
+                      'parse_time', 'render_time', 'total_time', 'error']
+    # settings which change the images (restart check)
+    image_settings = ['views', 'image_format', 'pixel_width', 'pixel_height',
+                      'dpi', 'bg_color', 'display_legend']
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def build_jobs(source):
+        '''
+        List molecules of a library
+
+        Parameters
+        ----------
+        source : str | list
+            directory (sdf/json/xyz files, PubChem json only), a sdf file
+            (one job per record) or a list of file paths
+
+        Returns
+        -------
+        jobs : list
+            name: molecule name (image prefix, unique)
+            file_path: file path
+            record_offset, record_size: record position in a sdf file
+                (None for a whole file)
+        '''
+        # file list
+        if isinstance(source, str) and os.path.isdir(source):
+            filePaths = [os.path.join(source, item)
+                         for item in sorted(os.listdir(source))
+                         if os.path.splitext(item)[1].lower() in ('.sdf', '.json', '.xyz')]
+            # json files (PubChem records only)
+            filePaths = [item for item in filePaths
+                         if not item.lower().endswith('.json') or Thumbnails.is_pubchem_json(item)]
+        elif isinstance(source, str) and os.path.isfile(source):
+            filePaths = [source]
+        elif isinstance(source, str):
+            raise Exception("target path is not valid.")
+        else:
+            filePaths = list(source)
+
+        jobs = []
+        # sdf records (multi-record file)
+        if len(filePaths) == 1 and filePaths[0].lower().endswith('.sdf'):
+            filePath = filePaths[0]
+            sdfIndex = MolParser(filePath).sdf_index()
+            # check
+            if len(sdfIndex['offset']) > 1:
+                fileName = os.path.splitext(os.path.basename(filePath))[0]
+                for i in range(len(sdfIndex['offset'])):
+                    jobs.append({
+                        'name': f"{fileName}_{i}",
+                        'file_path': filePath,
+                        'record_offset': int(sdfIndex['offset'][i]),
+                        'record_size': int(sdfIndex['size'][i])
+                    })
+                return jobs
+
+        # file names (shared names: name_extension)
+        fileNames = [os.path.splitext(os.path.basename(item))
+                     for item in filePaths]
+        _nameCounts = {}
+        for fileName, _ in fileNames:
+            _nameCounts[fileName] = _nameCounts.get(fileName, 0) + 1
+
+        # files
+        usedNames = set()
+        for filePath, (fileName, fileExt) in zip(filePaths, fileNames):
+            name = fileName if _nameCounts[fileName] == 1 \
+                else f"{fileName}_{fileExt.lstrip('.').lower()}"
+            # same path listed twice
+            _name, i = name, 1
+            while _name in usedNames:
+                i += 1
+                _name = f"{name}_{i}"
+            usedNames.add(_name)
+            jobs.append({
+                'name': _name,
+                'file_path': filePath,
+                'record_offset': None,
+                'record_size': None
+            })
+        return jobs
+
+    @staticmethod
+    def is_pubchem_json(file_path, head_size=1024):
+        '''
+        Check a json file is a PubChem record (top-level PC_Compounds key)
+
+        Parameters
+        ----------
+        file_path : str
+            json file path
+        head_size : int
+            number of characters read from the start of the file
+
+        Returns
+        -------
+        res : bool
+            True if the file starts with the PC_Compounds key
+        '''
+        try:
+            with open(file_path, 'r') as f:
+                head = f.read(head_size).lstrip()
+        except (OSError, UnicodeDecodeError):
+            return False
+        # {"PC_Compounds": [...]}
+        return head.startswith('{') and head[1:].lstrip().startswith('"PC_Compounds"')
+
+    @staticmethod
+    def image_names(name, views, image_format):
+        '''
+        Image file names of a molecule
+        '''
+        return [f"{name}_{i+1}.{image_format}" for i in range(len(views))]
+
+    @staticmethod
+    def render_library(source, output_dir, views=[(None, None)], image_format='png',
+                       pixel_width=300, pixel_height=300, dpi=100, bg_color='#090A0B',
+                       display_legend=False, workers=None, chunk_size=None,
+                       overwrite=False, manifest_name='manifest'):
+        '''
+        Render images of all molecules of a library
+
+        Parameters
+        ----------
+        source : str | list
+            directory (sdf/json/xyz files, PubChem json only), a
+            multi-record sdf file or a list of file paths
+        output_dir : str
+            image/manifest directory
+        views : list
+            view angles [(elev, azim)], at most 3 (image_name_1..3)
+        image_format : str
+            png, svg, ...
+        pixel_width : int
+            image width in pixels
+        pixel_height : int
+            image height in pixels
+        dpi : int
+            dots per inch
+        bg_color : str
+            background color
+        display_legend : bool
+            display legend
+        workers : int
+            number of worker processes (default: cpu count), 1 renders in
+            the current process
+        chunk_size : int
+            number of molecules sent to a worker at once (default: about
+            4 chunks per worker)
+        overwrite : bool
+            if False, molecules whose images exist are skipped (default),
+            unless the render settings differ from the previous run
+        manifest_name : str
+            manifest csv file name (without extension)
+
+        Returns
+        -------
+        res : dict
+            manifest: manifest csv path
+            timing: timing csv path
+            rendered: number of rendered molecules
+            skipped: number of skipped molecules (images exist)
+            failed: number of failed molecules
+            report: timing report of each molecule (timing_columns)
+        '''
+        try:
+            # check
+            views = list(views)
+            if len(views) == 0 or len(views) > Thumbnails._max_views:
+                raise Exception(
+                    f'number of views must be 1 to {Thumbnails._max_views}.')
+            if not os.path.isdir(output_dir):
+                os.makedirs(output_dir)
+
+            # jobs
+            jobs = Thumbnails.build_jobs(source)
+            # previous manifest (rows of skipped molecules)
+            manifestPath = os.path.join(output_dir, f'{manifest_name}.csv')
+            manifestRows = Thumbnails.__load_manifest(manifestPath)
+
+            # render settings
+            settings = {
+                'output_dir': output_dir,
+                'views': views,
+                'image_format': image_format,
+                'pixel_width': pixel_width,
+                'pixel_height': pixel_height,
+                'dpi': dpi,
+                'bg_color': bg_color,
+                'display_legend': display_legend,
+                'overwrite': overwrite,
+                'manifest_names': set()
+            }
+
+            # previous render settings (images of other settings are not kept)
+            settingsPath = os.path.join(
+                output_dir, f'{manifest_name}_settings.json')
+            imageSettings = Thumbnails.__image_settings(settings)
+            if Thumbnails.__load_settings(settingsPath) != imageSettings:
+                settings['overwrite'] = True
+                manifestRows = {}
+            # skipped molecules without a manifest row are parsed again
+            settings['manifest_names'] = set(manifestRows)
+            # save (before rendering, an interrupted run restarts with them)
+            with open(settingsPath, 'w') as f:
+                json.dump(imageSettings, f, indent=4)
+
+            # size
+            jobsSize = len(jobs)
+            # workers
+            workers = workers if workers else (os.cpu_count() or 1)
+            workers = max(1, min(int(workers), max(jobsSize, 1)))
+            # chunks
+            if not chunk_size:
+                chunk_size = max(1, -(-jobsSize // (workers*4)))
+            jobChunks = [jobs[i:i+chunk_size]
+                         for i in range(0, jobsSize, chunk_size)]
+
+            # render
+            results = []
+            if workers == 1:
+                for jobChunk in jobChunks:
+                    results.extend(RenderJobs(jobChunk, settings))
+                CloseWorkerCanvas()
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=WarmWorkerCanvas,
+                                         initargs=(settings,)) as executor:
+                    futures = [executor.submit(RenderJobs, jobChunk, settings)
+                               for jobChunk in jobChunks]
+                    for future in as_completed(futures):
+                        results.extend(future.result())
+
+            # job order (names are unique)
+            resultsMap = {item['file_name']: item for item in results}
+            results = [resultsMap[item['name']] for item in jobs]
+
+            # manifest
+            csvList = []
+            for item in results:
+                if item['status'] == 'skipped':
+                    row = manifestRows.get(item['file_name'], item['row'])
+                else:
+                    row = item['row']
+                if row is not None:
+                    csvList.append(row)
+            Utility.CreateCVS(csvList, output_dir, file_name=manifest_name)
+
+            # timing report
+            report = [{key: item[key] for key in Thumbnails.timing_columns}
+                      for item in results]
+            timingPath = os.path.join(
+                output_dir, f'{manifest_name}_timing.csv')
+            with open(timingPath, 'w', newline='') as f:
+                writer = csv.DictWriter(
+                    f, fieldnames=Thumbnails.timing_columns)
+                writer.writeheader()
+                writer.writerows(report)
+
+            # res
+            return {
+                'manifest': manifestPath,
+                'timing': timingPath,
+                'rendered': sum(item['status'] == 'rendered' for item in results),
+                'skipped': sum(item['status'] == 'skipped' for item in results),
+                'failed': sum(item['status'] == 'failed' for item in results),
+                'report': report
+            }
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def __load_manifest(manifestPath):
+        '''
+        Load rows of a previous manifest (file_name -> row)
+        '''
+        # check
+        if not os.path.isfile(manifestPath):
+            return {}
+
+        with open(manifestPath, 'r', newline='') as f:
+            return {row['file_name']: row for row in csv.DictReader(f)}
+
+    @staticmethod
+    def __image_settings(settings):
+        '''
+        Settings which change the images (json values)
+        '''
+        res = {key: settings[key] for key in Thumbnails.image_settings}
+        res['views'] = [list(item) for item in settings['views']]
+        return res
+
+    @staticmethod
+    def __load_settings(settingsPath):
+        '''
+        Load the render settings of a previous run (None if not found)
+        '''
+        # check
+        if not os.path.isfile(settingsPath):
+            return None
+
+        try:
+            with open(settingsPath, 'r') as f:
+                return json.load(f)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def manifest_row(name, imageNames, compound):
+        '''
+        Manifest row of a molecule (Utility.json_csv_columns)
+        '''
+        row = {
+            'file_name': name,
+            'mat_structure': compound.structure_type,
+            'atom_numbers': compound.atom_numbers,
+            'mat_cid': compound.mat_cid,
+            'mat_name': compound.mat_name,
+            'mat_formula': compound.mat_formula,
+            'mat_mass': compound.composition.average_mass,
+            'atom_elements': [str(item) for item in compound.atom_elements],
+            'bond_numbers': compound.atom_bond_numbers
+        }
+        for i, item in enumerate(imageNames):
+            row[f'image_name_{i+1}'] = item
+        return row
+
+
+def WarmWorkerCanvas(settings):
+    '''
+    Create the canvas of a worker process (kept for all of its jobs)
+
+    Parameters
+    ----------
+    settings : dict
+        render settings (Thumbnails.render_library)
+
+    Returns
+    -------
+    canvas : RenderCanvas
+        worker canvas
+    '''
+    global _worker_canvas, _worker_canvas_settings
+    # canvas settings
+    canvasSettings = (settings['pixel_width'], settings['pixel_height'],
+                      settings['dpi'], settings['bg_color'])
+    # check
+    if _worker_canvas is None or _worker_canvas_settings != canvasSettings:
+        CloseWorkerCanvas()
+        _worker_canvas = RenderCanvas(pixel_width=settings['pixel_width'],
+                                      pixel_height=settings['pixel_height'],
+                                      dpi=settings['dpi'], bg_color=settings['bg_color'])
+        _worker_canvas_settings = canvasSettings
+    return _worker_canvas
+
+
+def CloseWorkerCanvas():
+    '''
+    Close the canvas of the current process
+    '''
+    global _worker_canvas, _worker_canvas_settings
+    if _worker_canvas is not None:
+        _worker_canvas.close()
+    _worker_canvas = None
+    _worker_canvas_settings = None
+
+
+def ParseJob(job):
+    '''
+    Parse the molecule of a job
+
+    Parameters
+    ----------
+    job : dict
+        Thumbnails.build_jobs item
+
+    Returns
+    -------
+    compound : Compound
+        compound
+    '''
+    MolParserC = MolParser(job['file_path'])
+    if job['record_offset'] is None:
+        parseRes = MolParserC.read_file()
+    else:
+        recordContent = Utility.ReadSdfRecord(
+            job['file_path'], job['record_offset'], job['record_size'])
+        parseRes = MolParserC.sdf_parser(recordContent)
+    return Compound(parseRes)
+
+
+def RenderJobs(jobs, settings):
+    '''
+    Render a list of molecules (process pool worker), errors are returned
+    per molecule
+
+    Parameters
+    ----------
+    jobs : list
+        Thumbnails.build_jobs items
+    settings : dict
+        render settings (Thumbnails.render_library)
+
+    Returns
+    -------
+    res : list
+        file_name: molecule name
+        status: rendered, skipped or failed
+        row: manifest row (None if failed, or skipped with a row in the
+            previous manifest)
+        parse_time, render_time, total_time: seconds
+        error: error message (None if rendered)
+    '''
+    # canvas (warm)
+    canvas = WarmWorkerCanvas(settings)
+    views = settings['views']
+    imageFormat = settings['image_format']
+
+    res = []
+    for job in jobs:
+        t0 = time.perf_counter()
+        parseTime = 0.0
+        renderTime = 0.0
+        # images
+        imageNames = Thumbnails.image_names(job['name'], views, imageFormat)
+        imagePaths = [os.path.join(settings['output_dir'], item)
+                      for item in imageNames]
+
+        # check (restart)
+        if not settings['overwrite'] and all(os.path.isfile(item) for item in imagePaths):
+            row = None
+            try:
+                # manifest row (not in the previous manifest)
+                if job['name'] not in settings.get('manifest_names', ()):
+                    row = Thumbnails.manifest_row(
+                        job['name'], imageNames, ParseJob(job))
+                    parseTime = time.perf_counter() - t0
+            except Exception as e:
+                res.append({'file_name': job['name'], 'status': 'failed', 'row': None,
+                            'parse_time': parseTime, 'render_time': renderTime,
+                            'total_time': time.perf_counter() - t0, 'error': str(e)})
+                continue
+            res.append({'file_name': job['name'], 'status': 'skipped', 'row': row,
+                        'parse_time': parseTime, 'render_time': renderTime,
+                        'total_time': time.perf_counter() - t0, 'error': None})
+            continue
+
+        _tempPath = None
+        try:
+            # parse
+            compound = ParseJob(job)
+            t1 = time.perf_counter()
+            parseTime = t1 - t0
+
+            # render (temporary file, renamed when complete)
+            for (elev, azim), imagePath in zip(views, imagePaths):
+                _tempPath = imagePath + '.part'
+                compound.render(_tempPath, format=imageFormat, canvas=canvas, elev=elev,
+                                azim=azim, display_legend=settings['display_legend'])
+                os.replace(_tempPath, imagePath)
+                _tempPath = None
+            renderTime = time.perf_counter() - t1
+
+            res.append({'file_name': job['name'], 'status': 'rendered',
+                        'row': Thumbnails.manifest_row(job['name'], imageNames, compound),
+                        'parse_time': parseTime, 'render_time': renderTime,
+                        'total_time': time.perf_counter() - t0, 'error': None})
+        except Exception as e:
+            # partial image
+            if _tempPath is not None and os.path.isfile(_tempPath):
+                os.remove(_tempPath)
+            res.append({'file_name': job['name'], 'status': 'failed', 'row': None,
+                        'parse_time': parseTime, 'render_time': renderTime,
+                        'total_time': time.perf_counter() - t0, 'error': str(e)})
+
+    return res
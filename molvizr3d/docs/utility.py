@@ -7,6 +7,7 @@ import json
 import fnmatch
 import re
 import csv
+import mmap
 import random
 import numpy as np
 from datetime import date
@@ -87,7 +88,7 @@ class Utility():
             # check
             if _contentSource and _contentFormat:
                 # read file
-                if _contentFormat == 'sdf':
+                if _contentFormat == 'sdf' or _contentFormat == 'xyz':
                     # string
                     fileContent = _contentSource
                 elif _contentFormat == 'json':
@@ -134,7 +135,7 @@ class Utility():
 
                 # read a file
                 with open(filePath, 'r') as f:
-                    if fileFormat == 'sdf':
+                    if fileFormat == 'sdf' or fileFormat == 'xyz':
                         fileContent = f.read()
                     elif fileFormat == 'json':
                         fileContent = json.load(f)
@@ -147,6 +148,268 @@ class Utility():
         except Exception as e:
             raise Exception(e)
 
+    @staticmethod
+    def IterSdfRecords(filePath, skip=0, limit=None, encoding='utf-8'):
+        '''
+        Iterate over the records of a (multi-record) sdf file, records are
+        separated by `$$$$` and read one at a time (bounded memory)
+
+        Parameters
+        ----------
+        filePath : str
+            file path
+        skip : int
+            number of records to skip from the beginning (default 0)
+        limit : int
+            maximum number of records to return (default None: all)
+        encoding : str
+            file encoding
+
+        Returns
+        -------
+        generator
+            (record index, record byte offset, record content)
+        '''
+        # check
+        if not os.path.isfile(filePath):
+            raise Exception("target path is not valid.")
+
+        # check limit
+        if limit is not None and limit <= 0:
+            return
+
+        # record counter
+        recordIndex = 0
+        recordNo = 0
+
+        # read binary to keep byte offsets
+        with open(filePath, 'rb') as f:
+            # byte offset
+            offset = 0
+            recordOffset = 0
+            recordLines = []
+
+            for line in f:
+                offset += len(line)
+                # skipped records are only counted
+                if recordIndex >= skip:
+                    recordLines.append(line)
+
+                # end of record
+                if line.strip() == b'$$$$':
+                    if recordIndex >= skip:
+                        yield recordIndex, recordOffset, Utility.DecodeSdfRecord(
+                            b''.join(recordLines), encoding)
+                        recordNo += 1
+                        # check limit
+                        if limit is not None and recordNo >= limit:
+                            return
+                    # next record
+                    recordIndex += 1
+                    recordOffset = offset
+                    recordLines = []
+
+            # last record without `$$$$`
+            if any(item.strip() for item in recordLines):
+                yield recordIndex, recordOffset, Utility.DecodeSdfRecord(
+                    b''.join(recordLines), encoding)
+
+    @staticmethod
+    def DecodeSdfRecord(recordBytes, encoding='utf-8'):
+        '''
+        Decode a sdf record (bytes) into text with `\\n` line endings
+
+        Parameters
+        ----------
+        recordBytes : bytes
+            record content
+        encoding : str
+            file encoding
+
+        Returns
+        -------
+        recordContent : str
+            record content
+        '''
+        # lines
+        recordLines = recordBytes.split(b'\n')
+        # last line break
+        if recordLines[-1] == b'':
+            recordLines.pop()
+        # res
+        return ''.join([item.decode(encoding).rstrip('\r') + '\n' for item in recordLines])
+
+    @staticmethod
+    def BuildSdfIndex(filePath, indexPath, encoding='utf-8'):
+        '''
+        Scan a (multi-record) sdf file once and save the byte offset, size,
+        cid and name of each record in an index (csv) file
+
+        Parameters
+        ----------
+        filePath : str
+            sdf file path
+        indexPath : str
+            index file path
+        encoding : str
+            file encoding
+
+        Returns
+        -------
+        sdfIndex : dict
+            record index (see LoadSdfIndex)
+        '''
+        try:
+            # check
+            if not os.path.isfile(filePath):
+                raise Exception("target path is not valid.")
+
+            # records [record index, offset, size, cid, name]
+            records = []
+
+            with open(filePath, 'rb') as f:
+                # byte offset
+                offset = 0
+                recordOffset = 0
+                # record info
+                lineNo = 0
+                recordTitle = ''
+                recordCid = ''
+                recordName = ''
+                recordTag = None
+                recordBlank = True
+
+                for line in f:
+                    offset += len(line)
+                    _line = line.strip()
+
+                    # title line
+                    if lineNo == 0:
+                        recordTitle = _line.decode(encoding)
+                    lineNo += 1
+
+                    # check content
+                    if _line:
+                        recordBlank = False
+
+                    # data items
+                    if recordTag is not None:
+                        if recordTag == 'cid':
+                            recordCid = _line.decode(encoding)
+                        elif recordTag == 'name':
+                            recordName = _line.decode(encoding)
+                        recordTag = None
+                    elif _line.startswith(b'>'):
+                        if b'<PUBCHEM_COMPOUND_CID>' in _line:
+                            recordTag = 'cid'
+                        elif b'<PUBCHEM_IUPAC_NAME>' in _line:
+                            recordTag = 'name'
+
+                    # end of record
+                    if _line == b'$$$$':
+                        records.append([len(records), recordOffset, offset - recordOffset,
+                                        recordCid, recordName if recordName else recordTitle])
+                        # next record
+                        recordOffset = offset
+                        lineNo = 0
+                        recordTitle = ''
+                        recordCid = ''
+                        recordName = ''
+                        recordBlank = True
+
+                # last record without `$$$$`
+                if not recordBlank:
+                    records.append([len(records), recordOffset, offset - recordOffset,
+                                    recordCid, recordName if recordName else recordTitle])
+
+            # save index
+            with open(indexPath, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['record_index', 'offset', 'size', 'cid', 'name'])
+                writer.writerows(records)
+
+            # res
+            return Utility.LoadSdfIndex(indexPath)
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def LoadSdfIndex(indexPath):
+        '''
+        Load a sdf index file created by BuildSdfIndex
+
+        Parameters
+        ----------
+        indexPath : str
+            index file path
+
+        Returns
+        -------
+        sdfIndex : dict
+            offset: record byte offsets (np.array)
+            size: record sizes in bytes (np.array)
+            cid: record cids
+            name: record names
+            cid_map: cid -> record index
+        '''
+        try:
+            # check
+            if not os.path.isfile(indexPath):
+                raise Exception("index path is not valid.")
+
+            # read
+            with open(indexPath, 'r', newline='') as f:
+                reader = csv.reader(f)
+                # header
+                next(reader)
+                records = list(reader)
+
+            # cid/name
+            cids = [item[3] for item in records]
+            names = [item[4] for item in records]
+
+            # res
+            sdfIndex = {
+                'offset': np.array([item[1] for item in records], dtype=np.int64),
+                'size': np.array([item[2] for item in records], dtype=np.int64),
+                'cid': cids,
+                'name': names,
+                'cid_map': {cids[i]: i for i in range(len(cids) - 1, -1, -1) if cids[i]}
+            }
+            return sdfIndex
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def ReadSdfRecord(filePath, offset, size, encoding='utf-8'):
+        '''
+        Read a single record of a sdf file using its byte offset (mmap)
+
+        Parameters
+        ----------
+        filePath : str
+            sdf file path
+        offset : int
+            record byte offset
+        size : int
+            record size in bytes
+        encoding : str
+            file encoding
+
+        Returns
+        -------
+        recordContent : str
+            record content
+        '''
+        try:
+            with open(filePath, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    recordBytes = mm[int(offset):int(offset) + int(size)]
+            # res
+            return Utility.DecodeSdfRecord(recordBytes, encoding)
+        except Exception as e:
+            raise Exception(e)
+
     @staticmethod
     def ListFiles(targetPath, fileExtension=''):
         '''
@@ -466,3 +729,96 @@ class Utility():
             print(f"save operation is done.")
         except Exception as e:
             raise Exception(e)
+
+    @staticmethod
+    def SaveCoordinateStack(xyzStack, file_name='', location='', frame_number=None, dtype=None):
+        '''
+        Save a coordinate stack as a .npy file (memory-mappable)
+
+        Parameters
+        ----------
+        xyzStack : np.array | iterable
+            (K,N,3) coordinates or an iterable of (N,3) frames, frames are
+            written one by one (the stack is not built in memory)
+        file_name : str
+            file name
+        location : str
+            location
+        frame_number : int
+            number of frames (required if xyzStack has no length)
+        dtype : np.dtype
+            stored dtype (default: dtype of xyzStack if it is a float array,
+            otherwise float64)
+
+        Returns
+        -------
+        fileLoc : str
+            file path
+        '''
+        try:
+            # full file name
+            if not file_name:
+                file_name = "xyz_stack"
+            fullFileName = file_name if file_name.endswith(
+                '.npy') else f"{file_name}.npy"
+            # location
+            fileLoc = os.path.join(location, fullFileName)
+
+            # frame number
+            if frame_number is None:
+                frame_number = len(xyzStack)
+            frames = iter(xyzStack)
+
+            # dtype (kept for float stacks, e.g. a float32 memmap)
+            if dtype is None:
+                _dtype = getattr(xyzStack, 'dtype', None)
+                dtype = _dtype if _dtype is not None and np.issubdtype(
+                    _dtype, np.floating) else np.float64
+
+            # first frame (atom number)
+            _frame = np.asarray(next(frames), dtype=dtype).reshape(-1, 3)
+            # open (C order)
+            stack = np.lib.format.open_memmap(
+                fileLoc, mode='w+', dtype=dtype, shape=(int(frame_number), len(_frame), 3))
+            try:
+                stack[0] = _frame
+                for k in range(1, int(frame_number)):
+                    stack[k] = np.asarray(
+                        next(frames), dtype=dtype).reshape(-1, 3)
+                stack.flush()
+            finally:
+                del stack
+
+            return fileLoc
+        except StopIteration:
+            raise Exception('xyzStack has less frames than frame_number.')
+        except Exception as e:
+            raise Exception(e)
+
+    @staticmethod
+    def LoadCoordinateStack(filePath, mmap=True):
+        '''
+        Load a coordinate stack saved by SaveCoordinateStack
+
+        Parameters
+        ----------
+        filePath : str
+            .npy file path
+        mmap : bool
+            if True, the file is memory-mapped (read-only), frames are read
+            from disk on access, otherwise loaded in memory
+
+        Returns
+        -------
+        xyzStack : np.memmap | np.array
+            (K,N,3) coordinates
+        '''
+        try:
+            xyzStack = np.load(filePath, mmap_mode='r' if mmap else None,
+                               allow_pickle=False)
+            # check
+            if xyzStack.ndim != 3 or xyzStack.shape[2] != 3:
+                raise Exception('coordinate stack must be a (K,N,3) array.')
+            return xyzStack
+        except Exception as e:
+            raise Exception(e)
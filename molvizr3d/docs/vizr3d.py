@@ -5,9 +5,13 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import cm
+from matplotlib.lines import Line2D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import math
 # internal
 from .observer import Observer
+from .atomtable import AtomTable
+from .rendercanvas import RenderCanvas
 
 
 class Vizr3D():
@@ -21,12 +25,28 @@ class Vizr3D():
     # properties
     _structure_type = ''
     plotScale = []
-
-    def __init__(self, atomElements, atomBonds, xyzList, xyzCenterList, robs, tetaNo, phiNo, limits):
-        self.atomElements = atomElements
+    # render plan (prepare_render)
+    _render_plan = None
+    # bond lines of each bond type (index: type, 0: no line)
+    _bond_line_numbers = np.array([0, 1, 2, 3])
+    _bond_line_offsets = np.array([[0, 0, 0],
+                                   [0, 0, 0],
+                                   [0.15, -0.15, 0],
+                                   [0.125, 0, -0.125]], dtype=np.float64)
+
+    def __init__(self, atomElements, atomBonds, xyzList, xyzCenterList, robs, tetaNo, phiNo, limits, atomTable=None,
+                 bondMatrix=None):
+        # atom table (columnar)
+        if atomTable is None:
+            atomTable = AtomTable.from_symbols(atomElements, xyzList)
+        self.atomTable = atomTable
+        self.atomElements = atomTable.symbols
         # bond block (info)
         self.atomBonds = atomBonds
-        self.xyzList = xyzList
+        # bond rows [atom1 id, atom2 id, bond type] in bond block order
+        # (default: from the bond block)
+        self.bondMatrix = bondMatrix
+        self.xyzList = atomTable.xyz
         self.xyzCenterList = xyzCenterList
         self.robs = robs
         self.tetaNo = tetaNo
@@ -246,6 +266,97 @@ class Vizr3D():
         # res
         return xyzLenMax, xyzLenMin, xyzR, xLen, yLen, zLen
 
+    @staticmethod
+    def bond_segments(xyzList, bondIndex, bondTypes):
+        '''
+        Create bond lines of all bonds (single, double, triple)
+
+        Parameters
+        ----------
+        xyzList: np.array
+            (N,3) atom coordinates
+        bondIndex: np.array
+            (B,2) bonded atom indices, start from 0
+        bondTypes: np.array
+            (B,) bond types (1,2,3), other types have no line
+
+        Returns
+        -------
+        segments: np.array
+            (S,2,3) bond lines [[x1,y1,z1],[x2,y2,z2]] in bond order
+        lengths: np.array
+            (S,) line lengths
+        segmentBond: np.array
+            (S,) bond index of each line
+
+        hints:
+            double bond: two lines shifted by +/-0.15, triple bond: center
+            line and two lines shifted by +/-0.125
+            shift direction: [dy,-dx,0] of the bond vector, [1,0,0] for
+            bonds parallel to z (or atoms at the same position)
+        '''
+        xyz = np.asarray(xyzList, dtype=np.float64).reshape(-1, 3)
+        bondIndex = np.asarray(bondIndex, dtype=np.int64).reshape(-1, 2)
+        bondTypes = np.asarray(bondTypes, dtype=np.int64).reshape(-1)
+
+        # lines of each bond type (type 0: no line)
+        _types = np.where((bondTypes >= 1) & (bondTypes <= 3), bondTypes, 0)
+        counts = Vizr3D._bond_line_numbers[_types]
+        segmentNo = int(counts.sum())
+        # bond of each line
+        segmentBond = np.repeat(np.arange(len(bondIndex)), counts)
+        # line position in its bond
+        position = np.arange(segmentNo) - \
+            np.repeat(np.cumsum(counts) - counts, counts)
+        offsetScale = Vizr3D._bond_line_offsets[_types[segmentBond], position]
+
+        # bond points
+        xyz1 = xyz[bondIndex[:, 0]]
+        xyz2 = xyz[bondIndex[:, 1]]
+        # perpendicular vector to center vector (xy plane)
+        center_vector = xyz2 - xyz1
+        perp_vector = np.column_stack(
+            (center_vector[:, 1], -center_vector[:, 0], np.zeros(len(bondIndex))))
+        perp_norm = np.sqrt(perp_vector[:, 0]**2 + perp_vector[:, 1]**2)
+        # bond parallel to z
+        _degenerate = perp_norm == 0
+        perp_vector[_degenerate] = [1.0, 0.0, 0.0]
+        perp_norm[_degenerate] = 1.0
+        perp_vector /= perp_norm[:, None]
+
+        # offset vectors
+        offset_vector = offsetScale[:, None] * perp_vector[segmentBond]
+        # lines
+        segments = np.empty((segmentNo, 2, 3))
+        segments[:, 0] = xyz1[segmentBond] + offset_vector
+        segments[:, 1] = xyz2[segmentBond] + offset_vector
+        # length
+        _diff = segments[:, 1] - segments[:, 0]
+        lengths = np.sqrt(_diff[:, 0]**2 + _diff[:, 1]**2 + _diff[:, 2]**2)
+
+        return segments, lengths, segmentBond
+
+    def bond_table(self):
+        '''
+        Bonds of the bond block (drawing order)
+
+        Returns
+        -------
+        bondIndex: np.array
+            (B,2) bonded atom indices, start from 0
+        bondTypes: np.array
+            (B,) bond types
+        '''
+        # bond rows
+        if self.bondMatrix is not None:
+            _table = np.asarray(self.bondMatrix, dtype=np.int64).reshape(-1, 3)
+            return _table[:, 0:2] - 1, _table[:, 2]
+
+        _rows = [(int(item['id']) - 1, int(bond[0]) - 1, int(bond[3]))
+                 for item in self.atomBonds for bond in item['bonds']]
+        _table = np.array(_rows, dtype=np.int64).reshape(-1, 3)
+        return _table[:, 0:2], _table[:, 2]
+
     def create_bond_line(self, xyz1, xyz2, bond_type, xyzL=[1, 1, 1], xyzR=0.15):
         '''
         Create bond line (single, double, tipple)
@@ -268,110 +379,12 @@ class Vizr3D():
         bondLines: list
             list of bond lines
         '''
-        # bond lines
-        bondLines = []
+        segments, lengths, _ = Vizr3D.bond_segments(
+            [xyz1, xyz2], [[0, 1]], [bond_type])
+        # bond lines [[x1,x2],[y1,y2],[z1,z2]]
+        bondLines = np.transpose(segments, (0, 2, 1)).tolist()
         # bond length
-        bondLength = []
-
-        xL, yL, zL = xyzR*np.array(xyzL)
-
-        # Calculate center-to-center vector
-        center_vector = np.array(xyz2) - np.array(xyz1)
-
-        # Calculate center-to-center line
-        center_line = [[xyz1[0], xyz2[0]], [
-            xyz1[1], xyz2[1]], [xyz1[2], xyz2[2]]]
-
-        if bond_type == 1:
-            # bond line
-            bondLines.append(center_line)
-            # bond length
-            _bond_length_res = self.calculate_distance(xyz1, xyz2)
-            bondLength.append(_bond_length_res)
-
-        elif bond_type == 2:
-            # parallel line
-            # y increase
-            # center to center line
-            # Calculate perpendicular vector to center vector
-            perp_vector = np.array([center_vector[1], - center_vector[0], 0])
-            perp_vector /= np.linalg.norm(perp_vector)
-
-            # Calculate offset vectors
-            offset_vector1 = 0.15 * perp_vector
-            offset_vector2 = -0.15 * perp_vector
-
-            # Calculate parallel lines
-            _l1 = [[xyz1[0]+offset_vector1[0], xyz2[0]+offset_vector1[0]], [
-                xyz1[1]+offset_vector1[1], xyz2[1]+offset_vector1[1]], [xyz1[2]+offset_vector1[2], xyz2[2]+offset_vector1[2]]]
-            _l2 = [[xyz1[0]+offset_vector2[0], xyz2[0]+offset_vector2[0]], [
-                xyz1[1]+offset_vector2[1], xyz2[1]+offset_vector2[1]], [xyz1[2]+offset_vector2[2], xyz2[2]+offset_vector2[2]]]
-
-            # lines
-            _l1_xyz1 = [xyz1[0]+offset_vector1[0], xyz1[1] +
-                        offset_vector1[1], xyz1[2]+offset_vector1[2]]
-            _l1_xyz2 = [xyz2[0]+offset_vector1[0], xyz2[1] +
-                        offset_vector1[1], xyz2[2]+offset_vector1[2]]
-
-            _l2_xyz1 = [xyz1[0]+offset_vector2[0], xyz1[1] +
-                        offset_vector2[1], xyz1[2]+offset_vector2[2]]
-            _l2_xyz2 = [xyz2[0]+offset_vector2[0], xyz2[1] +
-                        offset_vector2[1], xyz2[2]+offset_vector2[2]]
-
-            # bond lines
-            bondLines.append(_l1)
-            bondLines.append(_l2)
-            # bond length
-            _bond_length_res = self.calculate_distance(_l1_xyz1, _l1_xyz2)
-            bondLength.append(_bond_length_res)
-            _bond_length_res = self.calculate_distance(_l2_xyz1, _l2_xyz2)
-            bondLength.append(_bond_length_res)
-
-        elif bond_type == 3:
-            # parallel line
-            # y increase
-            # line
-            # Calculate perpendicular vector to center vector
-            perp_vector = np.array([center_vector[1], -center_vector[0], 0])
-            perp_vector /= np.linalg.norm(perp_vector)
-
-            # Calculate offset vectors
-            offset_vector1 = 0.125 * perp_vector
-            offset_vector2 = -0.125 * perp_vector
-
-            # Calculate parallel lines
-            _l1 = [[xyz1[0]+offset_vector1[0], xyz2[0]+offset_vector1[0]], [
-                xyz1[1]+offset_vector1[1], xyz2[1]+offset_vector1[1]], [xyz1[2]+offset_vector1[2], xyz2[2]+offset_vector1[2]]]
-            _l2 = [[xyz1[0], xyz2[0]], [
-                xyz1[1], xyz2[1]], [xyz1[2], xyz2[2]]]
-
-            _l3 = [[xyz1[0]+offset_vector2[0], xyz2[0]+offset_vector2[0]], [
-                xyz1[1]+offset_vector2[1], xyz2[1]+offset_vector2[1]], [xyz1[2]+offset_vector2[2], xyz2[2]+offset_vector2[2]]]
-
-            # lines
-            _l1_xyz1 = [xyz1[0]+offset_vector1[0], xyz1[1] +
-                        offset_vector1[1], xyz1[2]+offset_vector1[2]]
-            _l1_xyz2 = [xyz2[0]+offset_vector1[0], xyz2[1] +
-                        offset_vector1[1], xyz2[2]+offset_vector1[2]]
-            _l2_xyz1 = xyz1
-            _l2_xyz2 = xyz2
-            _l3_xyz1 = [xyz1[0]+offset_vector2[0], xyz1[1] +
-                        offset_vector2[1], xyz1[2]+offset_vector2[2]]
-            _l3_xyz2 = [xyz2[0]+offset_vector2[0], xyz2[1] +
-                        offset_vector2[1], xyz2[2]+offset_vector2[2]]
-
-            # bond lines
-            bondLines.append(_l1)
-            bondLines.append(_l2)
-            bondLines.append(_l3)
-            # bond length
-            # bond length
-            _bond_length_res = self.calculate_distance(_l1_xyz1, _l1_xyz2)
-            bondLength.append(_bond_length_res)
-            _bond_length_res = self.calculate_distance(_l2_xyz1, _l2_xyz2)
-            bondLength.append(_bond_length_res)
-            _bond_length_res = self.calculate_distance(_l3_xyz1, _l3_xyz2)
-            bondLength.append(_bond_length_res)
+        bondLength = lengths.tolist()
 
         return bondLines, bond_type, bondLength
 
@@ -396,90 +409,23 @@ class Vizr3D():
         -------
         bondLines: list
             list of bond lines
+
+        hints:
+            each bond line (create_bond_line) is split at its midpoint, the
+            first half belongs to atom 1 and the second half to atom 2
         '''
-        bondLines = []
-
-        xL, yL, zL = xyzR*np.array(xyzL)
-
-        # Calculate center-to-center vector
-        center_vector = np.array(xyz2) - np.array(xyz1)
-
-        # Calculate center-to-center line
-        center_line = [[xyz1[0], xyz2[0]], [
-            xyz1[1], xyz2[1]], [xyz1[2], xyz2[2]]]
-
-        # Calculate midpoint
-        midpoint = [(xyz1[0] + xyz2[0]) / 2, (xyz1[1] +
-                                              xyz2[1]) / 2, (xyz1[2] + xyz2[2]) / 2]
-
-        if bond_type == 1:
-            # Break single bond into two lines
-            bondLines.append(
-                [[xyz1[0], midpoint[0]], [xyz1[1], midpoint[1]], [xyz1[2], midpoint[2]]])
-            bondLines.append(
-                [[midpoint[0], xyz2[0]], [midpoint[1], xyz2[1]], [midpoint[2], xyz2[2]]])
-
-        elif bond_type == 2:
-            # parallel line
-            # y increase
-            # center to center line
-            # Calculate perpendicular vector to center vector
-            perp_vector = np.array([center_vector[1], - center_vector[0], 0])
-            perp_vector /= np.linalg.norm(perp_vector)
-
-            # Calculate offset vectors
-            offset_vector1 = 0.15 * perp_vector
-            offset_vector2 = -0.15 * perp_vector
-
-            # Calculate parallel lines
-            _l1 = [[xyz1[0]+offset_vector1[0], xyz2[0]+offset_vector1[0]], [
-                xyz1[1]+offset_vector1[1], xyz2[1]+offset_vector1[1]], [xyz1[2]+offset_vector1[2], xyz2[2]+offset_vector1[2]]]
-            _l2 = [[xyz1[0]+offset_vector2[0], xyz2[0]+offset_vector2[0]], [
-                xyz1[1]+offset_vector2[1], xyz2[1]+offset_vector2[1]], [xyz1[2]+offset_vector2[2], xyz2[2]+offset_vector2[2]]]
-
-            # Break each parallel line into two lines
-            bondLines.append([[xyz1[0]+offset_vector1[0], midpoint[0]+offset_vector1[0]], [
-                xyz1[1]+offset_vector1[1], midpoint[1]+offset_vector1[1]], [xyz1[2]+offset_vector1[2], midpoint[2]+offset_vector1[2]]])
-            bondLines.append([[midpoint[0]+offset_vector1[0], xyz2[0]+offset_vector1[0]], [
-                midpoint[1]+offset_vector1[1], xyz2[1]+offset_vector1[1]], [midpoint[2]+offset_vector1[2], xyz2[2]+offset_vector1[2]]])
-            bondLines.append([[xyz1[0]+offset_vector2[0], midpoint[0]+offset_vector2[0]], [
-                xyz1[1]+offset_vector2[1], midpoint[1]+offset_vector2[1]], [xyz1[2]+offset_vector2[2], midpoint[2]+offset_vector2[2]]])
-            bondLines.append([[midpoint[0]+offset_vector2[0], xyz2[0]+offset_vector2[0]], [
-                midpoint[1]+offset_vector2[1], xyz2[1]+offset_vector2[1]], [midpoint[2]+offset_vector2[2], xyz2[2]+offset_vector2[2]]])
-
-        elif bond_type == 3:
-            # parallel line
-            # y increase
-            # line
-            # Calculate perpendicular vector to center vector
-            perp_vector = np.array([center_vector[1], -center_vector[0], 0])
-            perp_vector /= np.linalg.norm(perp_vector)
-
-            # Calculate offset vectors
-            offset_vector1 = 0.125 * perp_vector
-            offset_vector2 = -0.125 * perp_vector
-
-            # Calculate parallel lines
-            _l1 = [[xyz1[0]+offset_vector1[0], xyz2[0]+offset_vector1[0]], [
-                xyz1[1]+offset_vector1[1], xyz2[1]+offset_vector1[1]], [xyz1[2]+offset_vector1[2], xyz2[2]+offset_vector1[2]]]
-            _l2 = [[xyz1[0], xyz2[0]], [
-                xyz1[1], xyz2[1]], [xyz1[2], xyz2[2]]]
-            _l3 = [[xyz1[0]+offset_vector2[0], xyz2[0]+offset_vector2[0]], [
-                xyz1[1]+offset_vector2[1], xyz2[1]+offset_vector2[1]], [xyz1[2]+offset_vector2[2], xyz2[2]+offset_vector2[2]]]
-
-            # Break each parallel line into two lines
-            bondLines.append([[xyz1[0]+offset_vector1[0], midpoint[0]+offset_vector1[0]], [
-                xyz1[1]+offset_vector1[1], midpoint[1]+offset_vector1[1]], [xyz1[2]+offset_vector1[2], midpoint[2]+offset_vector1[2]]])
-            bondLines.append([[midpoint[0]+offset_vector1[0], xyz2[0]+offset_vector1[0]], [
-                midpoint[1]+offset_vector1[1], xyz2[1]+offset_vector1[1]], [midpoint[2]+offset_vector1[2], xyz2[2]+offset_vector1[2]]])
-            bondLines.append([[xyz1[0], midpoint[0]], [
-                xyz1[1], midpoint[1]], [xyz1[2], midpoint[2]]])
-            bondLines.append([[midpoint[0], xyz2[0]], [
-                midpoint[1], xyz2[1]], [midpoint[2], xyz2[2]]])
-            bondLines.append([[xyz1[0]+offset_vector2[0], midpoint[0]+offset_vector2[0]], [
-                xyz1[1]+offset_vector2[1], midpoint[1]+offset_vector2[1]], [xyz1[2]+offset_vector2[2], midpoint[2]+offset_vector2[2]]])
-            bondLines.append([[midpoint[0]+offset_vector2[0], xyz2[0]+offset_vector2[0]], [
-                midpoint[1]+offset_vector2[1], xyz2[1]+offset_vector2[1]], [midpoint[2]+offset_vector2[2], xyz2[2]+offset_vector2[2]]])
+        segments, _, _ = Vizr3D.bond_segments(
+            [xyz1, xyz2], [[0, 1]], [bond_type])
+        # midpoints
+        midpoints = (segments[:, 0] + segments[:, 1]) / 2
+        # halves [atom 1 half, atom 2 half] of each line
+        halves = np.empty((2*len(segments), 2, 3))
+        halves[0::2, 0] = segments[:, 0]
+        halves[0::2, 1] = midpoints
+        halves[1::2, 0] = midpoints
+        halves[1::2, 1] = segments[:, 1]
+        # bond lines [[x1,x2],[y1,y2],[z1,z2]]
+        bondLines = np.transpose(halves, (0, 2, 1)).tolist()
 
         return bondLines, bond_type
 
@@ -581,80 +527,131 @@ class Vizr3D():
         except Exception as e:
             raise Exception(e)
 
-    def set_plot_scale(self):
+    @staticmethod
+    def plot_scale(bondLengthList):
         '''
-        Set plot scale
+        Plot scale of bond line lengths
+
+        Returns
+        -------
+        plotScale: list
+            [min, max, mean, median] bond length ([] without bonds)
         '''
-        # atom no
-        atomNo = len(self.xyzList)
-        # bond no
-        bondNo = len(self.atomBonds)
+        # check bond length list
+        if len(bondLengthList) == 0:
+            return []
 
-        # bond length list
-        bondLengthList = []
+        # max bond length
+        maxBondLength = np.max(bondLengthList)
+        # min bond length
+        minBondLength = np.min(bondLengthList)
+        # mean bond length
+        meanBondLength = np.mean(bondLengthList)
+        # median bond length
+        medianBondLength = np.median(bondLengthList)
 
-        # *** using bond block
-        for i in range(bondNo):
-            # atom id
-            _atom1Id = int(self.atomBonds[i]['id']) - 1
-            # atom symbol
-            _atom1Symbol = self.atomBonds[i]['symbol']
-            # atom color
-            _atom1Color = self.set_color(_atom1Symbol)
-            # atom bond list
-            _atom1BondList = self.atomBonds[i]['bonds']
-            atom1BondSize = len(_atom1BondList)
+        return [minBondLength, maxBondLength, meanBondLength, medianBondLength]
 
-            _atom1X = self.xyzList[_atom1Id, 0]
-            _atom1Y = self.xyzList[_atom1Id, 1]
-            _atom1Z = self.xyzList[_atom1Id, 2]
-            _atom1XYZ = [_atom1X, _atom1Y, _atom1Z]
+    def set_plot_scale(self):
+        '''
+        Set plot scale (from the render plan)
+        '''
+        plan = self.prepare_render()
+        # check
+        if len(plan['plot_scale']) > 0:
+            self.plotScale = plan['plot_scale']
 
-            # draw bond
-            if atom1BondSize > 0:
-                for j in range(atom1BondSize):
-                    # atom [2] id
-                    _atom2Id = int(_atom1BondList[j][0]) - 1
-                    # atom [2] symbol
-                    _atom2Symbol = _atom1BondList[j][1]
-                    # atom color
-                    _atom2Color = self.set_color(_atom2Symbol)
-                    # atom [1] - atom [2] bond type
-                    _bondType = int(_atom1BondList[j][3])
+    def reset_render_plan(self):
+        '''
+        Drop the cached render plan (xyzList or bonds changed in place)
+        '''
+        self._render_plan = None
 
-                    # xyz
-                    _atom2X = self.xyzList[_atom2Id, 0]
-                    _atom2Y = self.xyzList[_atom2Id, 1]
-                    _atom2Z = self.xyzList[_atom2Id, 2]
-                    _atom2XYZ = [_atom2X, _atom2Y, _atom2Z]
+    def prepare_render(self):
+        '''
+        Build the render plan once (cached), view3d only draws it
 
-                    # bond connection (points)
-                    _bondConnection, _bondTypeLog, _bondLengths = self.create_bond_line(
-                        _atom1XYZ, _atom2XYZ, _bondType)
+        Returns
+        -------
+        plan: dict
+            bond_index: (B,2) bonded atom indices
+            bond_types: (B,) bond types
+            segments: (S,2,3) bond lines
+            segment_lengths: (S,) bond line lengths
+            segment_colors: bond line colors
+            segment_widths: (S,) bond line widths
+            plot_scale: [min, max, mean, median] bond line length
+            plot_summary: bond summary (atom ids, symbols, distance)
+            atom_colors, atom_sizes: marker color/size of each atom
+            elements: element symbols (first appearance order)
+            element_colors, element_sizes: marker color/size of each element
+            axis_limit: max coordinate
+
+        hints:
+            the plan is rebuilt if xyzList is another array (conformers),
+            call reset_render_plan after changing xyzList in place
+        '''
+        plan = self._render_plan
+        if plan is not None and plan['xyz_list'] is self.xyzList:
+            return plan
 
-                    # save bond length
-                    bondLengthList.append(_bondLengths)
+        # *** bonds
+        bondIndex, bondTypes = self.bond_table()
+        # bond lines
+        segments, segmentLengths, segmentBond = Vizr3D.bond_segments(
+            self.xyzList, bondIndex, bondTypes)
+        # line setting
+        lineColor = np.array(['w', 'w', 'w'])
+        lineWidth = np.array([4, 3, 2])
+        _segmentTypes = bondTypes[segmentBond] - 1
+
+        # distance
+        _diff = self.xyzList[bondIndex[:, 1]] - self.xyzList[bondIndex[:, 0]]
+        _distance = np.sqrt(_diff[:, 0]**2 + _diff[:, 1]**2 + _diff[:, 2]**2)
+        # plot summary
+        _symbols = self.atomElements
+        plot_summary = [
+            {
+                'atom1Id': int(bondIndex[i, 0])+1,
+                'atom2Id': int(bondIndex[i, 1])+1,
+                'atom1Symbol': str(_symbols[bondIndex[i, 0]]) + str(bondIndex[i, 0]+1),
+                'atom2Symbol': str(_symbols[bondIndex[i, 1]]) + str(bondIndex[i, 1]+1),
+                'distance': float(_distance[i])
+            }
+            for i in range(len(bondIndex))]
+
+        # *** atoms
+        atomSymbols = [str(item).strip() for item in self.atomElements]
+        # element lookups (once per element)
+        elementSymbols = list(dict.fromkeys(atomSymbols))
+        elementColors = {item: self.set_color(item) for item in elementSymbols}
+        elementSizes = {item: self.set_size(item) for item in elementSymbols}
+
+        # plan
+        plan = {
+            'xyz_list': self.xyzList,
+            'bond_index': bondIndex,
+            'bond_types': bondTypes,
+            'segments': segments,
+            'segment_lengths': segmentLengths,
+            'segment_colors': lineColor[_segmentTypes].tolist(),
+            'segment_widths': lineWidth[_segmentTypes],
+            'plot_scale': Vizr3D.plot_scale(segmentLengths),
+            'plot_summary': plot_summary,
+            'atom_colors': [elementColors[item] for item in atomSymbols],
+            'atom_sizes': [elementSizes[item] for item in atomSymbols],
+            'elements': elementSymbols,
+            'element_colors': elementColors,
+            'element_sizes': elementSizes,
+            'axis_limit': np.max(self.xyzList) if len(self.xyzList) > 0 else 0
+        }
+        self._render_plan = plan
 
-        # check bond length list
-        if len(bondLengthList) > 0:
-            # flatten list
-            bondLengthList_flatten = sum(bondLengthList, [])
-
-            # max bond length
-            maxBondLength = max(bondLengthList_flatten)
-            # min bond length
-            minBondLength = min(bondLengthList_flatten)
-            # mean bond length
-            meanBondLength = np.mean(bondLengthList_flatten)
-            # median bond length
-            medianBondLength = np.median(bondLengthList_flatten)
-
-            # set plot scale
-            self.plotScale = [minBondLength, maxBondLength,
-                              meanBondLength, medianBondLength]
+        return plan
 
     def view3d(self, elev=None, azim=None, figSize='default', obsOption=[False, 0],
-               dpi=100, pixel_width=800, pixel_height=600, bg_color='#090A0B', display_legend=True):
+               dpi=100, pixel_width=800, pixel_height=600, bg_color='#090A0B', display_legend=True,
+               batched=False, return_figure=False):
         '''
         Draw a compound in the cartesian coordinate
         atomElements atom symbol
@@ -683,11 +680,25 @@ class Vizr3D():
             background color
         display_legend: bool
             display legend
+        batched: bool
+            if True, all atoms are drawn as one collection and all bond lines
+            as one collection (faster), otherwise one artist per atom/bond
+            line (depth sorted per artist, default)
+        return_figure: bool
+            if True, also return the figure
+
+        hints:
+            batched drawing sorts atoms and bond lines by depth within each
+            collection, but the two collections are not sorted against each
+            other: bond lines are always drawn behind atoms, a bond in front
+            of an atom is hidden by it (batched=False keeps the per-artist
+            depth order)
 
         Returns
         -------
-        fig: figure
-            figure
+        plot_summary: list
+            bond summary (atom ids, symbols, distance), (fig, plot_summary)
+            if return_figure is True
         '''
         # plot summary
         plot_summary = []
@@ -714,6 +725,17 @@ class Vizr3D():
         ax_color = f'{bg_color}'
         ax.set_facecolor(ax_color)
 
+        if batched:
+            # *** draw the render plan (atoms and bonds, one collection each)
+            plot_summary = self.draw3d(ax, elev=elev, azim=azim, obsOption=obsOption,
+                                       display_legend=display_legend)
+            plt.show()
+
+            # res
+            if return_figure:
+                return fig, plot_summary
+            return plot_summary
+
         # legend
         legend_list = []
 
@@ -722,8 +744,6 @@ class Vizr3D():
 
         # atom no
         atomNo = len(self.xyzList)
-        # bond no
-        bondNo = len(self.atomBonds)
 
         # create 3d frame
         xyzLenMax, xyzLenMin, xyzR, xLen, yLen, zLen = self.create_3dframe()
@@ -786,115 +806,18 @@ class Vizr3D():
         #     ax.text(_atom1X, _atom1Y, _atom1Z, label, ha='left',
         #             va='center', color='red', fontsize=12)
 
-        # reset
-        i = 0
-
         # *** bond visualization
-        # *** using bond block
-        for i in range(bondNo):
-            # atom id
-            _atom1Id = int(self.atomBonds[i]['id']) - 1
-            # atom symbol
-            _atom1Symbol = self.atomBonds[i]['symbol']
-            # atom color
-            _atom1Color = self.set_color(_atom1Symbol)
-            # atom bond list
-            _atom1BondList = self.atomBonds[i]['bonds']
-            atom1BondSize = len(_atom1BondList)
-
-            _atom1X = self.xyzList[_atom1Id, 0]
-            _atom1Y = self.xyzList[_atom1Id, 1]
-            _atom1Z = self.xyzList[_atom1Id, 2]
-            _atom1XYZ = [_atom1X, _atom1Y, _atom1Z]
-
-            # draw bond
-            if atom1BondSize > 0:
-                for j in range(atom1BondSize):
-                    # atom [2] id
-                    _atom2Id = int(_atom1BondList[j][0]) - 1
-                    # atom [2] symbol
-                    _atom2Symbol = _atom1BondList[j][1]
-                    # atom color
-                    _atom2Color = self.set_color(_atom2Symbol)
-                    # atom [1] - atom [2] bond type
-                    _bondType = int(_atom1BondList[j][3])
-
-                    # set color
-                    lineColor = ['w', 'w', 'w']
-                    lineWidth = [4, 3, 2]
-                    lineColorAtoms = [_atom1Color, _atom2Color]
+        # *** render plan (bond lines in bond block order)
+        plan = self.prepare_render()
+        plot_summary = [dict(item) for item in plan['plot_summary']]
+        for _line, _width, _color in zip(plan['segments'], plan['segment_widths'],
+                                         plan['segment_colors']):
+            ax.plot3D(_line[:, 0], _line[:, 1], _line[:, 2],
+                      linewidth=_width, c=_color)
 
-                    # xyz
-                    _atom2X = self.xyzList[_atom2Id, 0]
-                    _atom2Y = self.xyzList[_atom2Id, 1]
-                    _atom2Z = self.xyzList[_atom2Id, 2]
-                    _atom2XYZ = [_atom2X, _atom2Y, _atom2Z]
-
-                    # distance
-                    _distance = self.calculate_distance(_atom1XYZ, _atom2XYZ)
-
-                    # plot summary
-                    plot_summary.append(
-                        {
-                            'atom1Id': _atom1Id+1,
-                            'atom2Id': _atom2Id+1,
-                            'atom1Symbol': str(_atom1Symbol) + str(_atom1Id+1),
-                            'atom2Symbol': str(_atom2Symbol) + str(_atom2Id+1),
-                            'distance': _distance
-                        }
-                    )
-
-                    # line property
-                    xyzMean, xyzPlane, isPlane, xyzL, perpendicularAxis = self.line_property(
-                        _atom1XYZ, _atom2XYZ)
-
-                    # ** create bond line
-                    create_bond_line_version = 1
-                    if create_bond_line_version == 1:
-                        # bond connection (points)
-                        _bondConnection, _bondTypeLog, _ = self.create_bond_line(
-                            _atom1XYZ, _atom2XYZ, _bondType)
-
-                        # size
-                        _bondConnectionSize = len(_bondConnection)
-
-                        # check
-                        if _bondConnectionSize == 1:
-                            _vector = _bondConnection[0]
-                            ax.plot3D(_vector[0], _vector[1], _vector[2],
-                                      linewidth=lineWidth[_bondType-1], c=lineColor[_bondType-1])
-                        else:
-                            # line color: black
-                            for b in range(_bondConnectionSize):
-                                _vector = _bondConnection[b]
-                                ax.plot3D(_vector[0], _vector[1], _vector[2],
-                                          linewidth=lineWidth[_bondType-1], c=lineColor[_bondType-1])
-
-                    else:
-                        # bond connection (points)
-                        _bondConnection, _bondTypeLog = self.create_bond_line_V2(
-                            _atom1XYZ, _atom2XYZ, _bondType)
-
-                        # size
-                        _bondConnectionSize = len(_bondConnection)
-
-                        # color index
-                        color_index = 0
-                        # line color: black
-                        for b in range(_bondConnectionSize):
-                            _vector = _bondConnection[b]
-                            ax.plot3D(_vector[0], _vector[1], _vector[2],
-                                      linewidth=lineWidth[_bondType-1], c=lineColorAtoms[color_index])
-                            # check
-                            if color_index == 1:
-                                color_index = 0
-                            else:
-                                # set color index
-                                color_index += 1
-
-            # obs show
-            if obsOption[0]:
-                ax.scatter3D(obsOption[1], 0, 0, s=40)
+        # obs show
+        if obsOption[0]:
+            ax.scatter3D(obsOption[1], 0, 0, s=40)
 
         # check
         if display_legend:
@@ -931,9 +854,171 @@ class Vizr3D():
         plt.show()
 
         # res
+        if return_figure:
+            return fig, plot_summary
         return plot_summary
 
-    def view3dobs(self, elev=None, azim=None, figSize=(10, 10), obsOption=[True, 0]):
+    def draw3d(self, ax, elev=None, azim=None, obsOption=[False, 0], display_legend=True):
+        '''
+        Draw the compound on 3d axes (render plan, one collection for atoms
+        and one for bond lines, bond lines are drawn behind atoms)
+
+        Parameters
+        ----------
+        ax: Axes3D
+            3d axes (pyplot or offscreen figure)
+        elev: int
+            elevation of the view angle
+        azim: int
+            azimuthal angle of the view angle
+        obsOption: list
+            display center point [False,0]
+        display_legend: bool
+            display legend
+
+        Returns
+        -------
+        plot_summary: list
+            bond summary (atom ids, symbols, distance)
+        '''
+        # *** render plan (bond lines, plot scale, colors; built once)
+        plan = self.prepare_render()
+
+        # *** atoms and bonds
+        legend_handles = self.__draw_plan(ax, plan)
+
+        # obs show
+        if obsOption[0]:
+            ax.scatter3D(obsOption[1], 0, 0, s=40)
+
+        # check
+        if display_legend:
+            # legend position end right
+            ax.legend(handles=legend_handles, loc="upper right", markerscale=0.25,
+                      scatterpoints=1, fontsize=10)
+
+        # axis setting
+        ax.set_xlabel("$X$")
+        ax.set_ylabel("$Y$")
+        ax.set_zlabel("$Z$")
+
+        ax.autoscale(True)
+        ax.set_aspect('equal')
+
+        # set limits
+        set_lim_offset = 1
+        _maxVal = plan['axis_limit']
+        ax.set_xlim(int(-_maxVal) + -set_lim_offset,
+                    int(_maxVal) + set_lim_offset)
+        ax.set_ylim(int(-_maxVal) + -set_lim_offset,
+                    int(_maxVal) + set_lim_offset)
+        ax.set_zlim(int(-_maxVal) + -set_lim_offset,
+                    int(_maxVal) + set_lim_offset)
+
+        ax.set_xscale('linear')
+        ax.set_yscale('linear')
+
+        # set angles/elevations
+        ax.view_init(elev=elev, azim=azim)
+
+        return [dict(item) for item in plan['plot_summary']]
+
+    def render(self, file=None, format=None, canvas=None, elev=None, azim=None,
+               display_legend=True, dpi=100, pixel_width=800, pixel_height=600,
+               bg_color='#090A0B'):
+        '''
+        Render the compound offscreen (Agg, no display needed)
+
+        Parameters
+        ----------
+        file: str | file-like
+            image path or buffer (default None: return bytes)
+        format: str
+            png, svg, ... (default: file extension, png for bytes)
+        canvas: RenderCanvas
+            reused figure/axes (default: a new canvas closed after saving)
+        elev: int
+            elevation of the view angle
+        azim: int
+            azimuthal angle of the view angle
+        display_legend: bool
+            display legend
+        dpi: int
+            dots per inch (new canvas)
+        pixel_width: int
+            width of the image in pixels (new canvas)
+        pixel_height: int
+            height of the image in pixels (new canvas)
+        bg_color: str
+            background color (new canvas)
+
+        Returns
+        -------
+        res: bytes | None
+            image content if file is None
+        '''
+        # canvas
+        _canvas = canvas if canvas is not None else RenderCanvas(
+            pixel_width=pixel_width, pixel_height=pixel_height, dpi=dpi, bg_color=bg_color)
+        try:
+            # remove the previous compound
+            _canvas.clear()
+            # draw
+            self.draw3d(_canvas.ax, elev=elev, azim=azim,
+                        display_legend=display_legend)
+            # save
+            return _canvas.save(file, format=format)
+        finally:
+            # own canvas
+            if canvas is None:
+                _canvas.close()
+
+    def __draw_plan(self, ax, plan):
+        '''
+        Draw atoms as one Path3DCollection and bond lines as one Line3DCollection
+
+        Parameters
+        ----------
+        ax: Axes3D
+            3d axes
+        plan: dict
+            render plan (prepare_render)
+
+        Returns
+        -------
+        legend_handles: list
+            legend entries (one per element)
+        '''
+        # marker edgecolor
+        marker_edgecolor = str('#5C5C5C')
+
+        # *** atom visualization
+        ax.scatter3D(self.xyzList[:, 0], self.xyzList[:, 1], self.xyzList[:, 2],
+                     s=plan['atom_sizes'], c=plan['atom_colors'],
+                     edgecolors=marker_edgecolor, depthshade=False, zorder=2)
+
+        # legend (proxy markers, scatter size is an area)
+        legend_handles = [Line2D([], [], linestyle='', marker='o', label=item,
+                                 markersize=math.sqrt(
+                                     plan['element_sizes'][item]),
+                                 markerfacecolor=plan['element_colors'][item],
+                                 markeredgecolor=marker_edgecolor)
+                          for item in plan['elements']]
+
+        # *** bond visualization
+        if len(plan['segments']) > 0:
+            ax.add_collection3d(Line3DCollection(
+                plan['segments'], colors=plan['segment_colors'],
+                linewidths=plan['segment_widths'], zorder=1))
+
+        # bonds behind atoms (two collections cannot be depth sorted
+        # against each other, view3d(batched=False) keeps per-artist order)
+        ax.computed_zorder = False
+
+        return legend_handles
+
+    def view3dobs(self, elev=None, azim=None, figSize=(10, 10), obsOption=[True, 0],
+                  return_figure=False):
         '''
         Draw a compound in the cartesian coordinate with observer
 
@@ -947,6 +1032,13 @@ class Vizr3D():
             figure size
         obsOption : list
             [True, 0] --> show observer, 0 --> observer radius
+        return_figure : bool
+            if True, return the figure
+
+        Returns
+        -------
+        fig : figure
+            figure if return_figure is True, otherwise None
         '''
         # 3d plot
         fig = plt.figure(figsize=figSize)
@@ -1026,6 +1118,9 @@ class Vizr3D():
         ax.view_init(elev=elev, azim=azim)
         plt.show()
 
+        if return_figure:
+            return fig
+
     def create_line(self, xyzList1, xyzList2, t=1):
         '''
         Create a line equation and its parallel lines
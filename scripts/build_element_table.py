@@ -0,0 +1,23 @@
+# BUILD ELEMENT TABLE
+# ---------------------
+# rebuild molvizr3d/data/PubChemElements_all.npz from the csv files
+# (run after editing PubChemElements_all.csv or MonoisotopicMass.csv,
+# before packaging), usage: python scripts/build_element_table.py [--force]
+
+# import libs
+import os
+import sys
+
+# package root
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from molvizr3d.docs.elementstore import ElementStore
+
+
+if __name__ == '__main__':
+    # check
+    force = '--force' in sys.argv[1:]
+    stale = ElementStore.table_is_stale()
+    tablePath = ElementStore.build_table(force=force)
+    print(f"{tablePath}: {'rebuilt' if (stale or force) else 'up to date'}")
@@ -22,6 +22,7 @@ setup(
     long_description_content_type="text/markdown",
     long_description=long_description,
     packages=find_packages(exclude=['tests', '*.tests', '*.tests.*']),
+    package_data={'molvizr3d': ['data/*.csv', 'data/*.npz']},
     license='MIT',
     install_requires=['pandas', 'pillow', 'requests',
                       'urllib3', 'matplotlib', 'PubChemQuery', 'numpy'],
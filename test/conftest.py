@@ -0,0 +1,123 @@
+
+# TEST FIXTURES
+# ---------------
+
+# import libs
+import os
+import sys
+import glob
+import json
+import numpy as np
+import pytest
+
+# package root
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TEST_DIR))
+
+# offscreen backend (view3d tests)
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+
+# sdf files of the test folder
+SDF_FILES = sorted(glob.glob(os.path.join(TEST_DIR, '*.sdf')))
+# baseline outputs (parser/renderer before the vectorized rewrite)
+BASELINE_PATH = os.path.join(TEST_DIR, 'data', 'baseline.json')
+
+
+def jsonable(value):
+    '''
+    Convert parse results to json values (numpy arrays, tuples, LazyDict)
+    '''
+    if isinstance(value, np.ndarray):
+        return jsonable(value.tolist())
+    if isinstance(value, dict):
+        return {str(k): jsonable(v) for k, v in dict(value).items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def read_sdf_table(filePath):
+    '''
+    Atoms and bonds of a V2000 sdf file (plain text reader, no package code)
+
+    Returns
+    -------
+    res : tuple
+        cid, symbols, xyz (N,3), bonds [(atom1, atom2, type)]
+    '''
+    with open(filePath, 'r') as f:
+        lines = f.read().splitlines()
+    # counts line
+    atomNo = int(lines[3][0:3])
+    bondNo = int(lines[3][3:6])
+    # atoms
+    symbols = []
+    xyz = []
+    for line in lines[4:4+atomNo]:
+        xyz.append([float(line[0:10]), float(line[10:20]), float(line[20:30])])
+        symbols.append(line[31:34].strip())
+    # bonds
+    bonds = []
+    for line in lines[4+atomNo:4+atomNo+bondNo]:
+        bonds.append((int(line[0:3]), int(line[3:6]), int(line[6:9])))
+    return lines[0].strip(), symbols, np.array(xyz), bonds
+
+
+def pubchem_json(filePath, conformers=2):
+    '''
+    PubChem json record of a sdf file, conformer k is shifted by k along x
+    '''
+    cid, symbols, xyz, bonds = read_sdf_table(filePath)
+    # atomic numbers (symbols of the test files)
+    atomicNumbers = {'H': 1, 'C': 6, 'N': 7, 'O': 8, 'F': 9, 'P': 15,
+                     'S': 16, 'Cl': 17, 'Br': 35, 'I': 53}
+    atomIds = list(range(1, len(symbols)+1))
+    return {'PC_Compounds': [{
+        'id': {'id': {'cid': int(cid)}},
+        'atoms': {'aid': atomIds, 'element': [atomicNumbers[item] for item in symbols]},
+        'bonds': {'aid1': [item[0] for item in bonds],
+                  'aid2': [item[1] for item in bonds],
+                  'order': [item[2] for item in bonds]},
+        'coords': [{'type': [2, 5, 10], 'aid': atomIds,
+                    'conformers': [{'x': (xyz[:, 0]+k).tolist(),
+                                    'y': xyz[:, 1].tolist(),
+                                    'z': xyz[:, 2].tolist()}
+                                   for k in range(conformers)]}],
+        'charge': 0,
+        'props': [{'urn': {'label': 'IUPAC Name'}, 'value': {'sval': f'cid {cid}'}},
+                  {'urn': {'label': 'Molecular Formula'}, 'value': {'sval': 'x'}},
+                  {'urn': {'label': 'Molecular Weight'}, 'value': {'sval': '10.5'}}],
+        'count': {'heavy_atom': 1}
+    }]}
+
+
+@pytest.fixture(scope='session')
+def baseline():
+    '''
+    baseline outputs: sdf/json parse results (file name -> values),
+    element properties
+    '''
+    with open(BASELINE_PATH, 'r') as f:
+        return json.load(f)
+
+
+@pytest.fixture(params=SDF_FILES, ids=os.path.basename)
+def sdf_file(request):
+    return request.param
+
+
+@pytest.fixture
+def multi_sdf(tmp_path):
+    '''
+    multi-record sdf file of all test sdf files (file order)
+    '''
+    filePath = tmp_path / 'library.sdf'
+    with open(filePath, 'wb') as f:
+        for item in SDF_FILES:
+            with open(item, 'rb') as g:
+                content = g.read()
+            f.write(content if content.endswith(b'\n') else content + b'\n')
+    return str(filePath)
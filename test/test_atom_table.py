@@ -0,0 +1,62 @@
+
+# COLUMNAR ATOM TABLE
+# ---------------------
+
+# import libs
+import os
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser, Compound
+from molvizr3d.docs.atomtable import AtomTable
+from conftest import jsonable, pubchem_json
+
+
+def test_eager_result_keeps_baseline_key_order(sdf_file, baseline):
+    res = MolParser(sdf_file).read_file()
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    assert type(res) is dict
+    # baseline keys first, then the columnar keys
+    assert list(res)[:len(ref['_keys'])] == ref['_keys']
+    assert list(res)[len(ref['_keys']):] == ['atom_table', 'bond_matrix']
+
+
+def test_atom_table_matches_baseline(sdf_file, baseline):
+    res = MolParser(sdf_file).read_file()
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+    atomTable = res['atom_table']
+
+    assert len(atomTable) == ref['atom_numbers']
+    assert atomTable.xyz.tolist() == ref['xyz_list']
+    assert atomTable.symbols == ref['atom_elements']
+    assert atomTable.ids.tolist() == list(range(1, len(atomTable)+1))
+    assert jsonable(atomTable.atom_block()) == ref['atom_block']
+
+
+def test_json_atom_table_matches_baseline(sdf_file, baseline):
+    res = MolParser(None).json_parser(pubchem_json(sdf_file))
+    ref = baseline['json'][os.path.basename(sdf_file)]
+
+    assert res['atom_table'].xyz.tolist() == ref['xyz_list']
+    assert res['atom_table'].symbols == ref['atom_elements']
+    assert res['atom_table'].atomic_number.tolist() == ref['atom_atomic_number']
+
+
+def test_compound_atom_block_matches_baseline(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    assert jsonable(compound.atom_block) == ref['atom_block']
+
+
+def test_atom_table_from_symbols():
+    atomTable = AtomTable.from_symbols([' C', 'H', 'Xx'], np.zeros((3, 3)))
+
+    assert atomTable.atomic_number.tolist() == [6, 1, 0]
+    assert atomTable.symbols == ['C', 'H', 'Xx']
+    assert atomTable.atom_block(start=0)[2]['index'] == 2
+
+
+def test_atom_table_column_sizes():
+    with pytest.raises(Exception, match='same size'):
+        AtomTable(np.zeros((3, 3)), [6, 1])
@@ -0,0 +1,72 @@
+
+# BOND PERCEPTION
+# -----------------
+
+# import libs
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser, Compound
+from molvizr3d.docs.bondperception import BondPerception
+from molvizr3d.docs.atomtable import AtomTable
+from conftest import read_sdf_table
+
+
+def xyz_record(symbols, xyz):
+    lines = [str(len(symbols)), 'test']
+    lines += [f'{symbol} {x!r} {y!r} {z!r}' for symbol, (x, y, z) in zip(symbols, xyz.tolist())]
+    return '\n'.join(lines) + '\n'
+
+
+def test_perceived_bonds_match_bond_table(sdf_file):
+    _, symbols, xyz, bonds = read_sdf_table(sdf_file)
+    bondMatrix = BondPerception.perceive(xyz, symbols)
+
+    assert bondMatrix.tolist() == sorted([sorted(item[0:2]) + [1] for item in bonds])
+    # atom table input
+    assert np.array_equal(
+        BondPerception.perceive(xyz, AtomTable.from_symbols(symbols, xyz)), bondMatrix)
+
+
+def test_xyz_parser_perceives_bonds(sdf_file):
+    _, symbols, xyz, bonds = read_sdf_table(sdf_file)
+    res = MolParser(None).xyz_parser(xyz_record(symbols, xyz))
+
+    assert res['bond_numbers'] == len(bonds)
+    assert res['atom_elements'] == symbols
+    # drawn like the sdf file (bond types are single)
+    plan = Compound(res).prepare_render()
+    assert sorted(map(sorted, plan['bond_index'].tolist())) == \
+        sorted(sorted([item[0]-1, item[1]-1]) for item in bonds)
+
+
+def test_sdf_without_bonds_is_kept():
+    record = """x
+  test
+
+  2  0  0     0  0  0  0  0  0999 V2000
+    0.0000    0.0000    0.0000 C   0  0  0  0  0  0  0  0  0  0  0  0
+    1.2000    0.0000    0.0000 O   0  0  0  0  0  0  0  0  0  0  0  0
+M  END
+$$$$
+"""
+    assert MolParser(None).sdf_parser(record)['bond_numbers'] == 0
+    res = MolParser(None).sdf_parser(record, perceive_bonds=True)
+    assert res['bond_numbers'] == 1
+    assert res['bond_block'][0]['bonds'] == [(2, 'O', 'CO', 1)]
+
+
+@pytest.mark.parametrize('xyz, bondNo', [
+    (np.zeros((0, 3)), 0),
+    (np.zeros((1, 3)), 0),
+    # far apart
+    (np.array([[0, 0, 0], [10, 0, 0]]), 0),
+])
+def test_small_inputs(xyz, bondNo):
+    assert BondPerception.perceive(xyz, ['C']*len(xyz)).shape == (bondNo, 3)
+
+
+def test_unknown_element_radius():
+    radii = BondPerception.atom_radii([6, 0], default_radius=150.0)
+
+    assert radii[1] == 1.5
+    assert radii[0] > 0
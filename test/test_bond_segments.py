@@ -0,0 +1,94 @@
+
+# BOND SEGMENTS
+# ---------------
+
+# import libs
+import os
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser, Compound
+from molvizr3d.docs.vizr3d import Vizr3D
+
+
+def test_bond_segments_match_baseline(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]['_bond_lines']
+
+    bondIndex, bondTypes = compound.bond_table()
+    segments, lengths, segmentBond = Vizr3D.bond_segments(
+        compound.xyzList, bondIndex, bondTypes)
+
+    # lines of each bond in bond block order
+    assert np.transpose(segments, (0, 2, 1)).tolist() == \
+        [line for item in ref for line in item[0]]
+    assert np.allclose(lengths, [value for item in ref for value in item[2]])
+    assert segmentBond.tolist() == \
+        [i for i, item in enumerate(ref) for _ in item[0]]
+
+
+def test_create_bond_line_matches_baseline(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]['_bond_lines']
+
+    bondIndex, bondTypes = compound.bond_table()
+    for (a, b), t, item in zip(bondIndex, bondTypes, ref):
+        bondLines, bondType, bondLength = compound.create_bond_line(
+            compound.xyzList[a], compound.xyzList[b], int(t))
+        assert bondLines == item[0]
+        assert bondType == item[1]
+        assert np.allclose(bondLength, item[2])
+
+
+@pytest.mark.parametrize('bondType', [1, 2, 3])
+def test_bond_parallel_to_z(bondType):
+    xyz = [[1.0, 2.0, 0.0], [1.0, 2.0, 1.5]]
+    segments, lengths, _ = Vizr3D.bond_segments(xyz, [[0, 1]], [bondType])
+
+    assert segments.shape == (bondType, 2, 3)
+    assert np.all(np.isfinite(segments))
+    assert np.allclose(lengths, 1.5)
+    # lines are shifted along x
+    assert np.allclose(segments[:, :, 1], 2.0)
+    assert len(set(np.round(segments[:, 0, 0], 6))) == bondType
+
+
+def test_bond_atoms_at_same_position():
+    xyz = [[0.5, 0.5, 0.5], [0.5, 0.5, 0.5]]
+    segments, lengths, _ = Vizr3D.bond_segments(xyz, [[0, 1]], [2])
+
+    assert np.all(np.isfinite(segments))
+    assert np.allclose(lengths, 0)
+
+
+def test_empty_and_unknown_bond_types():
+    xyz = np.zeros((3, 3))
+    # no bonds
+    segments, lengths, segmentBond = Vizr3D.bond_segments(
+        xyz, np.zeros((0, 2)), np.zeros(0))
+    assert segments.shape == (0, 2, 3)
+    assert lengths.shape == (0,) and segmentBond.shape == (0,)
+    # bond types without lines (aromatic, unknown)
+    segments, _, _ = Vizr3D.bond_segments(
+        [[0, 0, 0], [1, 0, 0]], [[0, 1], [0, 1]], [0, 4])
+    assert segments.shape == (0, 2, 3)
+
+
+@pytest.mark.parametrize('bondType', [1, 2, 3])
+def test_create_bond_line_v2_halves(sdf_file, bondType):
+    compound = Compound(MolParser(sdf_file).read_file())
+    xyz1, xyz2 = compound.xyzList[0], compound.xyzList[1]
+
+    lines, _, _ = compound.create_bond_line(xyz1, xyz2, bondType)
+    halves, resType = compound.create_bond_line_V2(xyz1, xyz2, bondType)
+
+    assert resType == bondType
+    assert len(halves) == 2*len(lines)
+    for line, first, second in zip(lines, halves[0::2], halves[1::2]):
+        line = np.array(line)
+        first = np.array(first)
+        second = np.array(second)
+        # atom 1 half, atom 2 half meeting at the midpoint
+        assert np.allclose(first[:, 0], line[:, 0])
+        assert np.allclose(second[:, 1], line[:, 1])
+        assert np.allclose(first[:, 1], line.mean(axis=1))
+        assert np.allclose(second[:, 0], line.mean(axis=1))
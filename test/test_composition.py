@@ -0,0 +1,63 @@
+
+# ELEMENTAL COMPOSITION
+# -----------------------
+
+# import libs
+import os
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser
+from molvizr3d.docs.composition import Composition
+from conftest import SDF_FILES
+
+
+def test_average_mass_matches_baseline(sdf_file, baseline):
+    res = MolParser(sdf_file).read_file()
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    for atoms in (res['atom_elements'], res['atom_table'],
+                  res['atom_table'].atomic_number):
+        assert Composition(atoms).average_mass == \
+            pytest.approx(ref['_molecular_mass'], rel=1e-12)
+
+
+@pytest.mark.parametrize('atoms, formula, counts', [
+    (['O', 'C', 'H', 'H', 'H', 'H'], 'CH4O', {'C': 1, 'H': 4, 'O': 1}),
+    (['H', 'O', 'H'], 'H2O', {'H': 2, 'O': 1}),
+    (['Na', 'Cl'], 'ClNa', {'Cl': 1, 'Na': 1}),
+    ([8, 1, 1], 'H2O', {'H': 2, 'O': 1}),
+    ([], '', {}),
+])
+def test_formula_hill_order(atoms, formula, counts):
+    composition = Composition(atoms)
+
+    assert composition.formula == formula
+    assert composition.counts == counts
+    assert list(composition.counts) == list(counts)
+
+
+def test_water_mass():
+    composition = Composition(['H', 'H', 'O'])
+
+    assert composition.monoisotopic_mass == pytest.approx(18.010565, abs=1e-5)
+    assert composition.percentages['O'] == \
+        pytest.approx(100*15.999/composition.average_mass, rel=1e-3)
+    assert sum(composition.percentages.values()) == pytest.approx(100)
+
+
+def test_batch_matches_single_molecules():
+    molecules = [MolParser(item).read_file()['atom_elements']
+                 for item in SDF_FILES] + [[]]
+    res = Composition.batch(molecules)
+
+    assert res['counts'].shape[0] == len(molecules)
+    for i, atoms in enumerate(molecules):
+        composition = Composition(atoms)
+        assert res['formula'][i] == composition.formula
+        assert res['average_mass'][i] == composition.average_mass
+        assert int(res['counts'][i].sum()) == len(atoms)
+
+
+def test_unknown_element():
+    with pytest.raises(Exception, match='not found'):
+        Composition(['C', 'Xx'])
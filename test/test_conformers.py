@@ -0,0 +1,104 @@
+
+# CONFORMER ENSEMBLES
+# ---------------------
+
+# import libs
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser, ConformerEnsemble
+from molvizr3d.docs.compute import Compute
+from conftest import pubchem_json, read_sdf_table, SDF_FILES
+
+
+def conformer_file(tmp_path, filePath, shifts):
+    '''
+    multi-record sdf file of a molecule, record k is shifted by shifts[k]
+    along x (fixed-width atom lines)
+    '''
+    with open(filePath, 'r') as f:
+        lines = f.read().splitlines()
+    atomNo = int(lines[3][0:3])
+    records = []
+    for shift in shifts:
+        _lines = list(lines)
+        for i in range(4, 4+atomNo):
+            x = float(_lines[i][0:10]) + shift
+            _lines[i] = f'{x:10.4f}' + _lines[i][10:]
+        records.append('\n'.join(_lines) + '\n')
+    sdfPath = tmp_path / 'conformers.sdf'
+    sdfPath.write_text(''.join(records))
+    return str(sdfPath)
+
+
+def test_from_sdf(tmp_path, sdf_file):
+    shifts = [0.0, 1.0, -2.5, 0.25]
+    ensemble = ConformerEnsemble.from_sdf(conformer_file(tmp_path, sdf_file, shifts))
+    _, symbols, xyz, _ = read_sdf_table(sdf_file)
+
+    assert len(ensemble) == len(shifts)
+    assert ensemble.xyz.shape == (len(shifts), len(symbols), 3)
+    for k, shift in enumerate(shifts):
+        assert np.allclose(ensemble.xyz[k], xyz + [shift, 0, 0], atol=1e-9)
+        assert np.array_equal(ensemble.conformer(k).xyzList, ensemble.xyz[k])
+    # translations only
+    assert np.allclose(ensemble.bond_lengths(), ensemble.bond_lengths()[0])
+    assert np.allclose(ensemble.rmsd(), 0)
+    assert len(ensemble.conformer_properties) == len(shifts)
+
+
+def test_from_sdf_skip_limit(tmp_path):
+    sdfPath = conformer_file(tmp_path, SDF_FILES[0], [0.0, 1.0, 2.0])
+    ensemble = ConformerEnsemble.from_sdf(sdfPath, skip=1, limit=1)
+
+    # K=1 stack
+    assert ensemble.xyz.shape[0] == 1
+    assert ensemble.distance_matrix().shape == (1,) + (ensemble.atom_numbers,)*2
+    assert ensemble.bond_lengths().shape == (1, len(ensemble.bond_index))
+    assert np.allclose(ensemble.xyz[0], ConformerEnsemble.from_sdf(sdfPath).xyz[1])
+
+
+def test_from_sdf_topology_check(tmp_path, multi_sdf):
+    with pytest.raises(Exception, match='same topology'):
+        ConformerEnsemble.from_sdf(multi_sdf)
+
+
+def test_from_json(sdf_file):
+    jsonSource = pubchem_json(sdf_file, conformers=3)
+    ensemble = ConformerEnsemble.from_json(jsonSource)
+    res = MolParser(None).json_parser(jsonSource)
+
+    assert ensemble.xyz.shape == (3, res['atom_numbers'], 3)
+    # atom order of json_parser
+    assert np.array_equal(ensemble.xyz[0], res['xyz_list'])
+    for k in range(3):
+        assert np.allclose(ensemble.xyz[k], res['xyz_list'] + [k, 0, 0])
+
+
+@pytest.mark.parametrize('method', ['direct', 'gemm'])
+def test_distance_matrix_stack(tmp_path, method):
+    ensemble = ConformerEnsemble.from_sdf(
+        conformer_file(tmp_path, SDF_FILES[3], [0.0, 3.0]))
+    stack = np.concatenate((ensemble.xyz, ensemble.xyz[:, ::-1]))
+
+    full = Compute.atoms_distance_matrix(stack, method=method, block_size=5)
+    condensed = Compute.atoms_distance_matrix(stack, condensed=True, method=method)
+    for k in range(len(stack)):
+        assert np.allclose(full[k], Compute.atoms_distance_matrix(stack[k], method=method),
+                           rtol=1e-12, atol=1e-12)
+        assert np.allclose(condensed[k], full[k][np.triu_indices(stack.shape[1], 1)],
+                           rtol=1e-12, atol=1e-12)
+    # K=1
+    assert np.array_equal(Compute.atoms_distance_matrix(stack[:1], method=method)[0],
+                          Compute.atoms_distance_matrix(stack[0], method=method))
+
+
+def test_stack_checks(sdf_file):
+    res = MolParser(sdf_file).read_file()
+
+    # (N,3) input: K=1
+    assert ConformerEnsemble(res, res['xyz_list']).xyz.shape == (1, res['atom_numbers'], 3)
+    # integer coordinates are converted
+    assert ConformerEnsemble(res, np.zeros((2, res['atom_numbers'], 3), dtype=int)).xyz.dtype == \
+        np.float64
+    with pytest.raises(Exception, match='atom number'):
+        ConformerEnsemble(res, np.zeros((2, res['atom_numbers']+1, 3)))
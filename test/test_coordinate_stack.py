@@ -0,0 +1,73 @@
+
+# MEMORY-MAPPED COORDINATE STACKS
+# ---------------------------------
+
+# import libs
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser, Compound, ConformerEnsemble
+from molvizr3d.docs.utility import Utility
+from conftest import SDF_FILES
+
+
+@pytest.fixture
+def ensemble():
+    res = MolParser(SDF_FILES[4]).read_file()
+    rng = np.random.default_rng(2)
+    xyzStack = res['xyz_list'] + rng.normal(scale=0.1, size=(5,) + res['xyz_list'].shape)
+    return ConformerEnsemble(res, xyzStack)
+
+
+def test_save_load_roundtrip(tmp_path, ensemble):
+    filePath = ensemble.save('stack', location=str(tmp_path))
+
+    for mmap in (True, False):
+        loaded = ConformerEnsemble.from_npy(ensemble.compound, filePath, mmap=mmap)
+        # memory-mapped stacks are used without copy (read-only)
+        assert loaded.xyz.flags.writeable != mmap
+        assert np.array_equal(loaded.xyz, ensemble.xyz)
+        assert np.array_equal(loaded.bond_lengths(), ensemble.bond_lengths())
+        assert np.array_equal(loaded.conformer(3).xyzList, ensemble.xyz[3])
+
+
+def test_memmap_is_read_only(tmp_path, ensemble):
+    loaded = ConformerEnsemble.from_npy(
+        ensemble.parse_prop, ensemble.save('stack', location=str(tmp_path)))
+
+    with pytest.raises(ValueError):
+        loaded.xyz[0, 0, 0] = 1.0
+    # conformer frames are copies
+    compound = loaded.conformer(0)
+    assert isinstance(compound, Compound)
+    assert compound.xyzList.flags.writeable
+
+
+def test_dtype_is_kept(tmp_path, ensemble):
+    stack32 = ensemble.xyz.astype(np.float32)
+    filePath = Utility.SaveCoordinateStack(stack32, 'stack32', location=str(tmp_path))
+    loaded = ConformerEnsemble.from_npy(ensemble.compound, filePath)
+
+    assert loaded.xyz.dtype == np.float32
+    assert np.array_equal(loaded.xyz, stack32)
+    # saved again from the float32 memmap
+    filePath = loaded.save('again', location=str(tmp_path))
+    assert Utility.LoadCoordinateStack(filePath).dtype == np.float32
+
+
+def test_frames_from_a_generator(tmp_path, ensemble):
+    frames = (item for item in ensemble.xyz)
+    filePath = Utility.SaveCoordinateStack(frames, 'frames', location=str(tmp_path),
+                                           frame_number=len(ensemble))
+
+    assert np.array_equal(Utility.LoadCoordinateStack(filePath), ensemble.xyz)
+    with pytest.raises(Exception, match='less frames'):
+        Utility.SaveCoordinateStack(iter(ensemble.xyz[:2]), 'short', location=str(tmp_path),
+                                    frame_number=3)
+
+
+def test_not_a_stack(tmp_path):
+    filePath = str(tmp_path / 'flat.npy')
+    np.save(filePath, np.zeros((4, 3)))
+
+    with pytest.raises(Exception, match='coordinate stack'):
+        Utility.LoadCoordinateStack(filePath)
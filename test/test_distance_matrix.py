@@ -0,0 +1,75 @@
+
+# DISTANCE MATRIX
+# -----------------
+
+# import libs
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser
+from molvizr3d.docs.compute import Compute
+
+
+def reference_matrix(xyzList):
+    '''
+    distance matrix (atom pair loop)
+    '''
+    atomNo = len(xyzList)
+    res = np.zeros((atomNo, atomNo))
+    for i in range(atomNo):
+        for j in range(atomNo):
+            if i != j:
+                res[i, j] = np.linalg.norm(xyzList[i] - xyzList[j])
+    return res
+
+
+@pytest.fixture(scope='module')
+def random_xyz():
+    return np.random.default_rng(0).normal(size=(60, 3)) * 5
+
+
+def test_distance_matrix_matches_reference(sdf_file):
+    res = MolParser(sdf_file).read_file()
+    ref = reference_matrix(res['xyz_list'])
+
+    for method in ('auto', 'direct', 'gemm'):
+        full = Compute.atoms_distance_matrix(
+            res['xyz_list'], res['atom_elements'], method=method)
+        assert np.allclose(full, ref, rtol=1e-12, atol=1e-12), method
+        assert np.array_equal(full, full.T)
+        assert np.all(np.diag(full) == 0)
+
+
+@pytest.mark.parametrize('method', ['direct', 'gemm'])
+@pytest.mark.parametrize('block_size', [1, 7, 60, 1000])
+def test_blocks_and_condensed(random_xyz, method, block_size):
+    ref = reference_matrix(random_xyz)
+    full = Compute.atoms_distance_matrix(
+        random_xyz, method=method, block_size=block_size)
+    condensed = Compute.atoms_distance_matrix(
+        random_xyz, condensed=True, method=method, block_size=block_size)
+
+    assert np.allclose(full, ref, rtol=1e-12, atol=1e-12)
+    # upper triangle, row by row
+    assert np.array_equal(condensed, full[np.triu_indices(len(random_xyz), 1)])
+
+
+def test_atom_subset_and_dtype(random_xyz):
+    res = Compute.atoms_distance_matrix(random_xyz, ['C']*10, dtype=np.float32)
+
+    assert res.shape == (10, 10)
+    assert res.dtype == np.float32
+    assert np.allclose(res, reference_matrix(random_xyz[:10]), rtol=1e-6)
+
+
+@pytest.mark.parametrize('atomNo', [0, 1, 2])
+def test_small_structures(atomNo):
+    xyzList = np.arange(atomNo*3, dtype=np.float64).reshape(atomNo, 3)
+
+    assert Compute.atoms_distance_matrix(xyzList).shape == (atomNo, atomNo)
+    assert Compute.atoms_distance_matrix(xyzList, condensed=True).shape == \
+        (atomNo*(atomNo-1)//2,)
+
+
+def test_invalid_method(random_xyz):
+    with pytest.raises(Exception, match='method'):
+        Compute.atoms_distance_matrix(random_xyz, method='fast')
@@ -0,0 +1,44 @@
+
+# BATCH ELEMENT LOOKUP
+# ----------------------
+
+# import libs
+import os
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser
+from molvizr3d.docs.element import Element
+from molvizr3d.docs.compute import CalculateMolecularMass
+from conftest import jsonable
+
+PROPERTIES = ['Symbol', 'AtomicMass', 'AtomicRadius', 'CPKHexColor']
+
+
+def test_find_atoms_matches_baseline(baseline):
+    symbols = list(baseline['elements']) * 2
+    atomicNumbers = [baseline['elements'][item]['AtomicNumber'] for item in symbols]
+
+    for atoms in (symbols, np.array(atomicNumbers)):
+        res = Element().find_atoms(atoms, PROPERTIES)
+        for item in PROPERTIES:
+            assert jsonable(res[item]) == \
+                [baseline['elements'][symbol][item] for symbol in symbols], item
+
+
+def test_find_atoms_empty():
+    res = Element().find_atoms([], ['AtomicMass'])
+
+    assert len(res['AtomicMass']) == 0
+
+
+def test_find_atoms_unknown_element():
+    with pytest.raises(Exception, match='not found'):
+        Element().find_atoms(['C', 'Xx'])
+
+
+def test_molecular_mass_matches_baseline(sdf_file, baseline):
+    res = MolParser(sdf_file).read_file()
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    assert CalculateMolecularMass(res['atom_elements']) == \
+        pytest.approx(ref['_molecular_mass'], rel=1e-12)
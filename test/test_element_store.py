@@ -0,0 +1,49 @@
+
+# ELEMENT STORE
+# ---------------
+
+# import libs
+import pytest
+from molvizr3d.docs.element import Element
+from molvizr3d.docs.elementstore import ElementStore
+from conftest import jsonable
+
+PROPERTIES = ['Symbol', 'AtomicNumber', 'AtomicMass', 'AtomicRadius', 'CPKHexColor']
+
+
+def test_store_is_shared():
+    assert ElementStore.get_instance() is ElementStore.get_instance()
+    assert Element('C')._store is Element('O')._store
+
+
+def test_atom_properties_match_baseline(baseline):
+    ElementC = Element()
+    for symbol, ref in baseline['elements'].items():
+        assert jsonable(ElementC.atom_properties(symbol, PROPERTIES)) == ref
+        # single property
+        for item in PROPERTIES:
+            assert jsonable(ElementC.atom_properties(f' {symbol} ', [item])) == \
+                {item: ref[item]}
+
+
+def test_find_atom_by_property(baseline):
+    res = Element().find_atom_by_property('AtomicNumber', [6, 8, 26])
+
+    assert [item['symbol'] for item in res] == ['C', 'O', 'Fe']
+    assert [item['AtomicNumber'] for item in res] == [6, 8, 26]
+
+
+def test_find_atom_rows():
+    ElementC = Element('N')
+
+    assert ElementC.properties()['Symbol'].tolist() == ['N']
+    assert len(ElementC.find_atom('Xx')) == 0
+
+
+def test_unknown_element():
+    with pytest.raises(Exception, match='not found'):
+        Element().atom_properties('Xx', ['AtomicMass'])
+    with pytest.raises(Exception, match='not found'):
+        Element().find_atom_by_property('AtomicNumber', [500])
+    with pytest.raises(Exception, match='empty'):
+        Element().atom_properties('C', [])
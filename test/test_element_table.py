@@ -0,0 +1,100 @@
+
+# PRECOMPILED ELEMENT TABLE
+# ---------------------------
+
+# import libs
+import os
+import sys
+import json
+import shutil
+import subprocess
+import numpy as np
+from molvizr3d.docs.elementstore import ElementStore
+from conftest import TEST_DIR
+
+# package directory
+PACKAGE_DIR = os.path.join(os.path.dirname(TEST_DIR), 'molvizr3d')
+
+# lookups of a fresh process (copied package)
+LOOKUP_SCRIPT = """
+import json
+from molvizr3d.docs.elementstore import ElementStore
+store = ElementStore.get_instance()
+print(json.dumps({
+    'mass': store.column('AtomicMass').astype(float).tolist(),
+    'symbols': [str(item) for item in store.column('Symbol').tolist()],
+    'colors': [str(item) for item in store.column('CPKHexColor').tolist()],
+    'monoisotopic': [None if item != item else item
+                     for item in store.monoisotopic_mass.tolist()]
+}))
+"""
+
+
+def snapshot(dirPath):
+    '''
+    files and modification times of a directory tree
+    '''
+    return {os.path.relpath(os.path.join(root, item), dirPath):
+            os.path.getmtime(os.path.join(root, item))
+            for root, _, files in os.walk(dirPath) for item in files}
+
+
+def copy_package(tmp_path):
+    targetDir = tmp_path / 'site' / 'molvizr3d'
+    shutil.copytree(PACKAGE_DIR, targetDir,
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    return targetDir
+
+
+def run_lookups(packageDir):
+    res = subprocess.run(
+        [sys.executable, '-c', LOOKUP_SCRIPT], capture_output=True, text=True,
+        cwd=str(packageDir.parent),
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1',
+             'PYTHONPATH': str(packageDir.parent)})
+    assert res.returncode == 0, res.stderr
+    return json.loads(res.stdout)
+
+
+def test_shipped_table_is_up_to_date():
+    assert not ElementStore.table_is_stale()
+
+
+def test_read_only_install_writes_nothing(tmp_path):
+    packageDir = copy_package(tmp_path)
+    before = snapshot(packageDir)
+    # read-only data directory (a site-packages install)
+    dataDir = packageDir / 'data'
+    for item in dataDir.iterdir():
+        item.chmod(0o444)
+    dataDir.chmod(0o555)
+    try:
+        res = run_lookups(packageDir)
+    finally:
+        dataDir.chmod(0o755)
+
+    assert snapshot(packageDir) == before
+    assert res['symbols'][5] == 'C'
+
+
+def test_missing_table_is_built_in_memory(tmp_path):
+    packageDir = copy_package(tmp_path)
+    tablePath = packageDir / 'data' / 'PubChemElements_all.npz'
+    shipped = run_lookups(packageDir)
+    os.remove(tablePath)
+
+    res = run_lookups(packageDir)
+    # not saved at runtime
+    assert not tablePath.exists()
+    # same values as the shipped table
+    assert res == shipped
+
+
+def test_store_columns_match_csv():
+    store = ElementStore.get_instance()
+    frame = store.frame
+
+    assert np.array_equal(store.column('AtomicNumber'),
+                          frame['AtomicNumber'].to_numpy())
+    assert np.array_equal(store.column('AtomicMass'),
+                          frame['AtomicMass'].to_numpy())
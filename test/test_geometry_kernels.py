@@ -0,0 +1,110 @@
+
+# GEOMETRY KERNELS
+# ------------------
+
+# import libs
+import itertools
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser, Compound
+from molvizr3d.docs.compute import Compute
+
+
+def reference_angle(a, b, c):
+    u = a - b
+    v = c - b
+    return np.degrees(np.arccos(np.clip(
+        np.dot(u, v)/(np.linalg.norm(u)*np.linalg.norm(v)), -1, 1)))
+
+
+def reference_dihedral(a, b, c, d):
+    # signed angle between the planes a-b-c and b-c-d (IUPAC sign)
+    b1, b2, b3 = b - a, c - b, d - c
+    n1 = np.cross(b1, b2)
+    n2 = np.cross(b2, b3)
+    return np.degrees(np.arctan2(np.dot(np.cross(n1, n2), b2/np.linalg.norm(b2)),
+                                 np.dot(n1, n2)))
+
+
+def molecule(filePath):
+    compound = Compound(MolParser(filePath).read_file())
+    return compound.xyzList, compound.bond_index
+
+
+def test_bond_lengths(sdf_file):
+    xyz, pairs = molecule(sdf_file)
+    res = Compute.bond_lengths(xyz, pairs)
+
+    assert np.allclose(res, [np.linalg.norm(xyz[j]-xyz[i]) for i, j in pairs], rtol=1e-14)
+
+
+def test_angle_index_and_angles(sdf_file):
+    xyz, pairs = molecule(sdf_file)
+    triples = Compute.angle_index(pairs)
+
+    # all i-j-k with i, k bonded to j, i < k
+    bonded = {frozenset(item) for item in pairs.tolist()}
+    ref = sorted((i, j, k) for j in range(len(xyz))
+                 for i, k in itertools.combinations(range(len(xyz)), 2)
+                 if {i, j} in bonded and {j, k} in bonded)
+    assert sorted(map(tuple, triples.tolist())) == ref
+
+    res = Compute.bond_angles(xyz, triples)
+    assert np.allclose(res, [reference_angle(*xyz[item]) for item in triples], atol=1e-9)
+
+
+def test_dihedral_index_and_angles(sdf_file):
+    xyz, pairs = molecule(sdf_file)
+    quads = Compute.dihedral_index(pairs)
+
+    bonded = {frozenset(item) for item in pairs.tolist()}
+    ref = sorted((i, j, k, l) for j, k in pairs.tolist() + [p[::-1] for p in pairs.tolist()]
+                 if j < k
+                 for i in range(len(xyz)) for l in range(len(xyz))
+                 if {i, j} in bonded and {k, l} in bonded and len({i, j, k, l}) == 4)
+    assert sorted(map(tuple, quads.tolist())) == ref
+
+    res = Compute.dihedral_angles(xyz, quads)
+    assert np.allclose(res, [reference_dihedral(*xyz[item]) for item in quads], atol=1e-9)
+
+
+@pytest.mark.parametrize('d, angle', [
+    ([1, -1, 0], 180.0), ([1, 1, 0], 0.0), ([1, 0, 1], 90.0), ([1, 0, -1], -90.0)])
+def test_dihedral_sign(d, angle):
+    xyz = np.array([[0, 1, 0], [0, 0, 0], [1, 0, 0], d], dtype=np.float64)
+
+    assert Compute.dihedral_angles(xyz, [[0, 1, 2, 3]])[0] == pytest.approx(angle)
+
+
+def test_angles_near_0_and_180():
+    xyz = np.array([[-1, 0, 0], [0, 0, 0], [1, 1e-9, 0], [1, -1e-9, 0]])
+    res = Compute.bond_angles(xyz, [[0, 1, 2], [2, 1, 3]])
+
+    assert res[0] == pytest.approx(180 - np.degrees(1e-9), abs=1e-12)
+    assert res[1] == pytest.approx(np.degrees(2e-9), abs=1e-12)
+    assert Compute.bond_angles(xyz, [[0, 1, 2]], degrees=False)[0] == \
+        pytest.approx(np.pi - 1e-9, abs=1e-12)
+
+
+def test_conformer_stack(sdf_file):
+    xyz, pairs = molecule(sdf_file)
+    stack = np.stack((xyz, xyz*1.1, xyz[::-1]))
+    triples = Compute.angle_index(pairs)
+    quads = Compute.dihedral_index(pairs)
+
+    for fun, index in ((Compute.bond_lengths, pairs), (Compute.bond_angles, triples),
+                       (Compute.dihedral_angles, quads)):
+        res = fun(stack, index)
+        assert res.shape == (3, len(index))
+        for k in range(3):
+            assert np.array_equal(res[k], fun(stack[k], index))
+
+
+def test_empty_index():
+    xyz = np.zeros((3, 3))
+
+    assert Compute.angle_index(np.zeros((0, 2))).shape == (0, 3)
+    assert Compute.dihedral_index(np.zeros((0, 2))).shape == (0, 4)
+    assert Compute.bond_lengths(xyz, np.zeros((0, 2))).shape == (0,)
+    assert Compute.bond_angles(xyz, np.zeros((0, 3))).shape == (0,)
+    assert Compute.dihedral_angles(xyz, np.zeros((0, 4))).shape == (0,)
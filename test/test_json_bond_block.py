@@ -0,0 +1,31 @@
+
+# JSON BOND BLOCK
+# -----------------
+
+# import libs
+import os
+from molvizr3d.docs import MolParser
+from conftest import jsonable, pubchem_json
+
+
+def test_json_bond_block_matches_baseline(sdf_file, baseline):
+    res = MolParser(None).json_parser(pubchem_json(sdf_file))
+    ref = baseline['json'][os.path.basename(sdf_file)]
+
+    assert jsonable(res['bond_block']) == ref['bond_block']
+    assert jsonable(res['bond_list']) == ref['bond_list']
+    assert res['bond_numbers'] == ref['bond_numbers']
+    # bond block of the json atom order
+    assert jsonable(res['mat_info_origin']['bond_block']) == \
+        ref['mat_info_origin']['bond_block']
+
+
+def test_json_empty_bond_block(sdf_file):
+    jsonSource = pubchem_json(sdf_file)
+    jsonSource['PC_Compounds'][0]['bonds'] = {'aid1': [], 'aid2': [], 'order': []}
+    res = MolParser(None).json_parser(jsonSource)
+
+    assert res['bond_numbers'] == 0
+    assert res['bond_block'] == []
+    assert len(res['bond_list']) == 0
+    assert res['mat_info_origin']['bond_block'] == []
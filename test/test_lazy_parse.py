@@ -0,0 +1,68 @@
+
+# LAZY SDF RESULTS
+# ------------------
+
+# import libs
+import os
+import pickle
+from molvizr3d.docs import MolParser, Compound
+from molvizr3d.docs.lazydict import LazyDict
+from molvizr3d.docs.utility import Utility
+from conftest import jsonable
+
+# values built on first access
+LAZY_KEYS = ['compound_properties', 'mat_cid', 'mat_name', 'mat_formula',
+             'mat_mass', 'atom_block', 'bond_block']
+
+
+def lazy_parse(filePath):
+    fileContent, *_ = Utility.OpenFile(filePath)
+    return MolParser(None).sdf_parser(fileContent, lazy=True)
+
+
+def test_lazy_values_match_baseline(sdf_file, baseline):
+    res = lazy_parse(sdf_file)
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    assert isinstance(res, LazyDict)
+    assert sorted(res.pending()) == sorted(LAZY_KEYS)
+    assert set(res) == set(MolParser(sdf_file).read_file())
+    for key in ref['_keys']:
+        assert jsonable(res[key]) == ref[key], key
+    assert res.pending() == []
+
+
+def test_lazy_values_are_built_once(sdf_file):
+    res = lazy_parse(sdf_file)
+
+    assert res['bond_block'] is res['bond_block']
+    assert 'bond_block' not in res.pending()
+    assert 'atom_block' in res.pending()
+
+
+def test_lazy_set_and_update_replace_pending_values(sdf_file):
+    res = lazy_parse(sdf_file)
+    res['bond_block'] = []
+    res.update({'atom_block': None})
+
+    assert res['bond_block'] == []
+    assert res['atom_block'] is None
+    assert res.setdefault('mat_cid', 'x') != 'x'
+
+
+def test_lazy_pickle_is_plain_dict(sdf_file):
+    res = lazy_parse(sdf_file)
+    copied = pickle.loads(pickle.dumps(res))
+
+    assert type(copied) is dict
+    assert jsonable(copied['bond_block']) == jsonable(res['bond_block'])
+
+
+def test_compound_keeps_blocks_pending(sdf_file):
+    res = lazy_parse(sdf_file)
+    compound = Compound(res)
+    plan = compound.prepare_render()
+
+    assert 'bond_block' in res.pending()
+    assert 'atom_block' in res.pending()
+    assert len(plan['bond_index']) == res['bond_numbers']
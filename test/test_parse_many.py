@@ -0,0 +1,55 @@
+
+# BATCH PARSING
+# ---------------
+
+# import libs
+import os
+import shutil
+from molvizr3d.docs import MolParser
+from conftest import jsonable, SDF_FILES, TEST_DIR
+
+
+def test_parse_many_serial_matches_baseline(baseline):
+    res = list(MolParser.parse_many(SDF_FILES, workers=1))
+
+    assert [item['file_path'] for item in res] == SDF_FILES
+    for item in res:
+        ref = baseline['sdf'][os.path.basename(item['file_path'])]
+        assert item['error'] is None
+        assert jsonable(item['res']['bond_block']) == ref['bond_block']
+        assert jsonable(item['res']['atom_block']) == ref['atom_block']
+
+
+def test_parse_many_pool_matches_serial():
+    serial = list(MolParser.parse_many(SDF_FILES, workers=1))
+    pool = list(MolParser.parse_many(SDF_FILES, workers=2, chunk_size=3))
+
+    assert [item['file_path'] for item in pool] == SDF_FILES
+    for a, b in zip(serial, pool):
+        assert a['res'].keys() == b['res'].keys()
+        for key in a['res']:
+            if key == 'atom_table':
+                assert (a['res'][key].xyz == b['res'][key].xyz).all()
+                assert a['res'][key].symbols == b['res'][key].symbols
+            else:
+                assert jsonable(a['res'][key]) == jsonable(b['res'][key]), key
+
+    # completion order
+    unordered = list(MolParser.parse_many(SDF_FILES, workers=2, ordered=False))
+    assert sorted(item['file_path'] for item in unordered) == SDF_FILES
+
+
+def test_parse_many_directory_errors(tmp_path):
+    shutil.copy(SDF_FILES[0], tmp_path)
+    # not a PubChem record
+    shutil.copy(os.path.join(TEST_DIR, 'atom_block.json'), tmp_path)
+
+    res = {os.path.basename(item['file_path']): item
+           for item in MolParser.parse_many(str(tmp_path), workers=1)}
+    assert res[os.path.basename(SDF_FILES[0])]['error'] is None
+    assert res['atom_block.json']['res'] is None
+    assert res['atom_block.json']['error']
+
+
+def test_parse_many_empty():
+    assert list(MolParser.parse_many([])) == []
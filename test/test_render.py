@@ -0,0 +1,89 @@
+
+# OFFSCREEN RENDERING
+# ---------------------
+
+# import libs
+import io
+import os
+import matplotlib.pyplot as plt
+import pytest
+from molvizr3d.docs import MolParser, Compound
+from molvizr3d.docs.rendercanvas import RenderCanvas
+from conftest import SDF_FILES
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close('all')
+
+
+def test_render_png_bytes(sdf_file):
+    compound = Compound(MolParser(sdf_file).read_file())
+
+    res = compound.render(pixel_width=200, pixel_height=150)
+    assert res.startswith(PNG_SIGNATURE)
+    # no pyplot figure
+    assert plt.get_fignums() == []
+
+
+def test_render_svg(sdf_file, tmp_path):
+    compound = Compound(MolParser(sdf_file).read_file())
+
+    # file (format from extension)
+    filePath = tmp_path / 'compound.svg'
+    assert compound.render(file=str(filePath)) is None
+    assert b'<svg' in filePath.read_bytes()[:500]
+    # buffer
+    buffer = io.BytesIO()
+    compound.render(file=buffer, format='svg')
+    assert b'<svg' in buffer.getvalue()[:500]
+    # bytes
+    assert b'<svg' in compound.render(format='svg')[:500]
+
+
+def test_reused_canvas_matches_new_canvas():
+    compounds = [Compound(MolParser(item).read_file()) for item in SDF_FILES]
+    options = dict(pixel_width=200, pixel_height=150, dpi=100)
+
+    with RenderCanvas(**options) as canvas:
+        reused = [item.render(canvas=canvas, display_legend=True)
+                  for item in compounds]
+        # only the last compound is kept (atoms, bond lines)
+        assert len(canvas.ax.collections) == 2
+        assert len(canvas.ax.lines) == 0
+    new = [item.render(display_legend=True, **options) for item in compounds]
+
+    assert reused == new
+    assert plt.get_fignums() == []
+
+
+def test_closed_canvas():
+    canvas = RenderCanvas()
+    canvas.close()
+    # close twice
+    canvas.close()
+    with pytest.raises(Exception):
+        canvas.clear()
+    with pytest.raises(Exception):
+        canvas.save()
+
+
+def test_view3d_return_values(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]['_view3d']
+
+    assert compound.view3d() == ref
+    fig, plot_summary = compound.view3d(return_figure=True)
+    assert plot_summary == ref
+    assert fig.number in plt.get_fignums()
+
+
+def test_view3dobs_return_values(sdf_file):
+    compound = Compound(MolParser(sdf_file).read_file())
+
+    assert compound.view3dobs() is None
+    fig = compound.view3dobs(return_figure=True)
+    assert len(fig.axes) == 1
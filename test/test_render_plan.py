@@ -0,0 +1,70 @@
+
+# RENDER PLAN
+# -------------
+
+# import libs
+import os
+import numpy as np
+from molvizr3d.docs import MolParser, Compound
+
+# two atoms, no bond table (ion pair)
+ION_PAIR_SDF = """5234
+  test
+
+  2  0  0     0  0  0  0  0  0999 V2000
+    0.0000    0.0000    0.0000 Na  0  0  0  0  0  0  0  0  0  0  0  0
+    3.0000    0.0000    0.0000 Cl  0  0  0  0  0  0  0  0  0  0  0  0
+M  END
+$$$$
+"""
+
+
+def test_plot_scale_matches_baseline(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    compound.set_plot_scale()
+    assert np.allclose(compound.plotScale, ref['_plot_scale'])
+    assert compound.prepare_render()['plot_summary'] == ref['_view3d']
+
+
+def test_render_plan_is_cached(sdf_file):
+    compound = Compound(MolParser(sdf_file).read_file())
+
+    plan = compound.prepare_render()
+    compound.set_plot_scale()
+    # set_plot_scale reuses the plan
+    assert compound.prepare_render() is plan
+    assert compound.plotScale is plan['plot_scale']
+    # rebuilt after reset
+    compound.reset_render_plan()
+    assert compound.prepare_render() is not plan
+
+
+def test_render_plan_follows_coordinates(sdf_file):
+    compound = Compound(MolParser(sdf_file).read_file())
+    plan = compound.prepare_render()
+
+    # new coordinates (conformer)
+    shifted = compound.with_coordinates(compound.xyzList + [1.0, 0, 0])
+    shiftedPlan = shifted.prepare_render()
+    assert shiftedPlan is not plan
+    assert np.allclose(shiftedPlan['segments'], plan['segments'] + [1.0, 0, 0])
+    assert np.allclose(shiftedPlan['plot_scale'], plan['plot_scale'])
+    # other array on the same compound
+    compound.xyzList = compound.xyzList * 2
+    assert np.allclose(compound.prepare_render()['segment_lengths'],
+                       plan['segment_lengths'] * 2)
+
+
+def test_render_plan_without_bonds():
+    compound = Compound(MolParser(None).sdf_parser(ION_PAIR_SDF))
+
+    plan = compound.prepare_render()
+    assert plan['plot_scale'] == []
+    assert plan['segments'].shape == (0, 2, 3)
+    assert plan['plot_summary'] == []
+    assert plan['elements'] == ['Na', 'Cl']
+    # plot scale is kept
+    compound.set_plot_scale()
+    assert compound.plotScale == []
@@ -0,0 +1,43 @@
+
+# SDF BOND BLOCK
+# ----------------
+
+# import libs
+import os
+from molvizr3d.docs import MolParser
+from conftest import jsonable
+
+# two atoms, no bond table (ion pair)
+ION_PAIR_SDF = """5234
+  test
+
+  2  0  0     0  0  0  0  0  0999 V2000
+    0.0000    0.0000    0.0000 Na  0  0  0  0  0  0  0  0  0  0  0  0
+    3.0000    0.0000    0.0000 Cl  0  0  0  0  0  0  0  0  0  0  0  0
+M  END
+$$$$
+"""
+
+
+def test_bond_block_matches_baseline(sdf_file, baseline):
+    res = MolParser(sdf_file).read_file()
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    assert jsonable(res['bond_block']) == ref['bond_block']
+    assert res['bond_numbers'] == ref['bond_numbers']
+
+
+def test_bond_block_rows_are_grouped_by_first_atom(sdf_file):
+    res = MolParser(sdf_file).read_file()
+    ids = [item['id'] for item in res['bond_block']]
+
+    assert ids == sorted(set(ids))
+    assert sum(len(item['bonds']) for item in res['bond_block']) == res['bond_numbers']
+
+
+def test_empty_bond_block():
+    res = MolParser(None).sdf_parser(ION_PAIR_SDF)
+
+    assert res['bond_numbers'] == 0
+    assert res['bond_block'] == []
+    assert res['atom_elements'] == ['Na', 'Cl']
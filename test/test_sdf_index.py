@@ -0,0 +1,62 @@
+
+# SDF BYTE-OFFSET INDEX
+# -----------------------
+
+# import libs
+import os
+import pytest
+from molvizr3d.docs import MolParser
+from conftest import jsonable, SDF_FILES
+
+
+def test_sdf_index_records(multi_sdf):
+    sdfIndex = MolParser(multi_sdf).sdf_index()
+
+    assert len(sdfIndex['offset']) == len(SDF_FILES)
+    assert int(sdfIndex['size'].sum()) == os.path.getsize(multi_sdf)
+    assert os.path.isfile(multi_sdf + '.idx')
+    # index file is reused
+    assert MolParser(multi_sdf).sdf_index()['cid'] == sdfIndex['cid']
+
+
+def test_read_sdf_record_matches_stream(multi_sdf):
+    MolParserC = MolParser(multi_sdf)
+    records = list(MolParserC.iter_sdf())
+
+    # random order
+    for i in [7, 0, len(records)-1, 3]:
+        res = MolParserC.read_sdf_record(i)
+        assert res['record_offset'] == records[i]['record_offset']
+        for key in ('mat_cid', 'atom_block', 'bond_block', 'compound_properties'):
+            assert jsonable(res[key]) == jsonable(records[i][key]), key
+
+
+def test_read_sdf_record_by_cid(multi_sdf, baseline):
+    name = os.path.basename(SDF_FILES[5])
+    cid = baseline['sdf'][name]['mat_cid']
+
+    res = MolParser(multi_sdf).read_sdf_record(cid=cid)
+    assert res['record_index'] == 5
+    assert jsonable(res['bond_block']) == baseline['sdf'][name]['bond_block']
+
+
+def test_read_sdf_record_errors(multi_sdf):
+    MolParserC = MolParser(multi_sdf)
+    with pytest.raises(Exception, match='out of range'):
+        MolParserC.read_sdf_record(len(SDF_FILES))
+    with pytest.raises(Exception, match='not found'):
+        MolParserC.read_sdf_record(cid='000')
+
+
+def test_sdf_index_rebuilt_when_file_changes(multi_sdf):
+    MolParserC = MolParser(multi_sdf)
+    MolParserC.sdf_index()
+    # append a record (index file becomes older than the sdf file)
+    with open(SDF_FILES[0], 'rb') as f:
+        content = f.read()
+    with open(multi_sdf, 'ab') as f:
+        f.write(content)
+    os.utime(multi_sdf, (os.path.getmtime(multi_sdf)+10,)*2)
+
+    sdfIndex = MolParserC.sdf_index()
+    assert len(sdfIndex['offset']) == len(SDF_FILES) + 1
@@ -0,0 +1,38 @@
+
+# SDF DATA ITEMS
+# ----------------
+
+# import libs
+import os
+import pytest
+from molvizr3d.docs import MolParser
+from conftest import jsonable, SDF_FILES
+
+# atom/bond blocks of a record (data items are appended)
+with open(SDF_FILES[0], 'r') as f:
+    RECORD_HEAD = f.read().split('M  END')[0] + 'M  END\n'
+
+
+def test_compound_properties_match_baseline(sdf_file, baseline):
+    res = MolParser(sdf_file).read_file()
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    assert jsonable(res['compound_properties']) == ref['compound_properties']
+    assert list(res['compound_properties']) == list(ref['compound_properties'])
+
+
+@pytest.mark.parametrize('dataItems, properties', [
+    # multi-line value
+    ("> <A>\nline1\nline2\n\n> <B>\nx\n\n$$$$\n",
+     {'A': ['line1', 'line2'], 'B': 'x'}),
+    # header right after a value (no blank line)
+    ("> <A>\n1\n> <B>\n2\n\n$$$$\n", {'A': '1', 'B': '2'}),
+    # last record without `$$$$`
+    ("> <A>\n1\n", {'A': '1'}),
+    # no data items
+    ("$$$$\n", {}),
+])
+def test_data_items(dataItems, properties):
+    res = MolParser(None).sdf_parser(RECORD_HEAD + dataItems)
+
+    assert res['compound_properties'] == properties
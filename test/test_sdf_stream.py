@@ -0,0 +1,53 @@
+
+# SDF STREAMING READER
+# ----------------------
+
+# import libs
+import os
+from molvizr3d.docs import MolParser
+from molvizr3d.docs.utility import Utility
+from conftest import jsonable, SDF_FILES
+
+
+def test_iter_sdf_matches_single_files(multi_sdf, baseline):
+    records = list(MolParser(multi_sdf).iter_sdf())
+
+    assert len(records) == len(SDF_FILES)
+    for i, (res, filePath) in enumerate(zip(records, SDF_FILES)):
+        ref = baseline['sdf'][os.path.basename(filePath)]
+        assert res['record_index'] == i
+        for key in ('mat_cid', 'atom_elements', 'atom_block', 'bond_block',
+                    'xyz_list', 'compound_properties'):
+            assert jsonable(res[key]) == ref[key], key
+
+
+def test_iter_sdf_offsets(multi_sdf):
+    with open(multi_sdf, 'rb') as f:
+        content = f.read()
+
+    for recordIndex, recordOffset, recordContent in Utility.IterSdfRecords(multi_sdf):
+        assert content[recordOffset:].decode().startswith(recordContent)
+
+
+def test_iter_sdf_skip_limit(multi_sdf):
+    cids = [res['mat_cid'] for res in MolParser(multi_sdf).iter_sdf()]
+
+    res = list(MolParser(multi_sdf).iter_sdf(skip=3, limit=4))
+    assert [item['record_index'] for item in res] == [3, 4, 5, 6]
+    assert [item['mat_cid'] for item in res] == cids[3:7]
+    assert list(MolParser(multi_sdf).iter_sdf(limit=0)) == []
+    assert list(MolParser(multi_sdf).iter_sdf(skip=len(cids))) == []
+
+
+def test_iter_sdf_crlf_and_last_record(tmp_path):
+    with open(SDF_FILES[0], 'rb') as f:
+        content = f.read()
+    # windows line endings, no `$$$$` after the last record
+    filePath = tmp_path / 'crlf.sdf'
+    crlf = content.replace(b'\n', b'\r\n')
+    filePath.write_bytes(crlf + crlf.rsplit(b'$$$$', 1)[0])
+
+    records = list(Utility.IterSdfRecords(str(filePath)))
+    assert len(records) == 2
+    assert records[0][2] == content.decode()
+    assert records[1][1] == len(crlf)
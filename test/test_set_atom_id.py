@@ -0,0 +1,51 @@
+
+# ATOM RE-INDEXING
+# ------------------
+
+# import libs
+import os
+import numpy as np
+from molvizr3d.docs import MolParser
+from molvizr3d.config import OBS_POSITIONS
+from conftest import jsonable, pubchem_json
+
+
+def reference_order(xyzList):
+    '''
+    old atom indices in new id order (sorted by distance from the observer,
+    ties in reversed order of old ids)
+    '''
+    disList = [np.linalg.norm(np.array(OBS_POSITIONS) - np.array(item))
+               for item in xyzList]
+    res = sorted(enumerate(disList), key=lambda l: l[1], reverse=True)
+    res.reverse()
+    return [item[0] for item in res]
+
+
+def test_json_atom_order_matches_baseline(sdf_file, baseline):
+    res = MolParser(None).json_parser(pubchem_json(sdf_file))
+    ref = baseline['json'][os.path.basename(sdf_file)]
+
+    for key in ('atom_elements', 'atom_atomic_number', 'atom_block',
+                'xyz_list', 'xyz_center_list'):
+        assert jsonable(res[key]) == ref[key], key
+
+
+def test_set_atom_id_ties():
+    # equal distances (duplicated positions)
+    xyzList = np.array([[1.0, 0, 0], [2.0, 0, 0], [1.0, 0, 0],
+                        [2.0, 0, 0], [0.0, 0, 0]])
+    elementList = ['C', 'O', 'N', 'S', 'H']
+    bondList = np.array([[1, 2, 1], [2, 3, 2], [4, 5, 1]])
+
+    _, idConversion, xyzSorted, elementSorted, bondSorted = \
+        MolParser(None).SetAtomId(xyzList, elementList, bondList)
+
+    order = reference_order(xyzList)
+    assert (np.asarray(idConversion)[:, 0] - 1).tolist() == order
+    assert np.array_equal(xyzSorted, xyzList[order])
+    assert elementSorted == [elementList[i] for i in order]
+    # bonds keep their atoms
+    newId = {old+1: new+1 for new, old in enumerate(order)}
+    assert np.asarray(bondSorted).tolist() == \
+        [[newId[a], newId[b], t] for a, b, t in bondList.tolist()]
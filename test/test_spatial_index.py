@@ -0,0 +1,89 @@
+
+# SPATIAL INDEX
+# ---------------
+
+# import libs
+import numpy as np
+import pytest
+from molvizr3d.docs import MolParser
+from molvizr3d.docs.spatialindex import SpatialIndex
+
+# scipy is optional (kdtree)
+try:
+    import scipy  # noqa: F401
+    METHODS = ['cell', 'kdtree']
+except ImportError:
+    METHODS = ['cell']
+
+
+def brute_pairs(xyz, cutoff):
+    _diff = xyz[:, None, :] - xyz[None, :, :]
+    distance = np.sqrt(np.einsum('ijk,ijk->ij', _diff, _diff))
+    i, j = np.nonzero(np.triu(distance <= cutoff, 1))
+    return np.column_stack((i, j)), distance
+
+
+@pytest.fixture(scope='module')
+def cloud():
+    # dense cluster, far outliers and duplicated points
+    rng = np.random.default_rng(1)
+    xyz = np.concatenate((rng.uniform(-4, 4, size=(300, 3)),
+                          [[40, 0, 0], [-35, 12, 3]]))
+    return np.concatenate((xyz, xyz[:5]))
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('cutoff', [0.0, 0.9, 2.0, 5.5, 100.0])
+def test_pairs_within(cloud, method, cutoff):
+    pairs, distances = SpatialIndex(cloud, cell_size=1.5, method=method).pairs_within(cutoff)
+    ref, distance = brute_pairs(cloud, cutoff)
+
+    assert np.array_equal(pairs, ref)
+    assert np.allclose(distances, distance[ref[:, 0], ref[:, 1]])
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_query_radius(cloud, method):
+    index = SpatialIndex(cloud, method=method)
+    points = np.array([[0, 0, 0], [3.9, -3.9, 0], [40, 0, 0], [20, 20, 20]])
+    res = index.query_radius(points, 1.7)
+
+    for point, item in zip(points, res):
+        _distance = np.linalg.norm(cloud - point, axis=1)
+        assert item.tolist() == np.flatnonzero(_distance <= 1.7).tolist()
+    # single point
+    assert index.query_radius(points[0], 1.7).tolist() == res[0].tolist()
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('k', [1, 4, 400])
+def test_query_knn(cloud, method, k):
+    index = SpatialIndex(cloud, cell_size=1.0, method=method)
+    points = np.array([[0.1, 0.2, 0.3], [60, 0, 0]])
+    distances, indices = index.query_knn(points, k=k)
+
+    k = min(k, len(cloud))
+    for point, _distances, _indices in zip(points, distances, indices):
+        _distance = np.linalg.norm(cloud - point, axis=1)
+        assert np.allclose(_distances, np.sort(_distance)[0:k])
+        assert np.allclose(_distance[_indices], _distances)
+
+
+def test_molecule_bonded_pairs(sdf_file):
+    res = MolParser(sdf_file).read_file()
+    pairs, _ = SpatialIndex(res['xyz_list']).pairs_within(1.8)
+    ref, _ = brute_pairs(res['xyz_list'], 1.8)
+
+    assert np.array_equal(pairs, ref)
+
+
+def test_empty_and_invalid():
+    pairs, distances = SpatialIndex(np.zeros((0, 3))).pairs_within(2.0)
+    assert pairs.shape == (0, 2) and len(distances) == 0
+
+    with pytest.raises(Exception, match='positive'):
+        SpatialIndex(np.zeros((2, 3)), cell_size=0)
+    with pytest.raises(Exception, match='method'):
+        SpatialIndex(np.zeros((2, 3)), method='grid')
+    with pytest.raises(Exception, match='k must be positive'):
+        SpatialIndex(np.zeros((0, 3))).query_knn([0, 0, 0])
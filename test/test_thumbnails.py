@@ -0,0 +1,145 @@
+
+# THUMBNAIL LIBRARY
+# -------------------
+
+# import libs
+import os
+import csv
+import json
+import shutil
+import pytest
+from molvizr3d.docs import Thumbnails
+from molvizr3d.docs.vizr3d import Vizr3D
+from conftest import TEST_DIR, SDF_FILES, pubchem_json
+
+# small images (fast runs)
+OPTIONS = dict(pixel_width=60, pixel_height=60, dpi=50)
+
+
+@pytest.fixture
+def library(tmp_path):
+    '''
+    library directory: 3 sdf files, a PubChem json file sharing the name of
+    a sdf file and a json file which is not a PubChem record
+    '''
+    source = tmp_path / 'library'
+    source.mkdir()
+    for item in SDF_FILES[:3]:
+        shutil.copy(item, source)
+    # same name (name_extension)
+    stem = os.path.splitext(os.path.basename(SDF_FILES[0]))[0]
+    with open(source / f'{stem}.json', 'w') as f:
+        json.dump(pubchem_json(SDF_FILES[0]), f)
+    # not queued
+    shutil.copy(os.path.join(TEST_DIR, 'atom_block.json'), source)
+    return str(source)
+
+
+def read_manifest(res):
+    with open(res['manifest'], 'r', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def image_files(output_dir):
+    return sorted(item for item in os.listdir(output_dir)
+                  if not item.startswith('manifest'))
+
+
+def test_build_jobs(library):
+    jobs = Thumbnails.build_jobs(library)
+    stem = os.path.splitext(os.path.basename(SDF_FILES[0]))[0]
+
+    names = [item['name'] for item in jobs]
+    assert len(names) == 4 and len(set(names)) == 4
+    assert f'{stem}_sdf' in names and f'{stem}_json' in names
+    assert not any(item['file_path'].endswith('atom_block.json') for item in jobs)
+    # same path listed twice
+    jobs = Thumbnails.build_jobs([SDF_FILES[1], SDF_FILES[1]])
+    assert [item['name'] for item in jobs] == \
+        ['Conformer3D_COMPOUND_CID_22044_sdf', 'Conformer3D_COMPOUND_CID_22044_sdf_2']
+
+
+def test_is_pubchem_json(library, tmp_path):
+    files = {item: Thumbnails.is_pubchem_json(os.path.join(library, item))
+             for item in os.listdir(library) if item.endswith('.json')}
+    assert sorted(files.values()) == [False, True]
+    # binary content
+    filePath = tmp_path / 'binary.json'
+    filePath.write_bytes(b'\xff\xfe\x00')
+    assert not Thumbnails.is_pubchem_json(str(filePath))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_render_library_restart(library, tmp_path, workers):
+    output_dir = str(tmp_path / 'images')
+    views = [(None, None), (10, 20)]
+
+    res = Thumbnails.render_library(library, output_dir, views=views,
+                                    workers=workers, **OPTIONS)
+    assert (res['rendered'], res['skipped'], res['failed']) == (4, 0, 0)
+    rows = read_manifest(res)
+    assert [row['file_name'] for row in rows] == \
+        [item['name'] for item in Thumbnails.build_jobs(library)]
+    images = image_files(output_dir)
+    assert len(images) == 8 and not any(item.endswith('.part') for item in images)
+    assert sorted(row['image_name_2'] for row in rows) == \
+        sorted(item for item in images if item.endswith('_2.png'))
+
+    # restart: all images exist
+    res = Thumbnails.render_library(library, output_dir, views=views,
+                                    workers=workers, **OPTIONS)
+    assert (res['rendered'], res['skipped'], res['failed']) == (0, 4, 0)
+    assert read_manifest(res) == rows
+
+    # restart without the manifest: rows of skipped molecules are rebuilt
+    os.remove(res['manifest'])
+    res = Thumbnails.render_library(library, output_dir, views=views,
+                                    workers=workers, **OPTIONS)
+    assert (res['rendered'], res['skipped'], res['failed']) == (0, 4, 0)
+    assert read_manifest(res) == rows
+
+
+def test_render_library_settings_change(library, tmp_path):
+    output_dir = str(tmp_path / 'images')
+
+    Thumbnails.render_library(library, output_dir, workers=1, **OPTIONS)
+    res = Thumbnails.render_library(library, output_dir, workers=1,
+                                    bg_color='#FFFFFF', **OPTIONS)
+    # images of other settings are rendered again
+    assert (res['rendered'], res['skipped']) == (4, 0)
+    with open(os.path.join(output_dir, 'manifest_settings.json'), 'r') as f:
+        assert json.load(f)['bg_color'] == '#FFFFFF'
+
+
+def test_render_library_multi_record_sdf(multi_sdf, tmp_path):
+    output_dir = str(tmp_path / 'images')
+
+    res = Thumbnails.render_library(multi_sdf, output_dir, workers=2,
+                                    chunk_size=3, **OPTIONS)
+    assert res['rendered'] == len(SDF_FILES)
+    rows = read_manifest(res)
+    assert [row['file_name'] for row in rows] == \
+        [f'library_{i}' for i in range(len(SDF_FILES))]
+    # records in file order
+    assert [row['mat_cid'] for row in rows] == \
+        [os.path.basename(item).split('_')[-1][:-4] for item in SDF_FILES]
+
+
+def test_render_library_failure(library, tmp_path, monkeypatch):
+    output_dir = str(tmp_path / 'images')
+    # broken file
+    with open(os.path.join(library, 'broken.sdf'), 'w') as f:
+        f.write('broken\n\n\n  x\n')
+
+    # partial image of a failed render
+    def render(self, file=None, format=None, canvas=None, **kwargs):
+        with open(file, 'w') as f:
+            f.write('partial')
+        raise Exception('render failed')
+    monkeypatch.setattr(Vizr3D, 'render', render)
+
+    res = Thumbnails.render_library(library, output_dir, workers=1, **OPTIONS)
+    assert res['failed'] == 5
+    assert all(item['error'] for item in res['report'])
+    assert image_files(output_dir) == []
+    assert read_manifest(res) == []
@@ -0,0 +1,97 @@
+
+# V3000 AND FIXED-COLUMN V2000 CONNECTION TABLES
+# ------------------------------------------------
+
+# import libs
+import os
+import pytest
+from molvizr3d.docs import MolParser
+from conftest import jsonable, read_sdf_table
+
+# parse result values of the connection table
+CTAB_KEYS = ['atom_numbers', 'atom_elements', 'xyz_list', 'xyz_center_list',
+             'bond_numbers', 'atom_block', 'bond_block', 'compound_properties']
+
+
+def v3000_record(filePath):
+    '''
+    V3000 record of a V2000 test file (atom indices start from 10, atom
+    lines are continued on a second line)
+    '''
+    with open(filePath, 'r') as f:
+        lines = f.read().splitlines()
+    _, symbols, xyz, bonds = read_sdf_table(filePath)
+    record = lines[0:3] + [
+        '  0  0  0     0  0            999 V3000',
+        'M  V30 BEGIN CTAB',
+        f'M  V30 COUNTS {len(symbols)} {len(bonds)} 0 0 0',
+        'M  V30 BEGIN ATOM']
+    for i, (symbol, (x, y, z)) in enumerate(zip(symbols, xyz.tolist())):
+        record += [f'M  V30 {10+i} {symbol} {x!r} {y!r} -', f'M  V30 {z!r} 0']
+    record += ['M  V30 END ATOM', 'M  V30 BEGIN BOND']
+    for i, (atom1, atom2, bondType) in enumerate(bonds):
+        record.append(f'M  V30 {i+1} {bondType} {atom1+9} {atom2+9}')
+    record += ['M  V30 END BOND', 'M  V30 END CTAB']
+    # data items
+    record += lines[lines.index('M  END'):]
+    return '\n'.join(record) + '\n'
+
+
+def two_atom_record(atom2):
+    return f"""x
+  test
+
+  0  0  0     0  0            999 V3000
+M  V30 BEGIN CTAB
+M  V30 COUNTS 2 1 0 0 0
+M  V30 BEGIN ATOM
+M  V30 1 C 0 0 0 0
+M  V30 3 O 1.2 0 0 0
+M  V30 END ATOM
+M  V30 BEGIN BOND
+M  V30 1 2 1 {atom2}
+M  V30 END BOND
+M  V30 END CTAB
+M  END
+"""
+
+
+def test_v3000_matches_v2000_baseline(sdf_file, baseline):
+    res = MolParser(None).sdf_parser(v3000_record(sdf_file))
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    for key in CTAB_KEYS:
+        assert jsonable(res[key]) == ref[key], key
+
+
+def test_v3000_atom_index_mapping():
+    res = MolParser(None).sdf_parser(two_atom_record(3))
+
+    assert res['atom_elements'] == ['C', 'O']
+    assert res['bond_block'][0]['bonds'] == [(2, 'O', 'CO', 2)]
+
+
+@pytest.mark.parametrize('atom2', [2, 9, 0, -1])
+def test_v3000_unknown_atom(atom2):
+    with pytest.raises(Exception, match='unknown atom'):
+        MolParser(None).sdf_parser(two_atom_record(atom2))
+
+
+def test_v3000_counts_mismatch():
+    record = two_atom_record(3).replace('COUNTS 2 1', 'COUNTS 3 1')
+    with pytest.raises(Exception, match='does not match'):
+        MolParser(None).sdf_parser(record)
+
+
+def test_v2000_free_format_fallback(sdf_file, baseline):
+    # whitespace separated atom/bond lines (not fixed-width)
+    with open(sdf_file, 'r') as f:
+        lines = f.read().splitlines()
+    atomNo, bondNo = int(lines[3][0:3]), int(lines[3][3:6])
+    for i in range(4, 4+atomNo+bondNo):
+        lines[i] = ' '.join(lines[i].split())
+    res = MolParser(None).sdf_parser('\n'.join(lines) + '\n')
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    for key in CTAB_KEYS:
+        assert jsonable(res[key]) == ref[key], key
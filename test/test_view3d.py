@@ -0,0 +1,59 @@
+
+# VIEW3D DRAWING
+# ----------------
+
+# import libs
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Path3DCollection
+from molvizr3d.docs import MolParser, Compound
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close('all')
+
+
+def baseline_lines(ref):
+    '''
+    bond lines of the baseline drawing [[x1,x2],[y1,y2],[z1,z2]]
+    '''
+    return [line for item in ref['_bond_lines'] for line in item[0]]
+
+
+def test_per_artist_drawing_matches_baseline(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    fig, plot_summary = compound.view3d(return_figure=True)
+    ax = fig.axes[0]
+
+    assert plot_summary == ref['_view3d']
+    # one artist per atom and per bond line
+    assert len(ax.collections) == compound.atom_numbers
+    assert [np.array(line.get_data_3d()).tolist() for line in ax.lines] == \
+        baseline_lines(ref)
+    assert ax.computed_zorder
+
+
+def test_batched_drawing(sdf_file, baseline):
+    compound = Compound(MolParser(sdf_file).read_file())
+    ref = baseline['sdf'][os.path.basename(sdf_file)]
+
+    fig, plot_summary = compound.view3d(batched=True, return_figure=True)
+    ax = fig.axes[0]
+
+    assert plot_summary == ref['_view3d']
+    atoms = [item for item in ax.collections if isinstance(item, Path3DCollection)]
+    bonds = [item for item in ax.collections if isinstance(item, Line3DCollection)]
+    assert len(atoms) == 1 and len(bonds) == 1
+    assert len(ax.lines) == 0
+    # bond lines in bond block order
+    segments = compound.prepare_render()['segments']
+    assert np.transpose(segments, (0, 2, 1)).tolist() == baseline_lines(ref)
+    # bonds behind atoms
+    assert not ax.computed_zorder
+    assert bonds[0].get_zorder() < atoms[0].get_zorder()